@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+
+"""
+Time the cut writers on helices with many sections
+
+compares with the former writers (one write per field, python loop),
+and reports the size of compact cuts
+"""
+
+import io
+import os
+import time
+import argparse
+import tempfile
+from math import pi
+
+import numpy as np
+
+from python_magnetgeo.ModelAxi import ModelAxi
+from python_magnetgeo import cut_utils
+
+
+class Cut:
+    def __init__(self, odd: bool, modelaxi: ModelAxi):
+        self.odd = odd
+        self.modelaxi = modelaxi
+
+
+def legacy_lncmi_cut(object, filename: str, z0: float = 0):
+    sign = 1
+    if not object.odd:
+        sign *= -1
+    units = 1.e+3
+    angle_units = 180 / pi
+    z = z0
+    theta = 0
+    with open(filename, "x") as f:
+        sens = "droite"
+        if sign > 0:
+            sens = "gauche"
+        f.write(f"%decoupe double helice {filename} {sens}\n")
+        f.write("%Origin ")
+        f.write(f"X {-z * units:12.4f}\t")
+        f.write(f"W {-sign * theta * angle_units:12.3f}\n")
+        f.write("O****(*****)\n")
+        f.write("G0G90X0.0Y0.0\n")
+        f.write("G0A-0.\n")
+        f.write("G92\n")
+        f.write("G40G50\n")
+        f.write("M61\nM60\n")
+        f.write("G0X-0.000\n")
+        f.write("G0A0.\n")
+        for i, (turn, pitch) in enumerate(zip(object.modelaxi.turns, object.modelaxi.pitch)):
+            theta += turn * (2 * pi) * sign
+            z -= turn * pitch
+            f.write(f"N{i+1}")
+            if i == len(object.modelaxi.turns)-1:
+                f.write("G01")
+            f.write("\t")
+            f.write(f"X {-z * units:12.4f}\t")
+            f.write(f"W {-sign * theta * angle_units:12.3f}\n")
+        f.write("M50\nM29\nM30")
+        f.write("%")
+
+
+def legacy_salome_cut(object, filename: str, z0: float = 0):
+    sign = 1
+    if object.odd:
+        sign = -1
+    z = object.modelaxi.h
+    theta = 0
+    shape_id = 0
+    tab = "\t"
+    with open(filename, "x") as f:
+        f.write(f"#theta[rad]{tab}Shape_id[]{tab}tZ[mm]\n")
+        f.write(f"{theta*(-sign):12.8f}{tab}{shape_id:8}{tab}{z:12.8f}\n")
+        for i, (turn, pitch) in enumerate(zip(object.modelaxi.turns, object.modelaxi.pitch)):
+            theta += turn * (2 * pi) * sign
+            z -= turn * pitch
+            f.write(f"{theta*(-sign):12.8f}{tab}{shape_id:8}{tab}{z:12.8f}\n")
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sections", help="number of sections", type=int, default=100000)
+    parser.add_argument("--pitches", help="number of distinct pitches", type=int, default=20)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    turns = rng.uniform(0.1, 3, args.sections).tolist()
+    # runs of 1 to 10 sections with the same pitch
+    pitch = np.repeat(
+        rng.choice(np.linspace(5, 30, args.pitches), args.sections),
+        rng.integers(1, 11, args.sections),
+    )[: args.sections].tolist()
+    cut = Cut(True, ModelAxi("axi", sum(n * p for n, p in zip(turns, pitch)) / 2, turns, pitch))
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        for format, legacy, writer in [
+            ("lncmi", legacy_lncmi_cut, cut_utils.lncmi_cut),
+            ("salome", legacy_salome_cut, cut_utils.salome_cut),
+        ]:
+            os.chdir(tmpdir)
+            t_legacy = timed(legacy, cut, format)
+            with open(format, "rb") as istream:
+                reference = istream.read()
+            os.remove(format)
+
+            cut.modelaxi.invalidate()
+            t_new = timed(writer, cut, format)
+            with open(format, "rb") as istream:
+                assert istream.read() == reference
+
+            buffer = io.BytesIO()
+            t_buffer = timed(cut_utils.write_cut, cut, format, buffer, format)
+            assert buffer.getvalue() == reference
+
+            print(f"{format} ({len(reference)/1.e+6:.1f} MB, {args.sections} sections)")
+            print(f"  former writer:  {t_legacy*1.e+3:10.2f} ms")
+            print(f"  file:           {t_new*1.e+3:10.2f} ms (x{t_legacy/t_new:.1f})")
+            print(f"  BytesIO:        {t_buffer*1.e+3:10.2f} ms")
+
+            buffer = io.BytesIO()
+            start = time.perf_counter()
+            ratio = cut_utils.write_cut(cut, format, buffer, format, compact=True)
+            t_compact = time.perf_counter() - start
+            print(
+                f"  compact:        {t_compact*1.e+3:10.2f} ms ({len(buffer.getvalue())/1.e+6:.1f} MB, compression ratio {ratio:.2f})"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+
+"""
+Compare json decoding with the per-class decoders of deserialize
+against the former setattr based unserialize_object
+
+data/HL-31_H1.json is a solver setup, not a python_magnetgeo export:
+the benchmark decodes an export of n helices built like HL-31_H1.yaml
+"""
+
+import json
+import timeit
+import argparse
+
+from python_magnetgeo.Shape import Shape
+from python_magnetgeo.ModelAxi import ModelAxi
+from python_magnetgeo.Model3D import Model3D
+from python_magnetgeo.Helix import Helix
+from python_magnetgeo import deserialize
+
+
+def legacy_unserialize_object(d, debug: bool = False):
+    clsname = d.pop("__classname__", None)
+    if clsname:
+        cls = deserialize.classes[clsname]
+        obj = cls.__new__(cls)
+        for key, value in d.items():
+            setattr(obj, key.lower(), value)
+        return obj
+    return d
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--helices", help="number of helices", type=int, default=2000)
+    parser.add_argument("--sections", help="number of sections", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    helices = []
+    for i in range(args.helices):
+        axi = ModelAxi(
+            "HL-31.d", 86.51, [0.48] * args.sections, [18.04] * args.sections
+        )
+        shape = Shape("", "", [15], [60], [1], "ABOVE")
+        helices.append(
+            Helix(f"H{i}", [19.3, 24.2], [-226, 108], 0.22, True, True, axi, Model3D("HL-31"), shape)
+        )
+    data = json.dumps(helices, default=deserialize.serialize_instance)
+    print(f"export: {len(data)/1.e+6:.1f} MB, {4 * args.helices} objects")
+
+    t_legacy = min(
+        timeit.repeat(
+            lambda: json.loads(data, object_hook=legacy_unserialize_object),
+            number=1,
+            repeat=args.repeat,
+        )
+    )
+    t_new = min(
+        timeit.repeat(lambda: deserialize.loads(data), number=1, repeat=args.repeat)
+    )
+    t_parse = min(
+        timeit.repeat(
+            lambda: json.loads(data, object_hook=dict), number=1, repeat=args.repeat
+        )
+    )
+    print(f"json parsing only:          {t_parse*1.e+3:8.2f} ms")
+    print(f"setattr unserialize_object: {t_legacy*1.e+3:8.2f} ms (decoding: {(t_legacy-t_parse)*1.e+3:.2f} ms)")
+    print(f"compiled decoders:          {t_new*1.e+3:8.2f} ms (decoding: {(t_new-t_parse)*1.e+3:.2f} ms)")
+    print(f"decoding speedup: x{(t_legacy-t_parse)/(t_new-t_parse):.2f}")
+
+
+if __name__ == "__main__":
+    main()
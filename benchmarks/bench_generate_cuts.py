@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+
+"""
+Time Insert.generate_cuts on an insert of 14 helices
+
+compares a serial run (workers=1) with a process pool
+"""
+
+import os
+import time
+import argparse
+import tempfile
+
+import numpy as np
+
+from python_magnetgeo.Shape import Shape
+from python_magnetgeo.ModelAxi import ModelAxi
+from python_magnetgeo.Model3D import Model3D
+from python_magnetgeo.Helix import Helix
+from python_magnetgeo.Insert import Insert
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--helices", help="number of helices", type=int, default=14)
+    parser.add_argument("--sections", help="number of sections per helix", type=int, default=20000)
+    parser.add_argument("--workers", help="number of processes", type=int, default=4)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    with tempfile.TemporaryDirectory() as tmpdir:
+        os.chdir(tmpdir)
+        names = []
+        for i in range(args.helices):
+            turns = rng.uniform(0.1, 1, args.sections).tolist()
+            pitch = rng.uniform(5, 30, args.sections).tolist()
+            h = sum(n * p for n, p in zip(turns, pitch)) / 2
+            axi = ModelAxi(f"axi{i}", h, turns, pitch)
+            r0 = 20 + 10 * i
+            helix = Helix(f"H{i+1}", [r0, r0 + 5], [-h - 10, h + 10], 0.2, i % 2 == 0, True, axi, Model3D(cad="test"), Shape("", ""))
+            helix.dump()
+            names.append(helix.name)
+        insert = Insert("Insert", names, [], [], [], [], 15, 20 + 10 * args.helices)
+        formats = ["SALOME", "LNCMI"]
+
+        # load helices once, so both runs only time cut generation
+        insert.generate_cuts(formats, workers=1)
+
+        for workers in [1, args.workers]:
+            start = time.perf_counter()
+            manifest = insert.generate_cuts(formats, workers=workers)
+            elapsed = time.perf_counter() - start
+            size = sum(m["size"] for m in manifest)
+            print(f"workers={workers:3d}: {len(manifest)} files, {size/1.e+6:.1f} MB in {elapsed*1.e+3:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
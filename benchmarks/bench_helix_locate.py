@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+
+"""
+Time Helix.locate on a large set of points
+
+compares with a python loop over the sections of the cut
+(run on a subset of the points)
+"""
+
+import time
+import math
+import argparse
+
+import numpy as np
+
+from python_magnetgeo.Shape import Shape
+from python_magnetgeo.ModelAxi import ModelAxi
+from python_magnetgeo.Model3D import Model3D
+from python_magnetgeo.Helix import Helix
+
+
+def python_loop(helix: Helix, r, theta, z) -> list:
+    sign = 1 if helix.odd else -1
+    in_cut = []
+    for ri, ti, zi in zip(r, theta, z):
+        phi = (sign * ti) % (2 * math.pi)
+        found = False
+        if helix.r[0] <= ri <= helix.r[1]:
+            z0 = -helix.modelaxi.h
+            theta0 = 0
+            for n, p in zip(helix.modelaxi.turns, helix.modelaxi.pitch):
+                k = math.ceil((theta0 - phi) / (2 * math.pi))
+                while phi + 2 * math.pi * k <= theta0 + n * 2 * math.pi:
+                    zc = z0 + (phi + 2 * math.pi * k - theta0) / (2 * math.pi) * p
+                    if abs(zi - zc) <= helix.cutwidth / 2:
+                        found = True
+                    k += 1
+                z0 += n * p
+                theta0 += n * 2 * math.pi
+        in_cut.append(found)
+    return in_cut
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--points", help="number of points", type=int, default=1000000)
+    parser.add_argument("--sections", help="number of sections", type=int, default=100)
+    parser.add_argument("--loop", help="number of points for the python loop", type=int, default=2000)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    turns = rng.uniform(0.2, 1, args.sections)
+    pitch = rng.uniform(5, 30, args.sections)
+    h = float((turns * pitch).sum()) / 2
+    axi = ModelAxi.from_arrays("axi", h, turns, pitch)
+    helix = Helix("H", [19.3, 24.2], [-h - 10, h + 10], 0.2, True, False, axi, Model3D("H"), Shape("", ""))
+
+    r = rng.uniform(19.3, 24.2, args.points)
+    theta = rng.uniform(-math.pi, math.pi, args.points)
+    z = rng.uniform(-h, h, args.points)
+
+    start = time.perf_counter()
+    (in_copper, in_cut, turn) = helix.locate(r, theta, z)
+    t_locate = time.perf_counter() - start
+
+    n = args.loop
+    start = time.perf_counter()
+    reference = python_loop(helix, r[:n], theta[:n], z[:n])
+    t_loop = time.perf_counter() - start
+    assert reference == in_cut[:n].tolist()
+
+    print(f"{args.sections} sections, {int(in_cut.sum())} / {args.points} points in the cut")
+    print(f"locate:      {t_locate*1.e+3:10.2f} ms for {args.points} points")
+    print(f"python loop: {t_loop*1.e+3:10.2f} ms for {n} points (x{t_loop / n * args.points / t_locate:.0f} per point)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+
+"""
+Time and measure the tape level names of a large HTS insert
+
+compares building the full list (get_names) with counting them
+(count_names) and with a slice query (iter_names with start/stop)
+"""
+
+import time
+import argparse
+import tracemalloc
+from itertools import islice
+
+from python_magnetgeo.SupraStructure import tape, pancake, isolation, dblpancake, HTSinsert
+
+
+def measure(func):
+    """
+    return result, time (without tracing) and peak of allocated memory
+    """
+    start = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    func()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return (result, elapsed, peak)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--dblpancakes", help="number of double pancakes", type=int, default=40)
+    parser.add_argument("--tapes", help="number of tapes per pancake", type=int, default=2000)
+    parser.add_argument("--window", help="number of names in the slice", type=int, default=1000)
+    args = parser.parse_args()
+
+    _pancake = pancake(r0=10, tape=tape(w=0.15, h=4, e=0.01), n=args.tapes, mandrin=8)
+    _isolation = isolation(r0=10, w=[30], h=[0.2])
+    hts = HTSinsert(
+        n=args.dblpancakes,
+        dblpancakes=[dblpancake(0, _pancake, _isolation) for _ in range(args.dblpancakes)],
+        isolations=[_isolation] * (args.dblpancakes - 1),
+    )
+
+    (names, t_list, m_list) = measure(lambda: hts.get_names("HTS", "tape"))
+    (count, t_count, m_count) = measure(lambda: hts.count_names("tape"))
+    assert count == len(names)
+
+    # window in the last double pancake
+    start = count - 2 * args.window
+    stop = start + args.window
+    (window, t_slice, m_slice) = measure(lambda: list(hts.iter_names("HTS", "tape", False, start, stop)))
+    (reference, t_islice, m_islice) = measure(
+        lambda: list(islice(hts.iter_names("HTS", "tape"), start, stop))
+    )
+    assert window == names[start:stop] == reference
+
+    print(f"HTS insert: {args.dblpancakes} double pancakes, {args.tapes} tapes per pancake ({count} names)")
+    print(f"  get_names:           {t_list*1.e+3:10.3f} ms, peak {m_list/1.e+6:8.2f} MB")
+    print(f"  count_names:         {t_count*1.e+3:10.3f} ms, peak {m_count/1.e+6:8.2f} MB")
+    print(f"  iter_names[slice]:   {t_slice*1.e+3:10.3f} ms, peak {m_slice/1.e+6:8.2f} MB")
+    print(f"  islice(iter_names):  {t_islice*1.e+3:10.3f} ms, peak {m_islice/1.e+6:8.2f} MB")
+
+
+if __name__ == "__main__":
+    main()
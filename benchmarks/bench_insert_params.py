@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+
+"""
+Time Insert.get_params on an insert with many helices and sections
+
+compares with the former implementation (python loops over lists),
+without and with the get_params cache
+"""
+
+import os
+import math
+import time
+import argparse
+import tempfile
+
+import numpy as np
+
+from python_magnetgeo.Helix import Helix
+from python_magnetgeo.ModelAxi import ModelAxi
+from python_magnetgeo.Model3D import Model3D
+from python_magnetgeo.Shape import Shape
+from python_magnetgeo.Ring import Ring
+from python_magnetgeo.Insert import Insert, filter, _params_cache
+from python_magnetgeo import resolver
+
+
+def legacy_get_params(insert: Insert, workingDir: str = ".") -> tuple:
+    NHelices = len(insert.Helices)
+    NRings = len(insert.Rings)
+    NChannels = NHelices + 1
+
+    Nsections = []
+    R1 = []
+    R2 = []
+    Dh = []
+    Sh = []
+
+    Zh = []
+    for i, helix in enumerate(insert.Helices):
+        hhelix = resolver.load(helix, workingDir)
+        Nsections.append(len(hhelix.modelaxi.turns))
+        R1.append(hhelix.r[0])
+        R2.append(hhelix.r[1])
+
+        z = -hhelix.modelaxi.h
+        (turns, pitch) = hhelix.modelaxi.compact()
+        tZh = [hhelix.z[0], z]
+        for n, p in zip(turns, pitch):
+            z += n * p
+            tZh.append(z)
+        tZh.append(hhelix.z[1])
+        Zh.append(tZh)
+
+    Rint = insert.innerbore
+    Rext = insert.outerbore
+    for i in range(NHelices):
+        Dh.append(2 * (R1[i] - Rint))
+        Sh.append(math.pi * (R1[i] - Rint) * (R1[i] + Rint))
+        Rint = R2[i]
+
+    Zr = []
+    for i, ring in enumerate(insert.Rings):
+        hring = resolver.load(ring, workingDir)
+        dz = abs(hring.z[1] - hring.z[0])
+        if i % 2 == 1:
+            Zr.append(Zh[i][0] - dz)
+        if i % 2 == 0:
+            Zr.append(Zh[i][-1] + dz)
+
+    Zc = []
+    Zi = []
+    for i in range(NChannels - 1):
+        nZh = Zh[i] + Zi
+        if i >= 0 and i < NChannels - 2:
+            nZh.append(Zr[i])
+        if i >= 1 and i <= NChannels - 2:
+            nZh.append(Zr[i - 1])
+        if i >= 2 and i <= NChannels - 2:
+            nZh.append(Zr[i - 2])
+        nZh.sort()
+        Zc.append(filter(nZh))
+        Zi = Zh[i]
+
+    nZh = Zh[-1] + [Zr[-1]]
+    nZh.sort()
+    Zc.append(filter(nZh))
+
+    Dh.append(2 * (Rext - Rint))
+    Sh.append(math.pi * (Rext - Rint) * (Rext + Rint))
+    return (NHelices, NRings, NChannels, Nsections, R1, R2, Dh, Sh, Zc)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--helices", help="number of helices", type=int, default=14)
+    parser.add_argument("--sections", help="number of sections per helix", type=int, default=1000)
+    parser.add_argument("--calls", help="number of get_params calls", type=int, default=100)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    with tempfile.TemporaryDirectory() as tmpdir:
+        os.chdir(tmpdir)
+        helices = []
+        for i in range(args.helices):
+            turns = rng.uniform(0.5, 2, args.sections).round(3)
+            pitch = rng.choice([8.0, 10.0, 12.0, 15.0], args.sections)
+            h = float(turns @ pitch) / 2
+            axi = ModelAxi(f"axi{i}", h, turns.tolist(), pitch.tolist())
+            r0 = 20 + 10 * i
+            helix = Helix(f"H{i}", [r0, r0 + 8], [-h - 10, h + 10], 0.2, i % 2 == 0, True, axi, Model3D(cad="test"), Shape("", ""))
+            helix.dump()
+            helices.append(helix.name)
+        rings = []
+        for i in range(args.helices - 1):
+            r0 = 24 + 10 * i
+            ring = Ring(f"R{i}", [r0, r0 + 4, r0 + 10, r0 + 14], [0, 20])
+            ring.dump()
+            rings.append(ring.name)
+        insert = Insert("Insert", helices, rings, [], [], [], 15.0, 20.0 + 10 * args.helices)
+
+        # parse files once, the former implementation uses the resolver cache too
+        reference = legacy_get_params(insert)
+
+        start = time.perf_counter()
+        for n in range(args.calls):
+            legacy_get_params(insert)
+        t_legacy = (time.perf_counter() - start) / args.calls
+
+        start = time.perf_counter()
+        for n in range(args.calls):
+            _params_cache.clear()
+            params = insert.get_params()
+        t_new = (time.perf_counter() - start) / args.calls
+
+        start = time.perf_counter()
+        for n in range(args.calls):
+            params = insert.get_params()
+        t_cached = (time.perf_counter() - start) / args.calls
+
+        for ref, value in zip(reference, params):
+            if isinstance(ref, list) and ref and isinstance(ref[0], list):
+                assert all(np.allclose(r, v) for r, v in zip(ref, value))
+            else:
+                assert np.allclose(ref, value)
+
+        print(f"{args.helices} helices, {args.sections} sections (per call)")
+        print(f"  former get_params: {t_legacy*1.e+3:10.3f} ms")
+        print(f"  get_params:        {t_new*1.e+3:10.3f} ms (x{t_legacy/t_new:.1f})")
+        print(f"  cached:            {t_cached*1.e+3:10.3f} ms (x{t_legacy/t_cached:.1f})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+
+"""
+Time ModelAxi.compact on helices with many sections
+
+compares the former quadratic compact with the vectorized one,
+for list and array-backed ModelAxi
+
+Time the mapping of points to sections with the cached profile,
+compared to a python loop with bisect
+"""
+
+import timeit
+import argparse
+from bisect import bisect_right
+
+import numpy as np
+
+from python_magnetgeo.ModelAxi import ModelAxi
+
+
+def legacy_compact(axi: ModelAxi, tol: float = 1.0e-6):
+    def indices(lst: list, item: float):
+        return [i for i, x in enumerate(lst) if abs(1 - item / x) <= tol]
+
+    List = axi.pitch
+    duplicates = dict((x, indices(List, x)) for x in set(List) if List.count(x) > 1)
+
+    sum_index = {}
+    for key in duplicates:
+        index_fst = duplicates[key][0]
+        sum_index[index_fst] = [index_fst]
+        search_index = sum_index[index_fst]
+        search_elem = search_index[-1]
+        for index in duplicates[key]:
+            if index - search_elem == 1:
+                search_index.append(index)
+                search_elem = index
+            else:
+                sum_index[index] = [index]
+                search_index = sum_index[index]
+                search_elem = search_index[-1]
+
+    remove_ids = []
+    for i in sum_index:
+        for item in sum_index[i]:
+            if item != i:
+                remove_ids.append(item)
+
+    new_pitch = [p for i, p in enumerate(axi.pitch) if not i in remove_ids]
+    turns = list(axi.turns)
+    for i in sum_index:
+        for item in sum_index[i]:
+            turns[i] += axi.turns[item]
+    new_turns = [p for i, p in enumerate(turns) if not i in remove_ids]
+    return new_turns, new_pitch
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sections", help="number of sections", type=int, default=10000)
+    parser.add_argument("--pitches", help="number of distinct pitches", type=int, default=50)
+    parser.add_argument("--points", help="number of points to locate", type=int, default=1000000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    # runs of random length taken among a few distinct pitches
+    rng = np.random.default_rng(0)
+    values = np.round(rng.uniform(10, 30, args.pitches), 3)
+    pitch = values[rng.integers(0, args.pitches, args.sections)]
+    pitch = np.repeat(pitch, rng.integers(1, 4, args.sections))[: args.sections]
+    turns = np.round(rng.uniform(0.5, 2, args.sections), 3)
+
+    axi = ModelAxi("axi", 100, turns.tolist(), pitch.tolist())
+    array_axi = ModelAxi.from_arrays("axi", 100, turns, pitch)
+    print(f"{args.sections} sections, {len(axi.compact()[0])} after compact")
+
+    for label, func in [
+        ("legacy compact", lambda: legacy_compact(axi)),
+        ("compact (lists)", lambda: axi.compact()),
+        ("compact (arrays)", lambda: array_axi.compact()),
+    ]:
+        t = min(timeit.repeat(func, number=1, repeat=args.repeat))
+        print(f"{label:18s}: {t*1.e+3:10.3f} ms")
+
+    zs = array_axi.get_z()
+    points = rng.uniform(zs[0], zs[-1], args.points)
+    plist = points.tolist()
+    zlist = zs.tolist()
+
+    def python_loop():
+        return [bisect_right(zlist, z) - 1 for z in plist]
+
+    t_loop = min(timeit.repeat(python_loop, number=1, repeat=args.repeat))
+    t_index = min(
+        timeit.repeat(lambda: array_axi.section_index(points), number=1, repeat=args.repeat)
+    )
+    t_theta = min(
+        timeit.repeat(lambda: array_axi.theta_at(points), number=1, repeat=args.repeat)
+    )
+    assert array_axi.section_index(points).tolist() == python_loop()
+    print(f"{args.points} points")
+    print(f"bisect loop       : {t_loop*1.e+3:10.3f} ms")
+    print(f"section_index     : {t_index*1.e+3:10.3f} ms")
+    print(f"theta_at          : {t_theta*1.e+3:10.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+
+"""
+Time repeated MSite.get_names / get_channels calls
+
+compares the memoized methods with rebuilding the names on every call
+(memos cleared), and the marker index lookups with a linear search
+"""
+
+import os
+import time
+import argparse
+import tempfile
+
+from python_magnetgeo import resolver
+
+from bench_site_params import make_site
+
+
+def timed(func, calls: int, clear=None) -> float:
+    elapsed = 0
+    for n in range(calls):
+        if clear is not None:
+            clear_memos(clear)
+        start = time.perf_counter()
+        func()
+        elapsed += time.perf_counter() - start
+    return elapsed / calls
+
+
+def clear_memos(site) -> None:
+    site.__dict__.pop("_memo", None)
+    for stamp, obj in resolver._cache.values():
+        obj.__dict__.pop("_memo", None)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--inserts", help="number of inserts", type=int, default=2)
+    parser.add_argument("--bitters", help="number of Bitter magnets", type=int, default=4)
+    parser.add_argument("--helices", help="number of helices per insert", type=int, default=14)
+    parser.add_argument("--sections", help="number of sections per helix", type=int, default=500)
+    parser.add_argument("--calls", help="number of calls", type=int, default=50)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        os.chdir(tmpdir)
+        site = make_site(args.inserts, args.bitters, args.helices, args.sections)
+        resolver.load_tree(site)
+
+        for is2D in [False, True]:
+            names = site.get_names("", is2D)
+            t_former = timed(lambda: site.get_names("", is2D), args.calls, site)
+            t_memo = timed(lambda: site.get_names("", is2D), args.calls)
+            print(f"get_names(is2D={is2D}) ({len(names)} names)")
+            print(f"  rebuilt:  {t_former*1.e+3:10.3f} ms")
+            print(f"  memoized: {t_memo*1.e+3:10.3f} ms (x{t_former/t_memo:.1f})")
+
+        t_former = timed(lambda: site.get_channels("", True), args.calls, site)
+        t_memo = timed(lambda: site.get_channels("", True), args.calls)
+        print("get_channels")
+        print(f"  rebuilt:  {t_former*1.e+3:10.3f} ms")
+        print(f"  memoized: {t_memo*1.e+3:10.3f} ms (x{t_former/t_memo:.1f})")
+
+        index = site.get_marker_index("", True)
+        queries = names[:: max(len(names) // 100, 1)]
+        t_search = timed(lambda: [names.index(name) for name in queries], args.calls)
+        t_index = timed(lambda: [index[name] for name in queries], args.calls)
+        print(f"marker lookups ({len(queries)} names)")
+        print(f"  list search: {t_search*1.e+3:10.3f} ms")
+        print(f"  index:       {t_index*1.e+3:10.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+
+"""
+Time the cut readers on many cut files
+
+compares with a per-line parser, and checks the files
+against their ModelAxi (compare_cut)
+"""
+
+import os
+import time
+import argparse
+import tempfile
+
+import numpy as np
+
+from python_magnetgeo.ModelAxi import ModelAxi
+from python_magnetgeo import cut_utils
+
+
+class Cut:
+    def __init__(self, odd: bool, modelaxi: ModelAxi):
+        self.odd = odd
+        self.modelaxi = modelaxi
+
+
+def line_salome_cut(filename: str):
+    theta, shape_id, z = [], [], []
+    with open(filename, "r") as f:
+        for line in f:
+            if line.startswith("#"):
+                continue
+            items = line.split()
+            theta.append(float(items[0]))
+            shape_id.append(int(items[1]))
+            z.append(float(items[2]))
+    return (np.array(theta), np.array(shape_id), np.array(z))
+
+
+def line_lncmi_cut(filename: str):
+    X, W = [], []
+    with open(filename, "r") as f:
+        for line in f:
+            if line.startswith("%Origin ") or line.startswith("N"):
+                items = line.split("\t")
+                X.append(float(items[-2].split()[-1]))
+                W.append(float(items[-1].split()[-1]))
+    return (np.array(X), np.array(W))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--files", help="number of cut files per format", type=int, default=200)
+    parser.add_argument("--sections", help="number of sections per cut", type=int, default=2000)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    cuts = []
+    for i in range(args.files):
+        turns = rng.uniform(0.1, 3, args.sections)
+        pitch = rng.choice(np.linspace(5, 30, 20), args.sections)
+        cuts.append(Cut(bool(i % 2), ModelAxi.from_arrays(f"axi{i}", float(turns @ pitch) / 2, turns, pitch)))
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        os.chdir(tmpdir)
+        for format, reader, line_reader in [
+            ("lncmi", cut_utils.read_lncmi_cut, line_lncmi_cut),
+            ("salome", cut_utils.read_salome_cut, line_salome_cut),
+        ]:
+            filenames = []
+            for i, cut in enumerate(cuts):
+                filenames.append(f"H{i}" + cut_utils.formats[format]["extension"])
+                with open(filenames[-1], "w") as ostream:
+                    cut_utils.write_cut(cut, format, ostream, filenames[-1])
+
+            start = time.perf_counter()
+            reference = [line_reader(filename) for filename in filenames]
+            t_line = time.perf_counter() - start
+
+            start = time.perf_counter()
+            values = [reader(filename) for filename in filenames]
+            t_bulk = time.perf_counter() - start
+            for ref, val in zip(reference, values):
+                for a, b in zip(ref, val):
+                    assert np.array_equal(a, b)
+
+            start = time.perf_counter()
+            errors = [
+                cut_utils.compare_cut(cut.modelaxi, filename)
+                for cut, filename in zip(cuts, filenames)
+            ]
+            t_compare = time.perf_counter() - start
+
+            print(f"{format} ({args.files} files, {args.sections} sections)")
+            print(f"  per-line parser: {t_line*1.e+3:10.2f} ms")
+            print(f"  bulk parser:     {t_bulk*1.e+3:10.2f} ms (x{t_line/t_bulk:.1f})")
+            print(
+                f"  compare_cut:     {t_compare*1.e+3:10.2f} ms (max deviation: {max(e[0] for e in errors):.2e}, {max(e[1] for e in errors):.2e})"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+
+"""
+Time MSite.get_params on a site with several inserts and Bitters
+
+compares with walking MSite.magnets and calling get_params on each magnet,
+for several numbers of workers
+"""
+
+import os
+import time
+import argparse
+import tempfile
+
+import numpy as np
+
+from python_magnetgeo.Helix import Helix
+from python_magnetgeo.ModelAxi import ModelAxi
+from python_magnetgeo.Model3D import Model3D
+from python_magnetgeo.Shape import Shape
+from python_magnetgeo.Ring import Ring
+from python_magnetgeo.Insert import Insert, _params_cache
+from python_magnetgeo.Bitter import Bitter
+from python_magnetgeo.Bitters import Bitters
+from python_magnetgeo.coolingslit import CoolingSlit
+from python_magnetgeo.tierod import Tierod
+from python_magnetgeo.Shape2D import Shape2D
+from python_magnetgeo.MSite import MSite
+from python_magnetgeo import resolver
+
+
+def make_site(ninserts: int, nbitters: int, nhelices: int, nsections: int) -> MSite:
+    rng = np.random.default_rng(0)
+    magnets = {}
+    for k in range(ninserts):
+        helices = []
+        for i in range(nhelices):
+            turns = rng.uniform(0.5, 2, nsections).round(3)
+            pitch = rng.choice([8.0, 10.0, 12.0, 15.0], nsections)
+            h = float(turns @ pitch) / 2
+            axi = ModelAxi(f"axi{i}", h, turns.tolist(), pitch.tolist())
+            r0 = 20 + 10 * i
+            helix = Helix(f"M{k}H{i}", [r0, r0 + 8], [-h - 10, h + 10], 0.2, i % 2 == 0, True, axi, Model3D(cad="test"), Shape("", ""))
+            helix.dump()
+            helices.append(helix.name)
+        rings = []
+        for i in range(nhelices - 1):
+            r0 = 24 + 10 * i
+            ring = Ring(f"M{k}R{i}", [r0, r0 + 4, r0 + 10, r0 + 14], [0, 20])
+            ring.dump()
+            rings.append(ring.name)
+        insert = Insert(f"M{k}", helices, rings, [], [], [], 15.0, 20.0 + 10 * nhelices)
+        insert.dump()
+        magnets[f"insert{k}"] = insert.name
+
+    square = Shape2D("square", [[0, 0], [1, 0], [1, 1], [0, 1]])
+    bitters = []
+    for k in range(nbitters):
+        slits = [CoolingSlit(300 + 10 * i, 5, 20, 0.1, 0.2, square) for i in range(8)]
+        turns = rng.uniform(0.5, 2, nsections).round(3)
+        h = float(turns.sum() * 2) / 2
+        bitter = Bitter(
+            f"B{k}", [290, 400], [-h - 10, h + 10], True, ModelAxi(f"axi{k}", h, turns.tolist(), [2.0] * nsections),
+            slits, Tierod(2, 20, 4, 1, square), 285, 405,
+        )
+        bitter.dump()
+        bitters.append(bitter.name)
+    Bitters("Bitters", bitters, 285, 405).dump()
+    magnets["bitters"] = "Bitters"
+    return MSite("Site", magnets, None, None, None, None)
+
+
+def manual_get_params(site: MSite) -> list:
+    params = []
+    for key, magnet in site.magnets.items():
+        Object = resolver.load(magnet)
+        if isinstance(Object, Bitters):
+            for part in Object.magnets:
+                params.append(resolver.load(part).get_params())
+        else:
+            params.append(Object.get_params())
+    return params
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--inserts", help="number of inserts", type=int, default=4)
+    parser.add_argument("--bitters", help="number of Bitter magnets", type=int, default=8)
+    parser.add_argument("--helices", help="number of helices per insert", type=int, default=14)
+    parser.add_argument("--sections", help="number of sections per helix", type=int, default=500)
+    parser.add_argument("--workers", help="numbers of workers", type=int, nargs="+", default=[1, 4])
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        os.chdir(tmpdir)
+        site = make_site(args.inserts, args.bitters, args.helices, args.sections)
+        resolver.load_tree(site)
+
+        _params_cache.clear()
+        start = time.perf_counter()
+        manual_get_params(site)
+        t_manual = time.perf_counter() - start
+        print(f"{args.inserts} inserts, {args.bitters} Bitters (files already parsed)")
+        print(f"  per magnet loop:         {t_manual*1.e+3:10.2f} ms")
+
+        for workers in args.workers:
+            _params_cache.clear()
+            start = time.perf_counter()
+            params = site.get_params(workers=workers)
+            t_site = time.perf_counter() - start
+            print(f"  get_params(workers={workers:2d}): {t_site*1.e+3:10.2f} ms ({len(params.channel)} channels)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+
+"""
+Time axi_utils.solve on 14 helices x 1000 turn density profiles
+
+compares with a python loop solving one profile at a time
+(run on a subset of the profiles)
+"""
+
+import time
+import argparse
+
+import numpy as np
+
+from python_magnetgeo import axi_utils
+
+
+def python_loop(density, h, pitches):
+    allowed = sorted(pitches)
+    results = []
+    for row, hi in zip(density.tolist(), h.tolist()):
+        length = 2 * hi / len(row)
+        target = 0
+        current = 0
+        turns = []
+        pitch = []
+        for d in row:
+            target += d * length
+            wanted = (target - current) / length
+            p = min(allowed, key=lambda q: (abs(1 / q - wanted), q))
+            turns.append(length / p)
+            pitch.append(p)
+            current += length / p
+        results.append((turns, pitch))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--helices", help="number of helices", type=int, default=14)
+    parser.add_argument("--profiles", help="number of profiles per helix", type=int, default=1000)
+    parser.add_argument("--bins", help="number of bins per profile", type=int, default=60)
+    parser.add_argument("--loop", help="number of profiles for the python loop", type=int, default=1000)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    pitches = np.arange(8.0, 30.5, 0.5)
+    # half heights of the helices, one row per profile
+    h = np.repeat(np.linspace(80, 220, args.helices), args.profiles)
+    # peaked profiles: denser turns at the center of the helix
+    x = np.linspace(-1, 1, args.bins)
+    peak = rng.uniform(0.5, 2, (h.size, 1))
+    density = 1 / 25 + (1 / 9 - 1 / 25) * np.exp(-peak * x**2)
+
+    start = time.perf_counter()
+    result = axi_utils.solve(density, h, pitches)
+    t_solve = time.perf_counter() - start
+
+    start = time.perf_counter()
+    axis = [
+        axi_utils.to_modelaxi(f"H{i}", h[i], result.turns[i], result.pitch[i])
+        for i in range(h.size)
+    ]
+    t_build = time.perf_counter() - start
+
+    n = min(args.loop, h.size)
+    start = time.perf_counter()
+    reference = python_loop(density[:n], h[:n], pitches.tolist())
+    t_loop = time.perf_counter() - start
+    assert all(p == result.pitch[i].tolist() for i, (_, p) in enumerate(reference))
+
+    print(f"{args.helices} helices x {args.profiles} profiles, {args.bins} bins")
+    print(f"max |turns error|: {np.abs(result.error).max():.3e}")
+    print(f"mean sections after compact: {np.mean([len(axi.pitch) for axi in axis]):.1f}")
+    print(f"solve:          {t_solve*1.e+3:10.2f} ms")
+    print(f"to_modelaxi:    {t_build*1.e+3:10.2f} ms")
+    print(f"python loop:    {t_loop / n * h.size * 1.e+3:10.2f} ms (extrapolated from {n} profiles)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+
+"""
+Time and memory used to get the names of the solids of a tape level HTS insert
+
+get_names builds the list of names, iter_names streams them.
+The flatten of pandas, formerly used by get_names, is timed when pandas is installed.
+"""
+
+import sys
+import time
+import argparse
+import subprocess
+import tracemalloc
+
+from python_magnetgeo.SupraStructure import (
+    tape,
+    pancake,
+    isolation,
+    dblpancake,
+    HTSinsert,
+    flatten,
+)
+
+
+def measure(func):
+    start = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    func()
+    (_, peak) = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return (result, elapsed, peak)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--dblpancakes", help="number of double pancakes", type=int, default=40)
+    parser.add_argument("--tapes", help="number of tapes per pancake", type=int, default=300)
+    args = parser.parse_args()
+
+    _tape = tape(w=0.15, h=4, e=0.01)
+    _pancake = pancake(r0=10, tape=_tape, n=args.tapes, mandrin=8)
+    _isolation = isolation(r0=10, w=[30], h=[0.2])
+    hts = HTSinsert(
+        name="HTS",
+        n=args.dblpancakes,
+        dblpancakes=[dblpancake(0, _pancake, _isolation) for _ in range(args.dblpancakes)],
+        isolations=[_isolation] * (args.dblpancakes - 1),
+    )
+
+    (names, t_list, m_list) = measure(lambda: hts.get_names("HTS", "tape"))
+    (count, t_iter, m_iter) = measure(
+        lambda: sum(1 for _ in hts.iter_names("HTS", "tape"))
+    )
+    assert count == len(names)
+    print(f"{count} names")
+    print(f"get_names:  {t_list*1.e+3:8.2f} ms, peak {m_list/1.e+6:8.2f} MB")
+    print(f"iter_names: {t_iter*1.e+3:8.2f} ms, peak {m_iter/1.e+6:8.2f} MB (count only)")
+
+    nested = [[dp.get_names(f"dp{i}", "tape")] for i, dp in enumerate(hts.dblpancakes)]
+    (_, t_native, _) = measure(lambda: flatten(nested))
+    print(f"flatten:    {t_native*1.e+3:8.2f} ms")
+
+    code = "import time; t = time.perf_counter(); from pandas.core.common import flatten; print(time.perf_counter() - t)"
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True)
+    if result.returncode:
+        print("pandas not installed: skip pandas.core.common.flatten")
+        return
+
+    from pandas.core.common import flatten as pd_flatten
+
+    (_, t_pandas, _) = measure(lambda: list(pd_flatten(nested)))
+    print(f"pandas flatten: {t_pandas*1.e+3:8.2f} ms (+ {float(result.stdout)*1.e+3:.0f} ms to import pandas)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+
+"""
+Time the evaluation of candidate turns/pitch distributions
+
+compares axi_utils.sweep with building one ModelAxi per candidate
+"""
+
+import time
+import argparse
+
+import numpy as np
+
+from python_magnetgeo.ModelAxi import ModelAxi
+from python_magnetgeo import axi_utils
+
+
+def python_loop(turns, pitch, h, z, nturns, tol=1.0e-6):
+    results = []
+    for t, p in zip(turns.tolist(), pitch.tolist()):
+        axi = ModelAxi("axi", h, t, p)
+        height = sum(n * q for n, q in zip(axi.turns, axi.pitch))
+        total = axi.get_Nturns()
+        nsections = len(axi.compact(tol)[0])
+        valid = (
+            min(t) > 0
+            and min(p) > 0
+            and abs(height - 2 * h) <= tol * 2 * h
+            and abs(total - nturns) <= tol * nturns
+            and -h >= z[0]
+            and -h + height <= z[1]
+        )
+        results.append((height, total, nsections, valid))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--candidates", help="number of candidates", type=int, default=10000)
+    parser.add_argument("--sections", help="number of sections", type=int, default=40)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    shape = (args.candidates, args.sections)
+    pitch = rng.choice([10.0, 12.0, 15.0, 18.0], size=shape)
+    turns = rng.uniform(0.5, 3, shape)
+    nturns = args.sections * 1.75
+    turns *= nturns / turns.sum(axis=1)[:, None]
+    h = float(np.median((turns * pitch).sum(axis=1))) / 2
+    # rescale the pitch of half the candidates to match the height
+    half = args.candidates // 2
+    pitch[:half] *= 2 * h / (turns[:half] * pitch[:half]).sum(axis=1)[:, None]
+    z = [-h - 5, h + 5]
+
+    start = time.perf_counter()
+    result = axi_utils.sweep(turns, pitch, h, z, nturns)
+    t_sweep = time.perf_counter() - start
+
+    start = time.perf_counter()
+    reference = python_loop(turns, pitch, h, z, nturns)
+    t_loop = time.perf_counter() - start
+    assert [r[2] for r in reference] == result.nsections.tolist()
+    assert [r[3] for r in reference] == result.valid.tolist()
+
+    print(f"{args.candidates} candidates of {args.sections} sections, {int(result.valid.sum())} valid")
+    print(f"one ModelAxi per candidate: {t_loop*1.e+3:10.2f} ms")
+    print(f"axi_utils.sweep:            {t_sweep*1.e+3:10.2f} ms (x{t_loop/t_sweep:.0f})")
+
+
+if __name__ == "__main__":
+    main()
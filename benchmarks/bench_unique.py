@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+
+"""
+Time the removal of z values equal within a tolerance
+
+compares axi_utils.unique with the former Insert.filter (pairwise comparisons)
+"""
+
+import time
+import argparse
+
+import numpy as np
+
+from python_magnetgeo.axi_utils import unique
+
+
+def legacy_filter(data: list[float], tol: float = 1.e-6) -> list[float]:
+    result = []
+    ndata = len(data)
+    for i in range(ndata):
+        result += [
+            j for j in range(i, ndata) if i != j and abs(data[i] - data[j]) <= tol
+        ]
+    return [data[i] for i in range(ndata) if not i in result]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--values", help="number of z values", type=int, default=4000)
+    parser.add_argument("--tol", help="tolerance", type=float, default=1.e-6)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    # z values on a fine grid, each one repeated with some noise
+    z = rng.choice(np.linspace(-100, 100, args.values // 2), args.values)
+    z += rng.uniform(-args.tol, args.tol, args.values) / 4
+    for label, data in [("sorted", np.sort(z).tolist()), ("unsorted", z.tolist())]:
+        start = time.perf_counter()
+        reference = legacy_filter(data, args.tol)
+        t_legacy = time.perf_counter() - start
+
+        start = time.perf_counter()
+        result = unique(data, args.tol)
+        t_new = time.perf_counter() - start
+        assert result.values.tolist() == reference
+
+        print(f"{label} ({args.values} values, {len(reference)} kept)")
+        print(f"  former filter: {t_legacy*1.e+3:10.2f} ms")
+        print(f"  unique:        {t_new*1.e+3:10.2f} ms (x{t_legacy/t_new:.0f})")
+
+
+if __name__ == "__main__":
+    main()
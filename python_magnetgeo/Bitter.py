@@ -11,6 +11,8 @@ Provides definition for Bitter:
 
 import json
 import yaml
+from . import yaml_utils
+from . import markers
 
 from .ModelAxi import ModelAxi
 from .coolingslit import CoolingSlit
@@ -66,12 +68,33 @@ class Bitter(yaml.YAMLObject):
         eps = slit.n * slit.sh / (2 * pi * x)
         return eps
 
+    __getstate__ = markers.get_state
+
+    def get_fingerprint(self) -> tuple:
+        """
+        return the fields marker names depend on (see markers)
+        """
+        nslits = len(self.coolingslits) if self.coolingslits else 0
+        return (nslits, len(self.modelaxi.turns), self.modelaxi.h, tuple(self.z))
+
     def get_channels(
         self, mname: str, hideIsolant: bool = True, debug: bool = False
     ) -> list[str]:
         """
-        return channels
+        return channels (memoized, see markers)
         """
+        if debug:
+            return self._get_channels(mname, hideIsolant, debug)
+        return markers.memoize_names(
+            self,
+            ("channels", mname, hideIsolant),
+            self.get_fingerprint(),
+            lambda: self._get_channels(mname, hideIsolant),
+        )
+
+    def _get_channels(
+        self, mname: str, hideIsolant: bool = True, debug: bool = False
+    ) -> list[str]:
         prefix = ""
         if mname:
             prefix = f"{mname}_"
@@ -80,11 +103,13 @@ class Bitter(yaml.YAMLObject):
         n_slits = 0
         if self.coolingslits:
             n_slits = len(self.coolingslits)
-            print(f"Bitter({self.name}): CoolingSlits={n_slits}")
+            if debug:
+                print(f"Bitter({self.name}): CoolingSlits={n_slits}")
 
             Channels += [f"{prefix}Slit{i+1}" for i in range(n_slits)]
         Channels += [f"{prefix}Slit{n_slits+1}"]
-        print(f"Bitter({prefix}): {Channels}")
+        if debug:
+            print(f"Bitter({prefix}): {Channels}")
         return Channels
 
     def get_lc(self) -> float:
@@ -112,8 +137,44 @@ class Bitter(yaml.YAMLObject):
         self, mname: str, is2D: bool = False, verbose: bool = False
     ) -> list[str]:
         """
-        return names for Markers
+        return names for Markers (memoized, see markers)
         """
+        if verbose:
+            return self._get_names(mname, is2D, verbose)
+        return markers.memoize_names(
+            self,
+            ("names", mname, is2D),
+            self.get_fingerprint(),
+            lambda: self._get_names(mname, is2D),
+        )
+
+    def get_marker_index(self, mname: str, is2D: bool = False):
+        """
+        return a read-only dict mapping marker names to Marker (see markers)
+
+        2D: {mname}_B{j}_Slit{i} is slit i of section j
+        """
+
+        def compute() -> dict:
+            prefix = f"{mname}_" if mname else ""
+            index = {}
+            for name in self.get_names(mname, is2D):
+                if is2D:
+                    (section, slit) = name[len(prefix) + 1 :].split("_Slit")
+                    index[name] = markers.Marker(mname, "Slit", int(slit), self.name, int(section))
+                elif name == f"{prefix}B":
+                    index[name] = markers.Marker(mname, "Bitter", 1, self.name)
+                else:
+                    index[name] = markers.Marker(mname, "Insulator", 1, self.name)
+            return index
+
+        return markers.memoize_index(
+            self, ("markers", mname, is2D), self.get_fingerprint(), compute
+        )
+
+    def _get_names(
+        self, mname: str, is2D: bool = False, verbose: bool = False
+    ) -> list[str]:
         tol = 1.0e-10
         solid_names = []
 
@@ -171,7 +232,7 @@ class Bitter(yaml.YAMLObject):
         """
         try:
             with open(f"{self.name}.yaml", "w") as ostream:
-                yaml.dump(self, stream=ostream)
+                yaml_utils.dump(self, stream=ostream)
         except:
             raise Exception("Failed to Bitter dump")
 
@@ -182,7 +243,7 @@ class Bitter(yaml.YAMLObject):
         data = None
         try:
             with open(f"{self.name}.yaml", "r") as istream:
-                data = yaml.load(stream=istream, Loader=yaml.FullLoader)
+                data = yaml_utils.load(istream)
         except:
             raise Exception(f"Failed to load Bitter data {self.name}.yaml")
 
@@ -223,8 +284,7 @@ class Bitter(yaml.YAMLObject):
 
         if debug:
             print(f'Bitter.from_json: filename={filename}')
-        with open(filename, "r") as istream:
-            return json.loads(istream.read(), object_hook=deserialize.unserialize_object)
+        return deserialize.load_json(filename)
     
     def get_Nturns(self) -> float:
         """
@@ -256,6 +316,7 @@ class Bitter(yaml.YAMLObject):
 
     def get_params(self, workingDir: str = ".") -> tuple:
         from math import pi
+        from .axi_utils import unique
 
         tol = 1.0e-10
 
@@ -279,15 +340,9 @@ class Bitter(yaml.YAMLObject):
         Dh += [2 * (self.outerbore - self.r[1])]
         Sh += [pi * (self.outerbore - self.r[1]) * (self.outerbore + self.r[1])]
 
-        Zh = [self.z[0]]
-        z = -self.modelaxi.h
-        if abs(self.z[0] - z) >= tol:
-            Zh.append(z)
-        for n, p in zip(self.modelaxi.turns, self.modelaxi.pitch):
-            z += n * p
-            Zh.append(z)
-        if abs(self.z[1] - z) >= tol:
-            Zh.append(self.z[1])
+        # z bounds and section boundaries, merged when equal within tol
+        z = self.modelaxi.get_z()
+        Zh = unique([self.z[0], *z.tolist(), self.z[1]], tol).values.tolist()
         print(f"Zh={Zh}")
 
         filling_factor.append(1)
@@ -300,7 +355,7 @@ class Bitter(yaml.YAMLObject):
         """
         create cut files
         """
-        from cut_utils import create_cut
+        from .cut_utils import create_cut
         create_cut(self, format, self.name)
 
 
@@ -326,4 +381,5 @@ def Bitter_constructor(loader, node):
     return Bitter(name, r, z, odd, modelaxi, coolingslits, tierod, innerbore, outerbore)
 
 
-yaml.add_constructor("!Bitter", Bitter_constructor)
+yaml_utils.add_constructor("!Bitter", Bitter_constructor)
+yaml_utils.register(Bitter)
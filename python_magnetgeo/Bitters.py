@@ -5,6 +5,10 @@
 
 import json
 import yaml
+from . import yaml_utils
+
+from . import resolver
+from . import markers
 
 
 class Bitters(yaml.YAMLObject):
@@ -37,6 +41,18 @@ class Bitters(yaml.YAMLObject):
             self.outerbore,
         )
 
+    __getstate__ = markers.get_state
+
+    def get_fingerprint(self) -> tuple | None:
+        """
+        return the magnets and the stamps of all the files they reference
+        (see markers), None if a magnet is not defined by a file
+        """
+        stamps = markers.tree_stamps(self)
+        if stamps is None:
+            return None
+        return (markers.copy_names(self.magnets), stamps)
+
     def get_channels(
         self, mname: str, hideIsolant: bool = True, debug: bool = False
     ) -> dict:
@@ -47,25 +63,19 @@ class Bitters(yaml.YAMLObject):
         Channels = {}
 
         if isinstance(self.magnets, str):
-            YAMLFile = f"{self.magnets}.yaml"
-            with open(YAMLFile, "r") as f:
-                Object = yaml.load(f, Loader=yaml.FullLoader)
+            Object = resolver.load(self.magnets)
 
             Channels[self.name] = Object.get_channels(self.name, hideIsolant, debug)
         elif isinstance(self.magnets, list):
             for magnet in self.magnets:
-                YAMLFile = f"{magnet}.yaml"
-                with open(YAMLFile, "r") as f:
-                    Object = yaml.load(f, Loader=yaml.FullLoader)
+                Object = resolver.load(magnet)
 
                 Channels[magnet] = Object.get_channels(magnet, hideIsolant, debug)
 
         elif isinstance(self.magnets, dict):
             for key in self.magnets:
                 magnet = self.magnets[key]
-                YAMLFile = f"{magnet}.yaml"
-                with open(YAMLFile, "r") as f:
-                    Object = yaml.load(f, Loader=yaml.FullLoader)
+                Object = resolver.load(magnet)
 
                 Channels[magnet] = Object.get_channels(key, hideIsolant, debug)
 
@@ -94,16 +104,12 @@ class Bitters(yaml.YAMLObject):
         """
         solid_names = []
         if isinstance(self.magnets, str):
-            YAMLFile = f"{self.magnets}.yaml"
-            with open(YAMLFile, "r") as f:
-                Object = yaml.load(f, Loader=yaml.FullLoader)
+            Object = resolver.load(self.magnets)
 
             solid_names += Object.get_names(self.name, is2D, verbose)
         elif isinstance(self.magnets, list):
             for magnet in self.magnets:
-                YAMLFile = f"{magnet}.yaml"
-                with open(YAMLFile, "r") as f:
-                    Object = yaml.load(f, Loader=yaml.FullLoader)
+                Object = resolver.load(magnet)
 
                 solid_names += Object.get_names(
                     magnet, is2D, verbose
@@ -111,9 +117,7 @@ class Bitters(yaml.YAMLObject):
         elif isinstance(self.magnets, dict):
             for key in self.magnets:
                 magnet = self.magnets[key]
-                YAMLFile = f"{magnet}.yaml"
-                with open(YAMLFile, "r") as f:
-                    Object = yaml.load(f, Loader=yaml.FullLoader)
+                Object = resolver.load(magnet)
 
                 solid_names += Object.get_names(self.name, is2D, verbose)
         else:
@@ -125,11 +129,38 @@ class Bitters(yaml.YAMLObject):
             print(f"Bitters/get_names: solid_names {len(solid_names)}")
         return solid_names
 
+    def get_marker_index(self, mname: str, is2D: bool = False):
+        """
+        return a read-only dict mapping marker names to Marker (see markers),
+        Bitter magnets are named as in get_names
+        """
+
+        def compute() -> dict:
+            if isinstance(self.magnets, str):
+                parts = [(self.name, self.magnets)]
+            elif isinstance(self.magnets, list):
+                parts = [(str(magnet), magnet) for magnet in self.magnets]
+            elif isinstance(self.magnets, dict):
+                parts = [(self.name, magnet) for magnet in self.magnets.values()]
+            else:
+                raise RuntimeError(
+                    f"Bitters/get_marker_index: unsupported type of magnets ({type(self.magnets)})"
+                )
+
+            index = {}
+            for name, magnet in parts:
+                index.update(resolver.load(magnet).get_marker_index(name, is2D))
+            return index
+
+        return markers.memoize_index(
+            self, ("markers", mname, is2D), self.get_fingerprint(), compute
+        )
+
     def dump(self):
         """dump to a yaml file name.yaml"""
         try:
             with open(f"{self.name}.yaml", "w") as ostream:
-                yaml.dump(self, stream=ostream)
+                yaml_utils.dump(self, stream=ostream)
         except:
             raise Exception("Failed to Bitters dump")
 
@@ -138,7 +169,7 @@ class Bitters(yaml.YAMLObject):
         data = None
         try:
             with open(f"{self.name}.yaml", "r") as istream:
-                data = yaml.load(stream=istream, Loader=yaml.FullLoader)
+                data = yaml_utils.load(istream)
         except:
             raise Exception(f"Failed to load Insert data {self.name}.yaml")
 
@@ -171,8 +202,7 @@ class Bitters(yaml.YAMLObject):
 
         if debug:
             print(f'Bitters.from_json: filename={filename}')
-        with open(filename, "r") as istream:
-            return json.loads(istream.read(), object_hook=deserialize.unserialize_object)
+        return deserialize.load_json(filename)
 
     ###################################################################
     #
@@ -190,18 +220,18 @@ class Bitters(yaml.YAMLObject):
         zb = [0, 0]
 
         for i, mname in enumerate(self.magnets):
-            bitter = None
-            with open(f"{mname}.yaml", "r") as f:
-                bitter = yaml.load(f, Loader=yaml.FullLoader)
+            # only r and z are needed
+            data = resolver.load_fields(mname, ["r", "z"])
+            (r, z) = (data["r"], data["z"])
 
             if i == 0:
-                rb = bitter.r
-                zb = bitter.z
+                rb = list(r)
+                zb = list(z)
 
-            rb[0] = min(rb[0], bitter.r[0])
-            zb[0] = min(zb[0], bitter.z[0])
-            rb[1] = max(rb[1], bitter.r[1])
-            zb[1] = max(zb[1], bitter.z[1])
+            rb[0] = min(rb[0], r[0])
+            zb[0] = min(zb[0], z[0])
+            rb[1] = max(rb[1], r[1])
+            zb[1] = max(zb[1], z[1])
 
         return (rb, zb)
 
@@ -244,4 +274,5 @@ def Bitters_constructor(loader, node):
     return Bitters(name, magnets, innerbore, outerbore)
 
 
-yaml.add_constructor("!Bitters", Bitters_constructor)
+yaml_utils.add_constructor("!Bitters", Bitters_constructor)
+yaml_utils.register(Bitters)
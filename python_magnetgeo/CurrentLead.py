@@ -7,6 +7,7 @@ Provides Inner and OuterCurrentLead class
 
 import json
 import yaml
+from . import yaml_utils
 
 
 class InnerCurrentLead(yaml.YAMLObject):
@@ -51,7 +52,7 @@ class InnerCurrentLead(yaml.YAMLObject):
         dump object to file
         """
         try:
-            yaml.dump(self, open(self._name + ".yaml", "w"))
+            yaml_utils.dump(self, open(self._name + ".yaml", "w"))
         except:
             raise Exception("Failed to dump InnerCurrentLead data")
 
@@ -62,7 +63,7 @@ class InnerCurrentLead(yaml.YAMLObject):
         data = None
         try:
             istream = open(self._name + ".yaml", "r")
-            data = yaml.load(istream, Loader=yaml.FullLoader)
+            data = yaml_utils.load(istream)
             istream.close()
         except:
             raise Exception("Failed to load InnerCurrentLead data %s.yaml" % self._name)
@@ -105,8 +106,7 @@ class InnerCurrentLead(yaml.YAMLObject):
 
         if debug:
             print(f'InnerCurrentLead.from_json: filename={filename}')
-        with open(filename, "r") as istream:
-            return json.loads(istream.read(), object_hook=deserialize.unserialize_object)
+        return deserialize.load_json(filename)
     
 
 
@@ -164,7 +164,7 @@ class OuterCurrentLead(yaml.YAMLObject):
         dump object to file
         """
         try:
-            yaml.dump(self, open(self.name + ".yaml", "w"))
+            yaml_utils.dump(self, open(self.name + ".yaml", "w"))
         except:
             raise Exception("Failed to dump OuterCurrentLead data")
 
@@ -175,7 +175,7 @@ class OuterCurrentLead(yaml.YAMLObject):
         data = None
         try:
             istream = open(self.name + ".yaml", "r")
-            data = yaml.load(stream=istream, Loader=yaml.FullLoader)
+            data = yaml_utils.load(istream)
             istream.close()
         except:
             raise Exception("Failed to load OuterCurrentLead data %s.yaml" % self.name)
@@ -217,8 +217,7 @@ class OuterCurrentLead(yaml.YAMLObject):
 
         if debug:
             print(f'OuterCurrentLead.from_json: filename={filename}')
-        with open(filename, "r") as istream:
-            return json.loads(istream.read(), object_hook=deserialize.unserialize_object)
+        return deserialize.load_json(filename)
 
 def OuterCurrentLead_constructor(loader, node):
     """
@@ -233,5 +232,7 @@ def OuterCurrentLead_constructor(loader, node):
     return OuterCurrentLead(name, r, h, bar, support)
 
 
-yaml.add_constructor("!InnerCurrentLead", InnerCurrentLead_constructor)
-yaml.add_constructor("!OuterCurrentLead", OuterCurrentLead_constructor)
+yaml_utils.add_constructor("!InnerCurrentLead", InnerCurrentLead_constructor)
+yaml_utils.add_constructor("!OuterCurrentLead", OuterCurrentLead_constructor)
+yaml_utils.register(InnerCurrentLead)
+yaml_utils.register(OuterCurrentLead)
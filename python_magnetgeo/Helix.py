@@ -13,6 +13,8 @@ Provides definition for Helix:
 import math
 import json
 import yaml
+from . import yaml_utils
+from . import markers
 
 from .Shape import Shape
 from .ModelAxi import ModelAxi
@@ -68,10 +70,66 @@ class Helix(yaml.YAMLObject):
     def get_lc(self) -> float:
         return (self.r[1] - self.r[0]) / 10.0
 
+    __getstate__ = markers.get_state
+
+    def get_fingerprint(self) -> tuple:
+        """
+        return the fields marker names depend on (see markers)
+        """
+        angle = None
+        if self.model3d.with_shapes:
+            angle = tuple(self.shape.angle)
+        return (
+            len(self.modelaxi.turns),
+            self.get_Nturns(),
+            self.dble,
+            self.model3d.with_shapes,
+            self.model3d.with_channels,
+            angle,
+        )
+
     def get_names(self, mname: str, is2D: bool, verbose: bool = False) -> list[str]:
         """
-        return names for Markers
+        return names for Markers (memoized, see markers)
+        """
+        if verbose:
+            return self._get_names(mname, is2D, verbose)
+        return markers.memoize_names(
+            self,
+            ("names", mname, is2D),
+            self.get_fingerprint(),
+            lambda: self._get_names(mname, is2D),
+        )
+
+    def get_marker_index(self, mname: str, is2D: bool = False):
+        """
+        return a read-only dict mapping marker names to Marker (see markers)
+
+        2D: {mname}_Cu{j} is section j (0: HP, nsections + 1: BP)
         """
+
+        def compute() -> dict:
+            prefix = f"{mname}_" if mname else ""
+            insulator = "Glue"
+            if self.model3d.with_shapes and self.model3d.with_channels:
+                insulator = "Kapton"
+            index = {}
+            for name in self.get_names(mname, is2D):
+                if is2D:
+                    section = int(name[len(prefix) + 2 :])
+                    index[name] = markers.Marker(mname, "Helix", 1, self.name, section)
+                elif name == "Cu":
+                    index[name] = markers.Marker(mname, "Helix", 1, self.name)
+                else:
+                    number = int(name.removeprefix(insulator))
+                    index[name] = markers.Marker(mname, "Insulator", number, self.name)
+            return index
+
+        return markers.memoize_index(
+            self, ("markers", mname, is2D), self.get_fingerprint(), compute
+        )
+
+    def _get_names(self, mname: str, is2D: bool, verbose: bool = False) -> list[str]:
         solid_names = []
 
         prefix = ""
@@ -148,7 +206,7 @@ class Helix(yaml.YAMLObject):
         """
         try:
             with open(f"{self.name}.yaml", "w") as ostream:
-                yaml.dump(self, stream=ostream)
+                yaml_utils.dump(self, stream=ostream)
         except:
             raise Exception("Failed to Helix dump")
 
@@ -159,7 +217,7 @@ class Helix(yaml.YAMLObject):
         data = None
         try:
             with open(f"{self.name}.yaml", "r") as istream:
-                data = yaml.load(stream=istream, Loader=yaml.FullLoader)
+                data = yaml_utils.load(istream)
         except:
             raise Exception("Failed to load Helix data %s.yaml" % self.name)
 
@@ -192,8 +250,7 @@ class Helix(yaml.YAMLObject):
 
         if debug:
             print(f'Helix.from_json: filename={filename}')
-        with open(filename, "r") as istream:
-            return json.loads(istream.read(), object_hook=deserialize.unserialize_object)
+        return deserialize.load_json(filename)
     
     def write_to_json(self):
         """
@@ -240,6 +297,50 @@ class Helix(yaml.YAMLObject):
         """
         return (self.r, self.z)
 
+    def locate(self, r, theta, z) -> tuple:
+        """
+        locate points (r, theta, z) in the helix
+
+        r, theta (in rad) and z are arrays (or scalars) of the same shape,
+        in the frame of the helix (the cut spans [-modelaxi.h, modelaxi.h]).
+
+        The cut is the helical surface defined by modelaxi, turning
+        counterclockwise when odd is True, clockwise otherwise,
+        of width cutwidth along z. Shapes eventually added to the cut are ignored.
+
+        returns (in_copper, in_cut, turn):
+        in_copper, in_cut: True if the point is in copper / in the cut,
+        both are False for points out of [r[0], r[1]] x [z[0], z[1]]
+        turn: number of turns of the cut below the point
+        """
+        import numpy as np
+
+        r = np.asarray(r, dtype=np.float64)
+        theta = np.asarray(theta, dtype=np.float64)
+        z = np.asarray(z, dtype=np.float64)
+
+        sign = 1 if self.odd else -1
+        twopi = 2 * np.pi
+        (zs, thetas) = self.modelaxi.get_profile()
+        theta_max = thetas[-1]
+
+        # angle of the point along the cut and angle reached by the cut at z
+        phi = np.mod(sign * theta, twopi)
+        theta_z = np.interp(z, zs, thetas)
+
+        # turns of the cut just below and just above the point
+        turn = np.maximum(np.ceil((theta_z - phi) / twopi), 0).astype(np.int64)
+        below = phi + twopi * (turn - 1)
+        above = phi + twopi * turn
+        half = self.cutwidth / 2.0
+        in_cut = (turn >= 1) & (z - np.interp(below, thetas, zs) <= half)
+        in_cut |= (above <= theta_max) & (np.interp(above, thetas, zs) - z <= half)
+
+        inside = (r >= self.r[0]) & (r <= self.r[1]) & (z >= self.z[0]) & (z <= self.z[1])
+        in_cut &= inside
+        in_copper = inside & ~in_cut
+        return (in_copper, in_cut, turn)
+
     def htype(self):
         """
         return the type of Helix (aka HR or HL)
@@ -296,4 +397,5 @@ def Helix_constructor(loader, node):
     return Helix(name, r, z, cutwidth, odd, dble, modelaxi, model3d, shape)
 
 
-yaml.add_constructor("!Helix", Helix_constructor)
+yaml_utils.add_constructor("!Helix", Helix_constructor)
+yaml_utils.register(Helix)
@@ -7,6 +7,7 @@ Provides Inner and OuterCurrentLead class
 
 import json
 import yaml
+from . import yaml_utils
 
 
 class InnerCurrentLead(yaml.YAMLObject):
@@ -59,7 +60,7 @@ class InnerCurrentLead(yaml.YAMLObject):
         dump object to file
         """
         try:
-            yaml.dump(self, open(f"{self.name}.yaml", "w"))
+            yaml_utils.dump(self, open(f"{self.name}.yaml", "w"))
         except:
             raise Exception("Failed to dump InnerCurrentLead data")
 
@@ -70,7 +71,7 @@ class InnerCurrentLead(yaml.YAMLObject):
         data = None
         try:
             with open(f"{self.name}.yaml", "r") as istream:
-                data = yaml.load(istream, Loader=yaml.FullLoader)
+                data = yaml_utils.load(istream)
         except:
             raise Exception(f"Failed to load InnerCurrentLead data {self.name}.yaml")
 
@@ -111,8 +112,7 @@ class InnerCurrentLead(yaml.YAMLObject):
 
         if debug:
             print(f'InnerCurrentLead.from_json: filename={filename}')
-        with open(filename, "r") as istream:
-            return json.loads(istream.read(), object_hook=deserialize.unserialize_object)
+        return deserialize.load_json(filename)
 
 
 def InnerCurrentLead_constructor(loader, node):
@@ -129,7 +129,8 @@ def InnerCurrentLead_constructor(loader, node):
     return InnerCurrentLead(name, r, h, holes, support, fillet)
 
 
-yaml.add_constructor("!InnerCurrentLead", InnerCurrentLead_constructor)
+yaml_utils.add_constructor("!InnerCurrentLead", InnerCurrentLead_constructor)
+yaml_utils.register(InnerCurrentLead)
 
 #
 # To operate from command line
@@ -157,7 +158,7 @@ if __name__ == "__main__":
     else:
         lead = None
         with open(args.name, "r") as f:
-            lead = yaml.load(f, Loader=yaml.FullLoader)
+            lead = yaml_utils.load(f)
         print("lead=", lead)
 
     if args.tojson:
@@ -3,24 +3,71 @@
 
 """defines Insert structure"""
 
+from typing import NamedTuple
+
 import math
 import datetime
 import json
+from collections import OrderedDict
+from threading import Lock
+
 import yaml
 from . import InnerCurrentLead
+from . import resolver
+from . import yaml_utils
+from . import markers
 
 
 def filter(data: list[float], tol: float = 1.e-6) -> list[float]:
-    result = []
-    ndata = len(data)
-    for i in range(ndata):
-        result += [
-            j for j in range(i, ndata) if i != j and abs(data[i] - data[j]) <= tol
-        ]
-    # print(f"duplicate index: {result}")
+    """
+    remove the values equal within tol to a previous value of data
+    (see axi_utils.unique)
+    """
+    from .axi_utils import unique
+
+    return unique(data, tol).values.tolist()
+
+
+class InsertParams(NamedTuple):
+    """
+    parameters of the cooling channels of an Insert (see Insert.get_params)
+
+    Nsections: number of sections per helix
+    R1, R2: inner and outer radius per helix
+    Dh, Sh: hydraulic diameter and section per channel
+    Zc: sorted z values per channel
+    """
 
-    # remove result from data
-    return [data[i] for i in range(ndata) if not i in result]
+    NHelices: int
+    NRings: int
+    NChannels: int
+    Nsections: "numpy.ndarray"
+    R1: "numpy.ndarray"
+    R2: "numpy.ndarray"
+    Dh: "numpy.ndarray"
+    Sh: "numpy.ndarray"
+    Zc: "list[numpy.ndarray]"
+
+
+# get_params results, keyed on the Insert and the stamps of its files
+_params_lock = Lock()
+_params_cache: OrderedDict = OrderedDict()
+_params_maxsize: int = 128
+
+
+def _params_key(insert, workingDir: str) -> tuple | None:
+    """
+    returns the cache key of insert.get_params, None if it cannot be cached
+    """
+    stamps = []
+    for names in [insert.Helices, insert.Rings]:
+        for name in names:
+            value = resolver.stamp(name, workingDir)
+            if value is None:
+                return None
+            stamps.append(value)
+        stamps.append(None)
+    return (tuple(stamps), insert.innerbore, insert.outerbore)
 
 
 class Insert(yaml.YAMLObject):
@@ -62,13 +109,41 @@ class Insert(yaml.YAMLObject):
         self.innerbore = innerbore
         self.outerbore = outerbore
 
+    __getstate__ = markers.get_state
+
+    def get_fingerprint(self) -> tuple | None:
+        """
+        return the names of the components and the stamps of their files
+        (see markers), None if a component is not defined by a file
+        """
+        stamps = markers.tree_stamps(self)
+        if stamps is None:
+            return None
+        return (
+            tuple(self.Helices),
+            tuple(self.Rings),
+            tuple(self.CurrentLeads or []),
+            stamps,
+        )
+
     def get_channels(
         self, mname: str, hideIsolant: bool = True, debug: bool = False
     ) -> list[list]:
         """
-        return channels
+        return channels (memoized, see markers)
         """
+        if debug:
+            return self._get_channels(mname, hideIsolant, debug)
+        return markers.memoize_channels(
+            self,
+            ("channels", mname, hideIsolant),
+            (len(self.Helices),),
+            lambda: self._get_channels(mname, hideIsolant),
+        )
 
+    def _get_channels(
+        self, mname: str, hideIsolant: bool = True, debug: bool = False
+    ) -> list[list]:
         prefix = ""
         if mname:
             prefix = f"{mname}_"
@@ -122,8 +197,52 @@ class Insert(yaml.YAMLObject):
         self, mname: str, is2D: bool = False, verbose: bool = False
     ) -> list[str]:
         """
-        return names for Markers
+        return names for Markers (memoized, see markers)
+        """
+        if verbose:
+            return self._get_names(mname, is2D, verbose)
+        return markers.memoize_names(
+            self,
+            ("names", mname, is2D),
+            self.get_fingerprint(),
+            lambda: self._get_names(mname, is2D),
+        )
+
+    def get_marker_index(self, mname: str, is2D: bool = False):
+        """
+        return a read-only dict mapping marker names to Marker (see markers)
+
+        eg. 2D: {mname}_H3_Cu2 is section 2 of helix 3
         """
+
+        def compute() -> dict:
+            prefix = f"{mname}_" if mname else ""
+            index = {}
+            for i, helix in enumerate(self.Helices):
+                if is2D:
+                    hHelix = resolver.load(helix)
+                    for name, marker in hHelix.get_marker_index(f"{prefix}H{i+1}", is2D).items():
+                        index[name] = marker._replace(magnet=mname, index=i + 1)
+                else:
+                    index[f"H{i+1}"] = markers.Marker(mname, "Helix", i + 1, str(helix))
+            for i, ring in enumerate(self.Rings):
+                index[f"{prefix}R{i+1}"] = markers.Marker(mname, "Ring", i + 1, str(ring))
+            if not is2D and self.CurrentLeads is not None:
+                for i, Lead in enumerate(self.CurrentLeads):
+                    clLead = resolver.load(Lead)
+                    lprefix = "o"
+                    if isinstance(clLead, InnerCurrentLead.InnerCurrentLead):
+                        lprefix = "i"
+                    index[f"{lprefix}L{i+1}"] = markers.Marker(mname, "CurrentLead", i + 1, str(Lead))
+            return index
+
+        return markers.memoize_index(
+            self, ("markers", mname, is2D), self.get_fingerprint(), compute
+        )
+
+    def _get_names(
+        self, mname: str, is2D: bool = False, verbose: bool = False
+    ) -> list[str]:
         prefix = ""
         if mname:
             prefix = f"{mname}_"
@@ -133,10 +252,8 @@ class Insert(yaml.YAMLObject):
         NChannels = NHelices + 1  # To be updated if there is any htype==HR in Insert
         NIsolants = []  # To be computed depend on htype and dble
         for i, helix in enumerate(self.Helices):
-            hHelix = None
             Ninsulators = 0
-            with open(f"{helix}.yaml", "r") as f:
-                hHelix = yaml.load(f, Loader=yaml.FullLoader)
+            hHelix = resolver.load(helix)
 
             if is2D:
                 h_solid_names = hHelix.get_names(f"{prefix}H{i+1}", is2D, verbose)
@@ -153,8 +270,7 @@ class Insert(yaml.YAMLObject):
         if not is2D:
             if self.CurrentLeads is not None:
                 for i, Lead in enumerate(self.CurrentLeads):
-                    with open(Lead + ".yaml", "r") as f:
-                        clLead = yaml.load(f, Loader=yaml.FullLoader)
+                    clLead = resolver.load(Lead)
                     prefix = "o"
                     if isinstance(clLead, InnerCurrentLead.InnerCurrentLead):
                         prefix = "i"
@@ -164,6 +280,54 @@ class Insert(yaml.YAMLObject):
             print(f"Insert_Gmsh: solid_names {len(solid_names)}")
         return solid_names
 
+    def use_lazy_refs(self, workingDir: str = ".") -> None:
+        """
+        replace Helices, Rings and CurrentLeads names by lazy references
+
+        each object is only loaded on first access to one of its attributes
+        """
+        self.Helices = resolver.lazy_list(self.Helices, workingDir)
+        self.Rings = resolver.lazy_list(self.Rings, workingDir)
+        self.CurrentLeads = resolver.lazy_list(self.CurrentLeads, workingDir)
+
+    def generate_cuts(
+        self,
+        format: str | list[str] = "SALOME",
+        workers: int | None = None,
+        workingDir: str = ".",
+        directory: str = ".",
+        compact: bool = False,
+    ) -> list[dict]:
+        """
+        write the cut files of all helices, in a process pool
+
+        format: cut format (SALOME, LNCMI) or list of formats
+        workers: number of processes (1: no pool)
+        directory: where cut files are written (existing files are overwritten)
+        compact: merge runs of sections with equal pitch
+
+        helices with shapes are reported as unsupported in the manifest,
+        without writing their cuts: use Helix.generate_cut (add_shape)
+
+        returns the manifest of the files written (see cut_utils.write_cut_file)
+        """
+        from concurrent.futures import ProcessPoolExecutor
+        from .cut_utils import write_cut_file
+
+        formats = [format] if isinstance(format, str) else list(format)
+        helices = [resolver.load(helix, workingDir) for helix in self.Helices]
+        tasks = [(helix, f) for helix in helices for f in formats]
+
+        if workers == 1:
+            return [write_cut_file(helix, f, directory, compact) for helix, f in tasks]
+
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [
+                executor.submit(write_cut_file, helix, f, directory, compact)
+                for helix, f in tasks
+            ]
+            return [future.result() for future in futures]
+
     def get_nhelices(self):
         """
         return names for Markers
@@ -192,7 +356,7 @@ class Insert(yaml.YAMLObject):
         """dump to a yaml file name.yaml"""
         try:
             with open(f"{self.name}.yaml", "w") as ostream:
-                yaml.dump(self, stream=ostream)
+                yaml_utils.dump(self, stream=ostream)
         except:
             print("Failed to Insert dump")
 
@@ -201,7 +365,7 @@ class Insert(yaml.YAMLObject):
         data = None
         try:
             with open(f"{self.name}.yaml", "r") as istream:
-                data = yaml.load(stream=istream, Loader=yaml.FullLoader)
+                data = yaml_utils.load(istream)
         except:
             raise Exception("Failed to load Insert data %s" % (self.name + ".yaml"))
 
@@ -239,8 +403,26 @@ class Insert(yaml.YAMLObject):
 
         if debug:
             print(f'Insert.from_json: filename={filename}')
-        with open(filename, "r") as istream:
-            return json.loads(istream.read(), object_hook=deserialize.unserialize_object)
+        return deserialize.load_json(filename)
+
+    def write_to_snapshot(self, workingDir: str = ".", workers: int | None = None):
+        """
+        write to a binary snapshot, with all referenced objects inlined
+        """
+        from . import snapshot
+
+        snapshot.dump(self, f"{self.name}.snapshot", workingDir, workers)
+
+    @classmethod
+    def from_snapshot(cls, filename: str, debug: bool = False):
+        """
+        load from a binary snapshot
+        """
+        from . import snapshot
+
+        if debug:
+            print(f'Insert.from_snapshot: filename={filename}')
+        return snapshot.load(filename)
 
     ###################################################################
     #
@@ -258,26 +440,24 @@ class Insert(yaml.YAMLObject):
         zb = [0, 0]
 
         for i, name in enumerate(self.Helices):
-            Helix = None
-            with open(name + ".yaml", "r") as f:
-                Helix = yaml.load(f, Loader=yaml.FullLoader)
+            # only r and z are needed
+            data = resolver.load_fields(name, ["r", "z"])
+            (r, z) = (data["r"], data["z"])
 
             if i == 0:
-                rb = Helix.r
-                zb = Helix.z
+                rb = list(r)
+                zb = list(z)
 
-            rb[0] = min(rb[0], Helix.r[0])
-            zb[0] = min(zb[0], Helix.z[0])
-            rb[1] = max(rb[1], Helix.r[1])
-            zb[1] = max(zb[1], Helix.z[1])
+            rb[0] = min(rb[0], r[0])
+            zb[0] = min(zb[0], z[0])
+            rb[1] = max(rb[1], r[1])
+            zb[1] = max(zb[1], z[1])
 
         ring_dz_max = 0
         for i, name in enumerate(self.Rings):
-            Ring = None
-            with open(name + ".yaml", "r") as f:
-                Ring = yaml.load(f, Loader=yaml.FullLoader)
+            z = resolver.load_fields(name, ["z"])["z"]
 
-            ring_dz_max = abs(Ring.z[-1] - Ring.z[0])
+            ring_dz_max = abs(z[-1] - z[0])
 
         zb[0] -= ring_dz_max
         zb[1] += ring_dz_max
@@ -374,9 +554,7 @@ class Insert(yaml.YAMLObject):
             HP = []
             dH = []
 
-            Helix = None
-            with open(name + ".yaml", "r") as f:
-                Helix = yaml.load(f, Loader=yaml.FullLoader)
+            Helix = resolver.load(name)
             geofile.write(f"// H{i+1} : {Helix.name}\n")
             geofile.write(onelab_r0 % (i + 1, Helix.r[0], i + 1))
             geofile.write(onelab_r1 % (i + 1, Helix.r[1], i + 1))
@@ -511,9 +689,7 @@ class Insert(yaml.YAMLObject):
             BP = []
             HP = []
 
-            Ring = None
-            with open(name + ".yaml", "r") as f:
-                Ring = yaml.load(f, Loader=yaml.FullLoader)
+            Ring = resolver.load(name)
             geofile.write(
                 "// R%d [%d, H%d] : %s\n" % (i + 1, H0 + 1, H1 + 1, Ring.name)
             )
@@ -909,7 +1085,7 @@ class Insert(yaml.YAMLObject):
 
         return (H_ids, Ring_ids, BC_ids, Air_ids, BC_Air_ids)
 
-    def get_params(self, workingDir: str = ".") -> tuple:
+    def get_params(self, workingDir: str = ".") -> InsertParams:
         """
         get params
 
@@ -920,118 +1096,87 @@ class Insert(yaml.YAMLObject):
 
         R1
         R2
-        Z1
-        Z2
         Dh,
         Sh,
-        Zh
+        Zc: z values per cooling channel (for Tw(z) estimate)
+
+        returns an InsertParams (a named tuple: may be unpacked as before),
+        built from arrays. Results are cached until the files of the helices
+        or rings change.
         """
+        key = _params_key(self, workingDir)
+        params = None
+        if key is not None:
+            with _params_lock:
+                params = _params_cache.get(key)
+                if params is not None:
+                    _params_cache.move_to_end(key)
+        if params is None:
+            params = self._compute_params(workingDir)
+            if key is not None:
+                with _params_lock:
+                    _params_cache[key] = params
+                    while len(_params_cache) > _params_maxsize:
+                        _params_cache.popitem(last=False)
+
+        # cached arrays are shared: return copies
+        return params._replace(
+            Nsections=params.Nsections.copy(),
+            R1=params.R1.copy(),
+            R2=params.R2.copy(),
+            Dh=params.Dh.copy(),
+            Sh=params.Sh.copy(),
+            Zc=[z.copy() for z in params.Zc],
+        )
+
+    def _compute_params(self, workingDir: str = ".") -> InsertParams:
+        import numpy as np
+        from .axi_utils import unique
 
         NHelices = len(self.Helices)
         NRings = len(self.Rings)
         NChannels = NHelices + 1
 
-        Nsections = []
-        Nturns_h = []
-        R1 = []
-        R2 = []
-        Nsections = []
-        Nturns_h = []
-        Dh = []
-        Sh = []
-
+        Nsections = np.empty(NHelices, dtype=np.intp)
+        R = np.empty((NHelices, 2))
         Zh = []
         for i, helix in enumerate(self.Helices):
-            hhelix = None
-            with open(f"{workingDir}/{helix}.yaml", "r") as f:
-                hhelix = yaml.load(f, Loader=yaml.FullLoader)
-            n_sections = len(hhelix.modelaxi.turns)
-            Nsections.append(n_sections)
-            Nturns_h.append(hhelix.modelaxi.turns)
-
-            R1.append(hhelix.r[0])
-            R2.append(hhelix.r[1])
-
-            z = -hhelix.modelaxi.h
-            (turns, pitch) = hhelix.modelaxi.compact()
-
-            tZh = []
-            tZh.append(hhelix.z[0])
-            tZh.append(z)
-            for n, p in zip(turns, pitch):
-                z += n * p
-                tZh.append(z)
-            tZh.append(hhelix.z[1])
-            Zh.append(tZh)
-            # print(f"Zh[{i}]: {Zh[-1]}")
-
-        Rint = self.innerbore
-        Rext = self.outerbore
-
-        for i in range(NHelices):
-            Dh.append(2 * (R1[i] - Rint))
-            Sh.append(math.pi * (R1[i] - Rint) * (R1[i] + Rint))
-
-            Rint = R2[i]
-
-        Zr = []
+            hhelix = resolver.load(helix, workingDir)
+            Nsections[i] = len(hhelix.modelaxi.turns)
+            R[i] = hhelix.r
+
+            # z bounds and z at the boundaries of the compacted sections
+            z = hhelix.modelaxi.get_z()
+            starts = hhelix.modelaxi.get_runs()
+            Zh.append(np.concatenate(([hhelix.z[0]], z[starts], z[-1:], [hhelix.z[1]])))
+        (R1, R2) = (R[:, 0], R[:, 1])
+
+        # channels lie between innerbore, the helices and outerbore
+        Rint = np.concatenate(([self.innerbore], R2))
+        Rext = np.concatenate((R1, [self.outerbore]))
+        Dh = 2 * (Rext - Rint)
+        Sh = math.pi * (Rext - Rint) * (Rext + Rint)
+
+        # rings: below helix i for odd i, above it otherwise
+        dz = np.empty(NRings)
         for i, ring in enumerate(self.Rings):
-            hring = None
-            with open(f"{workingDir}/{ring}.yaml", "r") as f:
-                hring = yaml.load(f, Loader=yaml.FullLoader)
-
-            dz = abs(hring.z[1] - hring.z[0])
-            if i % 2 == 1:
-                # print(f"Ring[{i}]: minus dz_ring={dz} to Zh[i][0]")
-                Zr.append(Zh[i][0] - dz)
-
-            if i % 2 == 0:
-                # print(f"Ring[{i}]: add dz={dz} to Zh[i][-1]")
-                Zr.append(Zh[i][-1] + dz)
-        # print(f"Zr: {Zr}")
-
-        # get Z per Channel for Tw(z) estimate
+            hring = resolver.load(ring, workingDir)
+            dz[i] = abs(hring.z[1] - hring.z[0])
+        first = np.array([z[0] for z in Zh[:NRings]])
+        last = np.array([z[-1] for z in Zh[:NRings]])
+        Zr = np.where(np.arange(NRings) % 2 == 1, first - dz, last + dz)
+
+        # channel i: z of helices i-1 and i, of rings i-2 to i
+        # last channel: z of the last helix and of the last ring
         Zc = []
-        Zi = []
-        for i in range(NChannels - 1):
-            nZh = Zh[i] + Zi
-            # print(f"C{i}:")
-            if i >= 0 and i < NChannels - 2:
-                # print(f"\tR{i}")
-                nZh.append(Zr[i])
-            if i >= 1 and i <= NChannels - 2:
-                # print(f"\tR{i-1}")
-                nZh.append(Zr[i - 1])
-            if i >= 2 and i <= NChannels - 2:
-                # print(f"\tR{i-2}")
-                nZh.append(Zr[i - 2])
-
-            nZh.sort()
-            Zc.append(filter(nZh))
-            # remove duplicates (requires to have a compare method with a tolerance: |z[i] - z[j]| <= tol means z[i] == z[j])
-            Zi = Zh[i]
-
-            # print(f"Zh[{i}]={Zh[i]}")
-            # print(f"Zc[{i}]={Zc[-1]}")
-
-        # Add latest Channel: Zh[-1] + R[-1]
-        nZh = Zh[-1] + [Zr[-1]]
-        nZh.sort()
-        Zc.append(filter(nZh))
-        nZh = []
-
-        Zmin = 0
-        Zmax = 0
-        for i, _z in enumerate(Zc):
-            Zmin = min(Zmin, min(_z))
-            Zmax = max(Zmax, max(_z))
-            # print(f"Zc[Channel{i}]={_z}")
-        # print(f"Zmin={Zmin}")
-        # print(f"Zmax={Zmax}")
-
-        Dh.append(2 * (Rext - Rint))
-        Sh.append(math.pi * (Rext - Rint) * (Rext + Rint))
-        return (NHelices, NRings, NChannels, Nsections, R1, R2, Dh, Sh, Zc)
+        for i in range(NChannels):
+            if i < NChannels - 1:
+                nZh = Zh[max(i - 1, 0) : i + 1] + [Zr[max(i - 2, 0) : i + 1]]
+            else:
+                nZh = Zh[-1:] + [Zr[-1:]]
+            Zc.append(unique(np.sort(np.concatenate(nZh))).values)
+
+        return InsertParams(NHelices, NRings, NChannels, Nsections, R1, R2, Dh, Sh, Zc)
 
 
 def Insert_constructor(loader, node):
@@ -1050,4 +1195,5 @@ def Insert_constructor(loader, node):
     )
 
 
-yaml.add_constructor("!Insert", Insert_constructor)
+yaml_utils.add_constructor("!Insert", Insert_constructor)
+yaml_utils.register(Insert)
@@ -5,12 +5,69 @@
 Provides definition for Site:
 
 """
-from typing import Union, Optional
+from typing import Union, Optional, NamedTuple
 
 import os
 
 import json
 import yaml
+from . import yaml_utils
+
+from . import resolver
+from . import markers
+
+
+class SiteParams(NamedTuple):
+    """
+    hydraulic parameters of all the cooling channels of a site,
+    one row per channel (see MSite.get_params)
+
+    magnet: name of the magnet the channel belongs to
+    channel: channel id ({magnet}_Channel{i} for inserts, {magnet}_Slit{i} for Bitters)
+    Dh, Sh: hydraulic diameter and section
+    Zc: z grid
+    filling_factor: wetted perimeter ratio (1 for annular channels)
+    """
+
+    magnet: list[str]
+    channel: list[str]
+    Dh: "numpy.ndarray"
+    Sh: "numpy.ndarray"
+    Zc: "list[numpy.ndarray]"
+    filling_factor: "numpy.ndarray"
+
+
+def _get_channel_params(mname: str, Object, workingDir: str) -> tuple:
+    """
+    return channel ids, Dh, Sh, Zc and filling factor of an Insert or a Bitter
+    """
+    import numpy as np
+
+    params = Object.get_params(workingDir)
+    if hasattr(params, "Zc"):
+        # Insert
+        n = params.NChannels
+        channels = [f"{mname}_Channel{i}" for i in range(n)]
+        return (channels, params.Dh, params.Sh, params.Zc, np.ones(n))
+
+    (nslits, Dh, Sh, Zh, filling_factor) = params
+    channels = [f"{mname}_Slit{i}" for i in range(nslits + 2)]
+    Zh = np.asarray(Zh, dtype=np.float64)
+    return (channels, Dh, Sh, [Zh.copy() for _ in channels], filling_factor)
+
+
+def _get_box(name: str) -> tuple:
+    """
+    return the bounding box (r, z) of the magnet defined in name
+
+    only r and z are read for magnets defining them (Bitter, Supra),
+    other magnets (Insert, Bitters, Supras) compute their bounding box
+    """
+    try:
+        data = resolver.load_fields(name, ["r", "z"])
+    except RuntimeError:
+        return resolver.load(name).boundingBox()
+    return (data["r"], data["z"])
 
 
 class MSite(yaml.YAMLObject):
@@ -47,39 +104,48 @@ class MSite(yaml.YAMLObject):
         """
         return f"name: {self.name}, magnets:{self.magnets}, screens: {self.screens}, z_offset={self.z_offset}, r_offset={self.r_offset}, paralax_offset={self.paralax}"
 
+    __getstate__ = markers.get_state
+
+    def get_fingerprint(self) -> tuple | None:
+        """
+        return the magnets and the stamps of all the files they reference
+        (see markers), None if a magnet is not defined by a file
+        """
+        stamps = markers.tree_stamps(self)
+        if stamps is None:
+            return None
+        return (markers.copy_names(self.magnets), stamps)
+
     def get_channels(
         self, mname: str, hideIsolant: bool = True, debug: bool = False
     ) -> dict:
         """
         get Channels def as dict
+
+        channels of the magnets are memoized (see markers): stamping every
+        file of the site would cost as much as gathering them
         """
         print(f"MSite/get_channels:")
 
         Channels = {}
         if isinstance(self.magnets, str):
-            YAMLFile = f"{self.magnets}.yaml"
-            with open(YAMLFile, "r") as f:
-                Object = yaml.load(f, Loader=yaml.FullLoader)
+            Object = resolver.load(self.magnets)
 
             Channels[self.magnets] = Object.get_channels(self.name, hideIsolant, debug)
         elif isinstance(self.magnets, dict):
             for key in self.magnets:
                 magnet = self.magnets[key]
                 if isinstance(magnet, str):
-                    YAMLFile = f"{magnet}.yaml"
-                    with open(YAMLFile, "r") as f:
-                        Object = yaml.load(f, Loader=yaml.FullLoader)
-                        print(f"{magnet}: {Object}")
+                    Object = resolver.load(magnet)
+                    print(f"{magnet}: {Object}")
 
                     Channels[key] = Object.get_channels(key, hideIsolant, debug)
 
                 elif isinstance(magnet, list):
                     for part in magnet:
                         if isinstance(part, str):
-                            YAMLFile = f"{part}.yaml"
-                            with open(YAMLFile, "r") as f:
-                                Object = yaml.load(f, Loader=yaml.FullLoader)
-                                print(f"{part}: {Object}")
+                            Object = resolver.load(part)
+                            print(f"{part}: {Object}")
                         else:
                             raise RuntimeError(
                                 f"MSite(magnets[{key}][{part}]): unsupported type of magnets ({type(part)})"
@@ -115,36 +181,80 @@ class MSite(yaml.YAMLObject):
         self, mname: str, is2D: bool = False, verbose: bool = False
     ) -> list[str]:
         """
-        return names for Markers
+        return names for Markers (memoized, see markers)
         """
+        if verbose:
+            return self._get_names(mname, is2D, verbose)
+        return markers.memoize_names(
+            self,
+            ("names", mname, is2D),
+            self.get_fingerprint(),
+            lambda: self._get_names(mname, is2D),
+        )
+
+    def get_marker_index(self, mname: str, is2D: bool = False):
+        """
+        return a read-only dict mapping marker names to Marker (see markers)
+
+        magnets are named as in get_names (mname is not used either);
+        magnets without markers index (eg. Supras) are skipped
+        """
+
+        def compute() -> dict:
+            parts = []
+            if isinstance(self.magnets, str):
+                parts.append((self.name, self.magnets))
+            elif isinstance(self.magnets, dict):
+                for key in self.magnets:
+                    magnet = self.magnets[key]
+                    if isinstance(magnet, str):
+                        parts.append((key, magnet))
+                    elif isinstance(magnet, list):
+                        for part in magnet:
+                            parts.append((f"{key}_{resolver.load(part).name}", part))
+                    else:
+                        raise RuntimeError(
+                            f"MSite/get_marker_index (magnets[{key}]): unsupported type of magnets ({type(magnet)})"
+                        )
+            else:
+                raise RuntimeError(
+                    f"MSite/get_marker_index: unsupported type of magnets ({type(self.magnets)})"
+                )
+
+            index = {}
+            for name, magnet in parts:
+                Object = resolver.load(magnet)
+                if hasattr(Object, "get_marker_index"):
+                    index.update(Object.get_marker_index(name, is2D))
+            return index
+
+        return markers.memoize_index(
+            self, ("markers", mname, is2D), self.get_fingerprint(), compute
+        )
+
+    def _get_names(
+        self, mname: str, is2D: bool = False, verbose: bool = False
+    ) -> list[str]:
         solid_names = []
 
         if isinstance(self.magnets, str):
-            YAMLFile = f"{self.magnets}.yaml"
-            with open(YAMLFile, "r") as f:
-                Object = yaml.load(f, Loader=yaml.FullLoader)
+            Object = resolver.load(self.magnets)
 
             solid_names += Object.get_names(self.name, is2D, verbose)
         elif isinstance(self.magnets, dict):
             for key in self.magnets:
                 magnet = self.magnets[key]
                 if isinstance(magnet, str):
-                    mObject = None
-                    YAMLFile = f"{magnet}.yaml"
-                    with open(YAMLFile, "r") as f:
-                        mObject = yaml.load(f, Loader=yaml.FullLoader)
-                        # print(f"{magnet}: {mObject}")
+                    mObject = resolver.load(magnet)
+                    # print(f"{magnet}: {mObject}")
 
                     solid_names += mObject.get_names(key, is2D, verbose)
 
                 elif isinstance(magnet, list):
                     for part in magnet:
                         if isinstance(part, str):
-                            mObject = None
-                            YAMLFile = f"{part}.yaml"
-                            with open(YAMLFile, "r") as f:
-                                mObject = yaml.load(f, Loader=yaml.FullLoader)
-                                # print(f"{part}: {mObject}")
+                            mObject = resolver.load(part)
+                            # print(f"{part}: {mObject}")
 
                             solid_names += mObject.get_names(
                                 f"{key}_{mObject.name}", is2D, verbose
@@ -169,13 +279,97 @@ class MSite(yaml.YAMLObject):
             print(f"MSite/get_names: solid_names {len(solid_names)}")
         return solid_names
 
+    def get_magnets(self, workingDir: str = ".") -> list[tuple]:
+        """
+        return (name, object) for every Insert and Bitter of the site
+
+        names follow get_names: key for a single magnet, {key}_{name} for parts,
+        name for a list of magnets; Bitters are replaced by their Bitter magnets
+        """
+        from .Bitters import Bitters
+
+        magnets = []
+
+        def add(mname: str, magnet, key: Optional[str] = None):
+            Object = resolver.load(magnet, workingDir)
+            if key is not None:
+                mname = f"{key}_{Object.name}"
+            if isinstance(Object, Bitters):
+                parts = Object.magnets
+                if isinstance(parts, str):
+                    parts = [parts]
+                elif isinstance(parts, dict):
+                    parts = list(parts.values())
+                for part in parts:
+                    add(str(part), part)
+            elif hasattr(Object, "get_params"):
+                magnets.append((mname, Object))
+
+        if isinstance(self.magnets, str):
+            add(self.name, self.magnets)
+        elif isinstance(self.magnets, list):
+            for magnet in self.magnets:
+                add(str(magnet), magnet)
+        elif isinstance(self.magnets, dict):
+            for key in self.magnets:
+                magnet = self.magnets[key]
+                if isinstance(magnet, str):
+                    add(key, magnet)
+                elif isinstance(magnet, list):
+                    for part in magnet:
+                        add(key, part, key)
+                else:
+                    raise RuntimeError(
+                        f"MSite/get_magnets (magnets[{key}]): unsupported type of magnets ({type(magnet)})"
+                    )
+        else:
+            raise RuntimeError(
+                f"MSite/get_magnets: unsupported type of magnets ({type(self.magnets)})"
+            )
+        return magnets
+
+    def get_params(self, workingDir: str = ".", workers: int | None = None) -> SiteParams:
+        """
+        return the hydraulic parameters of all the cooling channels of the site
+
+        referenced files are parsed first (see resolver.load_tree), then the
+        parameters of the magnets are computed concurrently by workers threads
+        """
+        import numpy as np
+        from concurrent.futures import ThreadPoolExecutor
+
+        site = resolver.load_tree(self, workers=workers, workingDir=workingDir)
+        magnets = site.get_magnets(workingDir)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            results = list(
+                executor.map(
+                    lambda item: _get_channel_params(item[0], item[1], workingDir),
+                    magnets,
+                )
+            )
+
+        magnet = []
+        channel = []
+        Zc = []
+        for (mname, Object), (channels, Dh, Sh, Z, filling_factor) in zip(magnets, results):
+            magnet += [mname] * len(channels)
+            channel += channels
+            Zc += Z
+
+        def column(i: int):
+            return np.concatenate(
+                [np.asarray(result[i], dtype=np.float64) for result in results] + [[]]
+            )
+
+        return SiteParams(magnet, channel, column(1), column(2), Zc, column(4))
+
     def dump(self):
         """
         dump object to file
         """
         try:
             with open(f"{self.name}.yaml", "w") as ostream:
-                yaml.dump(self, stream=ostream)
+                yaml_utils.dump(self, stream=ostream)
         except:
             raise Exception("Failed to dump MSite data")
 
@@ -186,7 +380,7 @@ class MSite(yaml.YAMLObject):
         data = None
         try:
             with open(f"{self.name}.yaml", "r") as istream:
-                data = yaml.load(stream=istream, Loader=yaml.FullLoader)
+                data = yaml_utils.load(istream)
         except:
             raise Exception("Failed to load MSite data %s.yaml" % self.name)
 
@@ -224,11 +418,33 @@ class MSite(yaml.YAMLObject):
 
         if debug:
             print(f'MSite.from_json: filename={filename}')
-        with open(filename, "r") as istream:
-            return json.loads(istream.read(), object_hook=deserialize.unserialize_object)
+        return deserialize.load_json(filename)
+
+    def write_to_snapshot(self, workingDir: str = ".", workers: int | None = None):
+        """
+        write to a binary snapshot, with all referenced objects inlined
+        """
+        from . import snapshot
+
+        snapshot.dump(self, f"{self.name}.snapshot", workingDir, workers)
+
+    @classmethod
+    def from_snapshot(cls, filename: str, debug: bool = False):
+        """
+        load from a binary snapshot
+        """
+        from . import snapshot
+
+        if debug:
+            print(f'MSite.from_snapshot: filename={filename}')
+        return snapshot.load(filename)
 
     def boundingBox(self) -> tuple:
-        """"""
+        """
+        return Bounding as r[], z[]
+
+        only r and z are read for Bitter and Supra magnets (see _get_box)
+        """
         zmin = None
         zmax = None
         rmin = None
@@ -248,40 +464,26 @@ class MSite(yaml.YAMLObject):
             return (rmin, rmax, zmin, zmax)
 
         if isinstance(self.magnets, str):
-            YAMLFile = os.path.join(f"{self.magnets}.yaml")
-            with open(YAMLFile, "r") as istream:
-                Object = yaml.load(istream, Loader=yaml.FullLoader)
-                (r, z) = Object.boundingBox()
-                (rmin, rmax, zmin, zmax) = cboundingBox(rmin, rmax, zmin, zmax, r, z)
+            (r, z) = _get_box(self.magnets)
+            (rmin, rmax, zmin, zmax) = cboundingBox(rmin, rmax, zmin, zmax, r, z)
 
         elif isinstance(self.magnets, list):
             for mname in self.magnets:
-                YAMLFile = os.path.join(f"{mname}.yaml")
-                with open(YAMLFile, "r") as istream:
-                    Object = yaml.load(istream, Loader=yaml.FullLoader)
-                    (r, z) = Object.boundingBox()
-                    (rmin, rmax, zmin, zmax) = cboundingBox(
-                        rmin, rmax, zmin, zmax, r, z
-                    )
+                (r, z) = _get_box(mname)
+                (rmin, rmax, zmin, zmax) = cboundingBox(rmin, rmax, zmin, zmax, r, z)
         elif isinstance(self.magnets, dict):
             for key in self.magnets:
                 if isinstance(self.magnets[key], str):
-                    YAMLFile = os.path.join(f"{self.magnets[key]}.yaml")
-                    with open(YAMLFile, "r") as istream:
-                        Object = yaml.load(istream, Loader=yaml.FullLoader)
-                        (r, z) = Object.boundingBox()
+                    (r, z) = _get_box(self.magnets[key])
+                    (rmin, rmax, zmin, zmax) = cboundingBox(
+                        rmin, rmax, zmin, zmax, r, z
+                    )
+                elif isinstance(self.magnets[key], list):
+                    for mname in self.magnets[key]:
+                        (r, z) = _get_box(mname)
                         (rmin, rmax, zmin, zmax) = cboundingBox(
                             rmin, rmax, zmin, zmax, r, z
                         )
-                elif isinstance(self.magnets[key], list):
-                    for mname in self.magnets[key]:
-                        YAMLFile = os.path.join(f"{mname}.yaml")
-                        with open(YAMLFile, "r") as istream:
-                            Object = yaml.load(istream, Loader=yaml.FullLoader)
-                            (r, z) = Object.boundingBox()
-                            (rmin, rmax, zmin, zmax) = cboundingBox(
-                                rmin, rmax, zmin, zmax, r, z
-                            )
                 else:
                     raise Exception(
                         f"magnets: unsupported type {type(self.magnets[key])}"
@@ -307,4 +509,5 @@ def MSite_constructor(loader, node):
     return MSite(name, magnets, screens, z_offset, r_offset, paralax)
 
 
-yaml.add_constructor("!MSite", MSite_constructor)
+yaml_utils.add_constructor("!MSite", MSite_constructor)
+yaml_utils.register(MSite)
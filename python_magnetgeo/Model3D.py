@@ -12,6 +12,7 @@ Provides definiton for Helix:
 
 import json
 import yaml
+from . import yaml_utils
 
 # from Shape import *
 # from ModelAxi import *
@@ -78,8 +79,7 @@ class Model3D(yaml.YAMLObject):
 
         if debug:
             print(f'Model3D.from_json: filename={filename}')
-        with open(filename, "r") as istream:
-            return json.loads(istream.read(), object_hook=deserialize.unserialize_object)
+        return deserialize.load_json(filename)
 
 def Model3D_constructor(loader, node):
     """
@@ -92,4 +92,5 @@ def Model3D_constructor(loader, node):
     return Model3D(cad, with_shapes, with_channels)
 
 
-yaml.add_constructor("!Model3D", Model3D_constructor)
+yaml_utils.add_constructor("!Model3D", Model3D_constructor)
+yaml_utils.register(Model3D)
@@ -12,6 +12,7 @@ Provides definiton for Helix:
 
 import json
 import yaml
+from . import yaml_utils
 
 
 class ModelAxi(yaml.YAMLObject):
@@ -39,6 +40,12 @@ class ModelAxi(yaml.YAMLObject):
         self.turns = turns
         self.pitch = pitch
 
+    def __setattr__(self, name: str, value) -> None:
+        # drop the cached profile when the definition of the cut changes
+        if name in ("h", "turns", "pitch"):
+            self.__dict__.pop("_profile", None)
+        super().__setattr__(name, value)
+
     def __repr__(self):
         """
         representation of object
@@ -78,63 +85,169 @@ class ModelAxi(yaml.YAMLObject):
 
         if debug:
             print(f'ModelAxi.from_json: filename={filename}')
-        with open(filename, "r") as istream:
-            return json.loads(istream.read(), object_hook=deserialize.unserialize_object)
+        return deserialize.load_json(filename)
     
 
+    @classmethod
+    def from_arrays(cls, name: str, h: float, turns, pitch):
+        """
+        create an array-backed ModelAxi: turns and pitch are stored as float64 arrays
+        """
+        import numpy as np
+
+        turns = np.array(turns, dtype=np.float64)
+        pitch = np.array(pitch, dtype=np.float64)
+        if turns.shape != pitch.shape or turns.ndim != 1:
+            raise RuntimeError(
+                f"ModelAxi.from_arrays: turns and pitch must have the same length (got {turns.shape} and {pitch.shape})"
+            )
+        return cls(name, h, turns, pitch)
+
+    def is_array(self) -> bool:
+        """
+        returns True if turns and pitch are stored as arrays
+        """
+        return hasattr(self.turns, "tolist")
+
+    def __getstate__(self) -> dict:
+        """
+        state used to dump the object: arrays are kept as is (see to_yaml)
+        """
+        return {key: value for key, value in self.__dict__.items() if not key.startswith("_")}
+
+    @classmethod
+    def to_yaml(cls, dumper, data):
+        """
+        dump the object, arrays are dumped as lists
+        """
+        state = data.__getstate__()
+        for key in ["turns", "pitch"]:
+            if hasattr(state.get(key), "tolist"):
+                state[key] = state[key].tolist()
+        return dumper.represent_mapping(cls.yaml_tag, state, flow_style=cls.yaml_flow_style)
+
     def get_Nturns(self) -> float:
         """
         returns the number of turn
         """
+        if self.is_array():
+            return float(self.turns.sum())
         return sum(self.turns)
 
     def compact(self, tol: float = 1.0e-6):
-        def indices(lst: list, item: float):
-            return [i for i, x in enumerate(lst) if abs(1 - item / x) <= tol]
-
-        List = self.pitch
-        duplicates = dict((x, indices(List, x)) for x in set(List) if List.count(x) > 1)
-        # print(f"duplicates: {duplicates}")
-
-        sum_index = {}
-        for key in duplicates:
-            index_fst = duplicates[key][0]
-            sum_index[index_fst] = [index_fst]
-            search_index = sum_index[index_fst]
-            search_elem = search_index[-1]
-            for index in duplicates[key]:
-                # print(f"index={index}, search_elem={search_elem}")
-                if index - search_elem == 1:
-                    search_index.append(index)
-                    search_elem = index
-                else:
-                    sum_index[index] = [index]
-                    search_index = sum_index[index]
-                    search_elem = search_index[-1]
-
-        # print(f"sum_index: {sum_index}")
-
-        remove_ids = []
-        for i in sum_index:
-            for item in sum_index[i]:
-                if item != i:
-                    remove_ids.append(item)
-
-        new_pitch = [p for i, p in enumerate(self.pitch) if not i in remove_ids]
-        # print(f"pitch={self.pitch}")
-        # print(f"new_pitch={new_pitch}")
-
-        new_turns = (
-            self.turns
-        )  # use deepcopy: import copy and copy.deepcopy(self.axi.turns)
-        for i in sum_index:
-            for item in sum_index[i]:
-                new_turns[i] += self.turns[item]
-        new_turns = [p for i, p in enumerate(self.turns) if not i in remove_ids]
-        # print(f"turns={self.turns}")
-        # print(f"new_turns={new_turns}")
-
-        return new_turns, new_pitch
+        """
+        merge consecutive sections which pitch are equal within tol (relative)
+        and sum their turns
+
+        returns new turns and pitch (arrays for an array-backed ModelAxi, lists otherwise),
+        the pitch of a merged section is the pitch of its first section
+        """
+        import numpy as np
+
+        turns = np.asarray(self.turns, dtype=np.float64)
+        pitch = np.asarray(self.pitch, dtype=np.float64)
+        starts = self.get_runs(tol)
+        if starts.size == 0:
+            new_turns, new_pitch = turns.copy(), pitch.copy()
+        else:
+            new_turns = np.add.reduceat(turns, starts)
+            new_pitch = pitch[starts]
+
+        if self.is_array():
+            return new_turns, new_pitch
+        return new_turns.tolist(), new_pitch.tolist()
+
+    def get_runs(self, tol: float = 1.0e-6):
+        """
+        returns the index of the first section of each run of sections
+        which pitch are equal within tol (relative)
+        """
+        import numpy as np
+
+        pitch = np.asarray(self.pitch, dtype=np.float64)
+        if pitch.size == 0:
+            return np.zeros(0, dtype=np.intp)
+        # a new run starts where the pitch differs from the previous one
+        starts = np.flatnonzero(np.abs(1 - pitch[1:] / pitch[:-1]) > tol) + 1
+        return np.concatenate(([0], starts))
+
+    def invalidate(self) -> None:
+        """
+        drop the cached profile
+
+        only needed when turns or pitch are modified in place
+        """
+        self.__dict__.pop("_profile", None)
+
+    def get_profile(self):
+        """
+        returns the cumulative z and theta at the boundaries of the sections
+
+        z starts from -h, theta (in rad, always positive) from 0:
+        z[i+1] = z[i] + turns[i] * pitch[i] and theta[i+1] = theta[i] + turns[i] * 2 * pi,
+        accumulated in the same order as a python loop would do.
+        The arrays are cached until h, turns or pitch are set.
+        """
+        import numpy as np
+
+        profile = self.__dict__.get("_profile")
+        if profile is None:
+            turns = np.asarray(self.turns, dtype=np.float64)
+            pitch = np.asarray(self.pitch, dtype=np.float64)
+            z = np.cumsum(np.concatenate(([-self.h], turns * pitch)))
+            theta = np.cumsum(np.concatenate(([0.0], turns * (2 * np.pi))))
+            z.flags.writeable = False
+            theta.flags.writeable = False
+            profile = self.__dict__["_profile"] = (z, theta)
+        return profile
+
+    def get_z(self):
+        """
+        returns the cumulative z at the boundaries of the sections (see get_profile)
+        """
+        return self.get_profile()[0]
+
+    def get_theta(self):
+        """
+        returns the cumulative theta at the boundaries of the sections (see get_profile)
+        """
+        return self.get_profile()[1]
+
+    def section_index(self, z):
+        """
+        returns the index of the section containing z (-1 if z is out of the cut)
+
+        z may be a scalar or an array
+        """
+        import numpy as np
+
+        zs = self.get_z()
+        # the top of the cut belongs to the last section
+        index = np.searchsorted(zs[:-1], z, side="right") - 1
+        index = np.where(np.asarray(z) > zs[-1], -1, index)
+        return index if index.ndim else int(index)
+
+    def theta_at(self, z):
+        """
+        returns the angle of the cut at z (linear in each section)
+
+        z may be a scalar or an array, z out of the cut is clamped
+        """
+        import numpy as np
+
+        (zs, theta) = self.get_profile()
+        return np.interp(z, zs, theta)
+
+    def z_at(self, theta):
+        """
+        returns the z of the cut at theta (linear in each section)
+
+        theta may be a scalar or an array, theta out of the cut is clamped
+        """
+        import numpy as np
+
+        (zs, thetas) = self.get_profile()
+        return np.interp(theta, thetas, zs)
 
 
 def ModelAxi_constructor(loader, node):
@@ -149,4 +262,5 @@ def ModelAxi_constructor(loader, node):
     return ModelAxi(name, h, turns, pitch)
 
 
-yaml.add_constructor("!ModelAxi", ModelAxi_constructor)
+yaml_utils.add_constructor("!ModelAxi", ModelAxi_constructor)
+yaml_utils.register(ModelAxi)
@@ -8,6 +8,7 @@ Provides Inner and OuterCurrentLead class
 import os
 import json
 import yaml
+from . import yaml_utils
 
 
 class OuterCurrentLead(yaml.YAMLObject):
@@ -57,7 +58,7 @@ class OuterCurrentLead(yaml.YAMLObject):
         dump object to file
         """
         try:
-            yaml.dump(self, open(f"{self.name}.yaml", "w"))
+            yaml_utils.dump(self, open(f"{self.name}.yaml", "w"))
         except:
             raise Exception("Failed to dump OuterCurrentLead data")
 
@@ -68,7 +69,7 @@ class OuterCurrentLead(yaml.YAMLObject):
         data = None
         try:
             with open(f"{self.name}.yaml", "r") as istream:
-                data = yaml.load(stream=istream, Loader=yaml.FullLoader)
+                data = yaml_utils.load(istream)
         except:
             raise Exception(f"Failed to load OuterCurrentLead data {self.name}.yaml")
 
@@ -108,8 +109,7 @@ class OuterCurrentLead(yaml.YAMLObject):
 
         if debug:
             print(f'OuterCurrentLead.from_json: filename={filename}')
-        with open(filename, "r") as istream:
-            return json.loads(istream.read(), object_hook=deserialize.unserialize_object)
+        return deserialize.load_json(filename)
     
 
 def OuterCurrentLead_constructor(loader, node):
@@ -125,6 +125,5 @@ def OuterCurrentLead_constructor(loader, node):
     return OuterCurrentLead(name, r, h, bar, support)
 
 
-yaml.add_constructor("!OuterCurrentLead", OuterCurrentLead_constructor)
-
-
+yaml_utils.add_constructor("!OuterCurrentLead", OuterCurrentLead_constructor)
+yaml_utils.register(OuterCurrentLead)
@@ -8,7 +8,7 @@ Provides definition for Ring:
 
 import json
 import yaml
-from . import deserialize
+from . import yaml_utils
 
 
 class Ring(yaml.YAMLObject):
@@ -68,7 +68,7 @@ class Ring(yaml.YAMLObject):
         """
         try:
             with open(f"{self.name}.yaml", "w") as ostream:
-                yaml.dump(self, stream=ostream)
+                yaml_utils.dump(self, stream=ostream)
         except:
             raise Exception("Failed to dump Ring data")
 
@@ -79,7 +79,7 @@ class Ring(yaml.YAMLObject):
         data = None
         try:
             with open(f"{self.name}.yaml", "r") as istream:
-                data = yaml.load(stream=istream, Loader=yaml.FullLoader)
+                data = yaml_utils.load(istream)
         except:
             raise Exception(f"Failed to load Ring data {self.name}.yaml")
 
@@ -118,8 +118,7 @@ class Ring(yaml.YAMLObject):
 
         if debug:
             print(f'Ring.from_json: filename={filename}')
-        with open(filename, "r") as istream:
-            return json.loads(istream.read(), object_hook=deserialize.unserialize_object)
+        return deserialize.load_json(filename)
     
 
 def Ring_constructor(loader, node):
@@ -137,4 +136,5 @@ def Ring_constructor(loader, node):
     return Ring(name, r, z, n, angle, BPside, fillets)
 
 
-yaml.add_constructor("!Ring", Ring_constructor)
+yaml_utils.add_constructor("!Ring", Ring_constructor)
+yaml_utils.register(Ring)
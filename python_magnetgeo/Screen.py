@@ -9,6 +9,7 @@ Provides definition for Screen:
 
 import json
 import yaml
+from . import yaml_utils
 
 
 class Screen(yaml.YAMLObject):
@@ -76,7 +77,7 @@ class Screen(yaml.YAMLObject):
         """
         try:
             ostream = open(self.name + ".yaml", "w")
-            yaml.dump(self, stream=ostream)
+            yaml_utils.dump(self, stream=ostream)
             ostream.close()
         except:
             raise Exception("Failed to Screen dump")
@@ -88,7 +89,7 @@ class Screen(yaml.YAMLObject):
         data = None
         try:
             with open(f"{self.name}.yaml", "r") as istream:
-                data = yaml.load(stream=istream, Loader=yaml.FullLoader)
+                data = yaml_utils.load(istream)
         except:
             raise Exception(f"Failed to load Screen data {self.name}.yaml")
 
@@ -124,8 +125,7 @@ class Screen(yaml.YAMLObject):
 
         if debug:
             print(f'Screen.from_json: filename={filename}')
-        with open(filename, "r") as istream:
-            return json.loads(istream.read(), object_hook=deserialize.unserialize_object)
+        return deserialize.load_json(filename)
 
     def boundingBox(self) -> tuple:
         """
@@ -161,4 +161,5 @@ def Screen_constructor(loader, node):
     return Screen(name, r, z)
 
 
-yaml.add_constructor("!Screen", Screen_constructor)
+yaml_utils.add_constructor("!Screen", Screen_constructor)
+yaml_utils.register(Screen)
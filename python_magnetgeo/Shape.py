@@ -12,6 +12,7 @@ Provides definiton for Helix:
 
 import json
 import yaml
+from . import yaml_utils
 
 # from Shape import *
 # from ModelAxi import *
@@ -88,8 +89,7 @@ class Shape(yaml.YAMLObject):
 
         if debug:
             print(f'Shape.from_json: filename={filename}')
-        with open(filename, "r") as istream:
-            return json.loads(istream.read(), object_hook=deserialize.unserialize_object)
+        return deserialize.load_json(filename)
 
 
 def Shape_constructor(loader, node):
@@ -106,4 +106,5 @@ def Shape_constructor(loader, node):
     return Shape(name, profile, length, angle, onturns, position)
 
 
-yaml.add_constructor("!Shape", Shape_constructor)
+yaml_utils.add_constructor("!Shape", Shape_constructor)
+yaml_utils.register(Shape)
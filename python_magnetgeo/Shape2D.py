@@ -8,6 +8,7 @@ Provides definiton for 2D Shape:
 """
 
 import yaml
+from . import yaml_utils
 import json
 
 
@@ -40,7 +41,7 @@ class Shape2D(yaml.YAMLObject):
         """
         try:
             with open(f"{name}.yaml", "w") as ostream:
-                yaml.dump(self, stream=ostream)
+                yaml_utils.dump(self, stream=ostream)
         except:
             raise Exception("Failed to Shape2D dump")
 
@@ -51,7 +52,7 @@ class Shape2D(yaml.YAMLObject):
         data = None
         try:
             with open(f"{name}.yaml", "r") as istream:
-                data = yaml.load(stream=istream, Loader=yaml.FullLoader)
+                data = yaml_utils.load(istream)
         except:
             raise Exception(f"Failed to load Shape2D data {name}.yaml")
 
@@ -77,8 +78,7 @@ class Shape2D(yaml.YAMLObject):
 
         if debug:
             print(f'Shape2D.from_json: filename={filename}')
-        with open(filename, "r") as istream:
-            return json.loads(istream.read(), object_hook=deserialize.unserialize_object)
+        return deserialize.load_json(filename)
     
 
 
@@ -92,7 +92,8 @@ def Shape_constructor(loader, node):
     return Shape2D(name, pts)
 
 
-yaml.add_constructor("!Shape2D", Shape_constructor)
+yaml_utils.add_constructor("!Shape2D", Shape_constructor)
+yaml_utils.register(Shape2D)
 
 
 def create_circle(r: float, n: int = 20) -> Shape2D:
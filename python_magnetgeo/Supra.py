@@ -8,11 +8,11 @@ Provides definition for Supra:
 * Model Axi: definition of helical cut (provided from MagnetTools)
 * Model 3D: actual 3D CAD
 """
-from typing import Optional
+from typing import Optional, Iterator
 
 import json
 import yaml
-from . import deserialize
+from . import yaml_utils
 
 from .SupraStructure import HTSinsert
 
@@ -108,6 +108,34 @@ class Supra(yaml.YAMLObject):
 
             return hts.get_names(mname=mname, detail=self.detail, verbose=verbose)
 
+    def iter_names(
+        self,
+        mname: str,
+        is2D: bool = False,
+        verbose: bool = False,
+        start: Optional[int] = None,
+        stop: Optional[int] = None,
+    ) -> Iterator[str]:
+        """
+        iterate over the names [start:stop] of get_names, without building the list
+        """
+        if self.detail == "None":
+            yield from self.get_names(mname, is2D, verbose)[start:stop]
+        else:
+            hts = self.get_magnet_struct()
+            self.check_dimensions(hts)
+            yield from hts.iter_names(mname, self.detail, verbose, start, stop)
+
+    def count_names(self, is2D: bool = False) -> int:
+        """
+        return the number of names, without generating them
+        """
+        if self.detail == "None":
+            return 1
+        hts = self.get_magnet_struct()
+        self.check_dimensions(hts)
+        return hts.count_names(self.detail)
+
     def __repr__(self):
         """
         representation of object
@@ -128,7 +156,7 @@ class Supra(yaml.YAMLObject):
         """
         try:
             with open(f"{self.name}.yaml", "w") as ostream:
-                yaml.dump(self, stream=ostream)
+                yaml_utils.dump(self, stream=ostream)
         except:
             raise Exception("Failed to Supra dump")
 
@@ -139,7 +167,7 @@ class Supra(yaml.YAMLObject):
         data = None
         try:
             with open(f"{self.name}.yaml", "r") as istream:
-                data = yaml.load(stream=istream, Loader=yaml.FullLoader)
+                data = yaml_utils.load(istream)
         except:
             raise Exception(f"Failed to load Supra data {self.name}.yaml")
 
@@ -183,8 +211,7 @@ class Supra(yaml.YAMLObject):
 
         if debug:
             print(f'Supra.from_json: filename={filename}')
-        with open(filename, "r") as istream:
-            return json.loads(istream.read(), object_hook=deserialize.unserialize_object)
+        return deserialize.load_json(filename)
 
     def get_Nturns(self) -> int:
         """
@@ -253,4 +280,5 @@ def Supra_constructor(loader, node):
     return Supra(name, r, z, n, struct)
 
 
-yaml.add_constructor("!Supra", Supra_constructor)
+yaml_utils.add_constructor("!Supra", Supra_constructor)
+yaml_utils.register(Supra)
@@ -1,13 +1,57 @@
 """
 Define HTS insert geometry
 """
-from typing import Self, Optional
+from typing import Self, Optional, Iterable, Iterator
 
 
-def flatten(S: list) -> list:
-    from pandas.core.common import flatten as pd_flatten
+def iter_flatten(S: Iterable) -> Iterator:
+    """
+    iterate over the items of nested iterables (strings are items)
+    """
+    for item in S:
+        if isinstance(item, Iterable) and not isinstance(item, (str, bytes)):
+            yield from iter_flatten(item)
+        else:
+            yield item
+
+
+def flatten(S: Iterable) -> list:
+    return list(iter_flatten(S))
+
 
-    return list(pd_flatten(S))
+def iter_parts(
+    parts: list[tuple],
+    detail: str,
+    verbose: bool = False,
+    start: Optional[int] = None,
+    stop: Optional[int] = None,
+) -> Iterator[str]:
+    """
+    iterate over the names [start:stop] of parts, given as (object, name)
+
+    parts before start are skipped from their number of names (count_names),
+    without generating them
+    """
+    if start is None and stop is None:
+        for obj, name in parts:
+            yield from obj.iter_names(name, detail, verbose)
+        return
+
+    counts = [obj.count_names(detail) for obj, name in parts]
+    selection = range(sum(counts))[start:stop]
+    base = 0
+    for (obj, name), count in zip(parts, counts):
+        if base >= selection.stop:
+            break
+        if base + count > selection.start:
+            yield from obj.iter_names(
+                name,
+                detail,
+                verbose,
+                max(selection.start - base, 0),
+                min(selection.stop - base, count),
+            )
+        base += count
 
 
 class tape:
@@ -48,10 +92,22 @@ class tape:
         msg += f"e: {self.e} [mm]\n"
         return msg
 
+    def count_names(self, detail: str) -> int:
+        return 2
+
+    def iter_names(
+        self,
+        name: str,
+        detail: str,
+        verbose: bool = False,
+        start: Optional[int] = None,
+        stop: Optional[int] = None,
+    ) -> Iterator[str]:
+        for suffix in ("_SC", "_Duromag")[start:stop]:
+            yield f"{name}{suffix}"
+
     def get_names(self, name: str, detail: str, verbose: bool = False) -> list[str]:
-        _tape = f"{name}_SC"
-        _e = f"{name}_Duromag"
-        return [_tape, _e]
+        return list(self.iter_names(name, detail, verbose))
 
     def getH(self) -> float:
         """
@@ -143,23 +199,55 @@ class pancake:
         msg += f"tape: {self.tape}***\n"
         return msg
 
+    def count_names(self, detail: str) -> int:
+        if detail == "pancake":
+            return 1
+        return 1 + self.n * self.tape.count_names(detail)
+
+    def iter_names(
+        self,
+        name: str,
+        detail: str,
+        verbose: bool = False,
+        start: Optional[int] = None,
+        stop: Optional[int] = None,
+    ) -> Iterator[str]:
+        if detail == "pancake":
+            if range(1)[start:stop]:
+                yield name
+            return
+
+        if verbose:
+            print(f"pancake: mandrin (1), tapes ({self.n})")
+        selection = range(self.count_names(detail))[start:stop]
+        if not selection:
+            return
+        (first, last) = (selection.start, selection.stop)
+        if first == 0:
+            yield f"{name}_Mandrin"
+            first = 1
+
+        # tape i names are [1 + i * ntape, 1 + (i + 1) * ntape),
+        # all tapes share the same suffixes
+        suffixes = list(self.tape.iter_names("", detail))
+        ntape = len(suffixes)
+        (i0, i1) = ((first - 1) // ntape, (last - 1 + ntape - 1) // ntape)
+        for i in range(i0, i1):
+            tname = f"{name}_t{i}"
+            if i == i0 or i == i1 - 1:
+                base = 1 + i * ntape
+                for suffix in suffixes[max(first - base, 0) : last - base]:
+                    yield tname + suffix
+            else:
+                for suffix in suffixes:
+                    yield tname + suffix
+
     def get_names(
         self, name: str, detail: str, verbose: bool = False
     ) -> str | list[str]:
         if detail == "pancake":
             return name
-        else:
-            _mandrin = f"{name}_Mandrin"
-            tape_ = self.tape
-            tape_ids = []
-            for i in range(self.n):
-                tape_id = tape_.get_names(f"{name}_t{i}", detail)
-                tape_ids.append(tape_id)
-
-            if verbose:
-                print(f"pancake: mandrin (1), tapes ({len(tape_ids)})")
-            return flatten([[_mandrin], flatten(tape_ids)])
-        pass
+        return list(self.iter_names(name, detail, verbose))
 
     def getN(self) -> int:
         """
@@ -263,6 +351,20 @@ class isolation:
         return msg
         pass
 
+    def count_names(self, detail: str) -> int:
+        return 1
+
+    def iter_names(
+        self,
+        name: str,
+        detail: str,
+        verbose: bool = False,
+        start: Optional[int] = None,
+        stop: Optional[int] = None,
+    ) -> Iterator[str]:
+        if range(1)[start:stop]:
+            yield name
+
     def get_names(self, name: str, detail: str, verbose: bool = False) -> str:
         return name
 
@@ -336,34 +438,38 @@ class dblpancake:
         msg += f"(z0={self.getZ0()}, h={self.getH()})"
         return msg
 
+    def count_names(self, detail: str) -> int:
+        if detail == "dblpancake":
+            return 1
+        return 2 * self.pancake.count_names(detail) + self.isolation.count_names(detail)
+
+    def iter_names(
+        self,
+        name: str,
+        detail: str,
+        verbose: bool = False,
+        start: Optional[int] = None,
+        stop: Optional[int] = None,
+    ) -> Iterator[str]:
+        if detail == "dblpancake":
+            if range(1)[start:stop]:
+                yield name
+            return
+
+        p_ = self.pancake
+        dp_i = self.isolation
+        if verbose:
+            print(f"dblepancake.salome: isolation={dp_i}")
+            print("dblpancake: pancakes (2), isolations (1)")
+        parts = [(p_, f"{name}_p0"), (p_, f"{name}_p1"), (dp_i, f"{name}_i")]
+        yield from iter_parts(parts, detail, False, start, stop)
+
     def get_names(
         self, name: str, detail: str, verbose: bool = False
     ) -> str | list[str]:
         if detail == "dblpancake":
             return name
-        else:
-            p_ids = []
-
-            p_ = self.pancake
-            _id = p_.get_names(f"{name}_p0", detail)
-            p_ids.append(_id)
-
-            dp_i = self.isolation
-            if verbose:
-                print(f"dblepancake.salome: isolation={dp_i}")
-            _isolation_id = dp_i.get_names(f"{name}_i", detail)
-
-            _id = p_.get_names(f"{name}_p1", detail)
-            p_ids.append(_id)
-
-            if verbose:
-                print(
-                    f"dblpancake: pancakes ({len(p_ids)}, {type(p_ids[0])}), isolations (1)"
-                )
-            if isinstance(p_ids[0], list):
-                return flatten([flatten(p_ids), [_isolation_id]])
-            else:
-                return flatten([p_ids, [_isolation_id]])
+        return list(self.iter_names(name, detail, verbose))
 
     def getPancake(self):
         """
@@ -612,34 +718,48 @@ class HTSinsert:
             )
         )
 
-    def get_names(self, mname: str, detail: str, verbose: bool = False) -> list[str]:
-        dp_ids = []
-        i_ids = []
-
+    def get_parts(self, mname: str) -> list[tuple]:
+        """
+        return (object, name) for the double pancakes, then the isolations
+        """
         prefix = ""
         if mname:
             prefix = f"{mname}_"
 
-        n_dp = len(self.dblpancakes)
-        for i, dp in enumerate(self.dblpancakes):
-            if verbose:
-                print(f"HTSInsert.names: dblpancakes[{i}]: dp={dp}")
+        parts = [(dp, f"{prefix}dp{i}") for i, dp in enumerate(self.dblpancakes)]
+        parts += [
+            (self.isolations[i], f"{prefix}i{i}")
+            for i in range(len(self.dblpancakes) - 1)
+        ]
+        return parts
 
-            dp_name = f"{prefix}dp{i}"
-            dp_id = dp.get_names(dp_name, detail, verbose)
-            dp_ids.append(dp_id)
+    def count_names(self, detail: str) -> int:
+        """
+        return the number of names, without generating them
+        """
+        return sum(obj.count_names(detail) for obj, name in self.get_parts(""))
 
-            if i != n_dp - 1:
-                dp_i = self.isolations[i]
+    def iter_names(
+        self,
+        mname: str,
+        detail: str,
+        verbose: bool = False,
+        start: Optional[int] = None,
+        stop: Optional[int] = None,
+    ) -> Iterator[str]:
+        """
+        iterate over the names of the solids: double pancakes first, then isolations
 
-                _name = f"{prefix}i{i}"
-                _id = dp_i.get_names(_name, detail, verbose)
-                i_ids.append(_id)
+        start, stop: only yield the names [start:stop] (as a slice of get_names),
+        names before start are not generated
+        """
+        if verbose:
+            for i, dp in enumerate(self.dblpancakes):
+                print(f"HTSInsert.names: dblpancakes[{i}]: dp={dp}")
+        yield from iter_parts(self.get_parts(mname), detail, verbose, start, stop)
 
-        if detail == "dblpancake":
-            return flatten([dp_ids, i_ids])
-        else:
-            return flatten([flatten(dp_ids), i_ids])
+    def get_names(self, mname: str, detail: str, verbose: bool = False) -> list[str]:
+        return list(self.iter_names(mname, detail, verbose))
 
     def setDblpancake(self, dblpancake):
         self.dblpancakes.append(dblpancake)
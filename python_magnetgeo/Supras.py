@@ -5,6 +5,9 @@
 
 import json
 import yaml
+from . import yaml_utils
+
+from . import resolver
 
 
 class Supras(yaml.YAMLObject):
@@ -56,24 +59,18 @@ class Supras(yaml.YAMLObject):
         """
         solid_names = []
         if isinstance(self.magnets, str):
-            YAMLFile = f"{self.magnets}.yaml"
-            with open(YAMLFile, "r") as f:
-                Object = yaml.load(f, Loader=yaml.FullLoader)
+            Object = resolver.load(self.magnets)
 
             solid_names += Object.get_names(self.name, is2D, verbose)
         elif isinstance(self.magnets, list):
             for magnet in self.magnets:
-                YAMLFile = f"{magnet}.yaml"
-                with open(YAMLFile, "r") as f:
-                    Object = yaml.load(f, Loader=yaml.FullLoader)
+                Object = resolver.load(magnet)
 
                 solid_names += Object.get_names(magnet, is2D, verbose)
         elif isinstance(self.magnets, dict):
             for key in self.magnets:
                 magnet = self.magnets[key]
-                YAMLFile = f"{magnet}.yaml"
-                with open(YAMLFile, "r") as f:
-                    Object = yaml.load(f, Loader=yaml.FullLoader)
+                Object = resolver.load(magnet)
 
                 solid_names += Object.get_names(self.name, is2D, verbose)
         else:
@@ -89,7 +86,7 @@ class Supras(yaml.YAMLObject):
         """dump to a yaml file name.yaml"""
         try:
             with open(f"{self.name}.yaml", "w") as ostream:
-                yaml.dump(self, stream=ostream)
+                yaml_utils.dump(self, stream=ostream)
         except:
             raise Exception("Failed to Supras dump")
 
@@ -98,7 +95,7 @@ class Supras(yaml.YAMLObject):
         data = None
         try:
             with open(f"{self.name}.yaml", "r") as istream:
-                data = yaml.load(stream=istream, Loader=yaml.FullLoader)
+                data = yaml_utils.load(istream)
         except:
             raise Exception(f"Failed to load Insert data {self.name}.yaml")
 
@@ -132,8 +129,7 @@ class Supras(yaml.YAMLObject):
 
         if debug:
             print(f'Supras.from_json: filename={filename}')
-        with open(filename, "r") as istream:
-            return json.loads(istream.read(), object_hook=deserialize.unserialize_object)
+        return deserialize.load_json(filename)
 
     ###################################################################
     #
@@ -151,18 +147,18 @@ class Supras(yaml.YAMLObject):
         zb = [0, 0]
 
         for i, mname in enumerate(self.magnets):
-            Supra = None
-            with open(f"{mname}.yaml", "r") as f:
-                Supra = yaml.load(f, Loader=yaml.FullLoader)
+            # only r and z are needed
+            data = resolver.load_fields(mname, ["r", "z"])
+            (r, z) = (data["r"], data["z"])
 
             if i == 0:
-                rb = Supra.r
-                zb = Supra.z
+                rb = list(r)
+                zb = list(z)
 
-            rb[0] = min(rb[0], Supra.r[0])
-            zb[0] = min(zb[0], Supra.z[0])
-            rb[1] = max(rb[1], Supra.r[1])
-            zb[1] = max(zb[1], Supra.z[1])
+            rb[0] = min(rb[0], r[0])
+            zb[0] = min(zb[0], z[0])
+            rb[1] = max(rb[1], r[1])
+            zb[1] = max(zb[1], z[1])
 
         return (rb, zb)
 
@@ -206,4 +202,5 @@ def Supras_constructor(loader, node):
     return Supras(name, magnets, innerbore, outerbore)
 
 
-yaml.add_constructor("!Supras", Supras_constructor)
+yaml_utils.add_constructor("!Supras", Supras_constructor)
+yaml_utils.register(Supras)
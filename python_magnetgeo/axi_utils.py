@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+
+"""
+Utils to study ModelAxi helical cuts in batch
+
+Candidates are given as 2-D arrays of turns and pitch: one row per candidate,
+one column per section. They are evaluated all at once without building any ModelAxi.
+
+unique merges z values equal within a tolerance (eg. section boundaries of
+several helices and rings along a cooling channel).
+"""
+
+from typing import NamedTuple
+
+import numpy as np
+
+# constraint violations (bit flags)
+BAD_VALUES = 1  # turns or pitch not strictly positive
+BAD_HEIGHT = 2  # total height differs from 2 * h
+BAD_NTURNS = 4  # total number of turns differs from the expected one
+BAD_Z = 8  # the cut is not within the helix z bounds
+
+
+class SweepResult(NamedTuple):
+    """
+    height: total height of the cut (sum of turns * pitch)
+    nturns: total number of turns
+    nsections: number of sections once compacted (see ModelAxi.compact)
+    violations: combination of BAD_VALUES, BAD_HEIGHT, BAD_NTURNS, BAD_Z
+    """
+
+    height: np.ndarray
+    nturns: np.ndarray
+    nsections: np.ndarray
+    violations: np.ndarray
+
+    @property
+    def valid(self) -> np.ndarray:
+        """
+        returns True for the candidates satisfying all constraints
+        """
+        return self.violations == 0
+
+
+def sweep(
+    turns,
+    pitch,
+    h,
+    z: list[float] | None = None,
+    nturns: float | None = None,
+    tol: float = 1.0e-6,
+) -> SweepResult:
+    """
+    evaluate candidate turns/pitch distributions
+
+    turns, pitch: arrays of shape (candidates, sections)
+    h: half height of the cut (scalar, or one value per candidate);
+    the cut starts at -h and should end at h
+    z: z bounds of the helix, the cut must lie within them
+    nturns: expected number of turns
+    tol: relative tolerance used to compact pitches and check height and nturns
+    """
+    turns = np.atleast_2d(np.asarray(turns, dtype=np.float64))
+    pitch = np.atleast_2d(np.asarray(pitch, dtype=np.float64))
+    if turns.shape != pitch.shape:
+        raise RuntimeError(
+            f"sweep: turns and pitch must have the same shape (got {turns.shape} and {pitch.shape})"
+        )
+    h = np.asarray(h, dtype=np.float64)
+
+    height = (turns * pitch).sum(axis=1)
+    total = turns.sum(axis=1)
+    nsections = np.zeros(turns.shape[0], dtype=np.int64)
+    if turns.shape[1]:
+        with np.errstate(divide="ignore", invalid="ignore"):
+            changes = np.abs(1 - pitch[:, 1:] / pitch[:, :-1]) > tol
+        nsections += 1 + changes.sum(axis=1)
+
+    violations = np.zeros(turns.shape[0], dtype=np.int64)
+    violations[((turns <= 0) | (pitch <= 0)).any(axis=1)] |= BAD_VALUES
+    violations[np.abs(height - 2 * h) > tol * np.abs(2 * h)] |= BAD_HEIGHT
+    if nturns is not None:
+        violations[np.abs(total - nturns) > tol * abs(nturns)] |= BAD_NTURNS
+    if z is not None:
+        violations[(-h < z[0]) | (-h + height > z[1])] |= BAD_Z
+
+    return SweepResult(height, total, nsections, violations)
+
+
+def sweep_helix(helix, turns, pitch, nturns: float | None = None, tol: float = 1.0e-6) -> SweepResult:
+    """
+    evaluate candidate turns/pitch distributions for helix
+
+    the cut must span [-helix.modelaxi.h, helix.modelaxi.h] within helix.z,
+    nturns defaults to the number of turns of helix
+    """
+    if nturns is None:
+        nturns = helix.get_Nturns()
+    return sweep(turns, pitch, helix.modelaxi.h, helix.z, nturns, tol)
+
+
+class SolveResult(NamedTuple):
+    """
+    turns, pitch: arrays of shape (profiles, bins), one section per bin
+    error: number of turns obtained minus number of turns expected, per profile
+    """
+
+    turns: np.ndarray
+    pitch: np.ndarray
+    error: np.ndarray
+
+
+def solve(density, h, pitches) -> SolveResult:
+    """
+    compute turns and pitch following target turn density profiles
+
+    density: array of shape (profiles, bins), axial turn density (turns per unit length)
+    on bins of equal length splitting [-h, h]
+    h: half height of the cut (scalar, or one value per profile)
+    pitches: allowed pitches
+
+    bins are processed from bottom to top, for all profiles at once:
+    the pitch of each bin is the allowed pitch which keeps the cumulative
+    number of turns the closest to the target one, so the error never
+    accumulates along the helix. turns * pitch always sums to 2 * h.
+    """
+    density = np.atleast_2d(np.asarray(density, dtype=np.float64))
+    (nprofiles, nbins) = density.shape
+    h = np.broadcast_to(np.asarray(h, dtype=np.float64), (nprofiles,))
+    allowed = np.unique(np.asarray(pitches, dtype=np.float64))
+    if allowed.size == 0 or allowed[0] <= 0:
+        raise RuntimeError(f"solve: pitches must be strictly positive (got {pitches})")
+
+    # allowed densities, increasing, and midpoints between them
+    densities = 1 / allowed[::-1]
+    bounds = (densities[1:] + densities[:-1]) / 2
+    length = 2 * h / nbins
+    target = np.cumsum(density * length[:, None], axis=1)
+
+    index = np.empty((nprofiles, nbins), dtype=np.intp)
+    current = np.zeros(nprofiles)
+    for j in range(nbins):
+        wanted = (target[:, j] - current) / length
+        i = np.searchsorted(bounds, wanted)
+        index[:, j] = i
+        current += densities[i] * length
+
+    pitch = allowed[::-1][index]
+    turns = length[:, None] / pitch
+    return SolveResult(turns, pitch, current - target[:, -1])
+
+
+def to_modelaxi(name: str, h: float, turns, pitch, tol: float = 1.0e-6):
+    """
+    build an array-backed ModelAxi from one row of a SolveResult, compacted
+    """
+    from .ModelAxi import ModelAxi
+
+    axi = ModelAxi.from_arrays(name, h, turns, pitch)
+    (turns, pitch) = axi.compact(tol)
+    return ModelAxi.from_arrays(name, h, turns, pitch)
+
+
+class UniqueResult(NamedTuple):
+    """
+    values: values kept, in their original order
+    index: index of the values kept in data
+    inverse: for each value of data, index in values of the value it is merged into
+    """
+
+    values: np.ndarray
+    index: np.ndarray
+    inverse: np.ndarray
+
+
+def unique(data, tol: float = 1.0e-6) -> UniqueResult:
+    """
+    merge the values of data equal within tol
+
+    once sorted, consecutive values closer than tol belong to the same group;
+    each group is kept as its earliest value in data
+
+    values are sorted once, then a single sweep over their differences
+    builds the groups
+    """
+    data = np.asarray(data, dtype=np.float64).ravel()
+    if not data.size:
+        empty = np.empty(0, dtype=np.intp)
+        return UniqueResult(data, empty, empty)
+
+    order = np.argsort(data, kind="stable")
+    starts = np.flatnonzero(np.diff(data[order]) > tol) + 1
+    starts = np.concatenate(([0], starts))
+    group = np.zeros(data.size, dtype=np.intp)
+    group[starts[1:]] = 1
+    group = np.cumsum(group)
+
+    # earliest value of each group, then groups renumbered in data order
+    first = np.minimum.reduceat(order, starts)
+    rank = np.argsort(first)
+    index = first[rank]
+    position = np.empty_like(rank)
+    position[rank] = np.arange(rank.size)
+
+    inverse = np.empty(data.size, dtype=np.intp)
+    inverse[order] = position[group]
+    return UniqueResult(data[index], index, inverse)
@@ -6,6 +6,7 @@ Provides definiton for CoolingSlits:
 """
 
 import yaml
+from . import yaml_utils
 import json
 from .Shape2D import Shape2D
 
@@ -49,7 +50,7 @@ class CoolingSlit(yaml.YAMLObject):
         """
         try:
             with open(f"{name}.yaml", "w") as ostream:
-                yaml.dump(self, stream=ostream)
+                yaml_utils.dump(self, stream=ostream)
         except:
             raise Exception("Failed to CoolingSlit dump")
 
@@ -60,7 +61,7 @@ class CoolingSlit(yaml.YAMLObject):
         data = None
         try:
             with open(f"{name}.yaml", "r") as istream:
-                data = yaml.load(stream=istream, Loader=yaml.FullLoader)
+                data = yaml_utils.load(istream)
         except:
             raise Exception(f"Failed to load Bitter data {name}.yaml")
 
@@ -90,8 +91,7 @@ class CoolingSlit(yaml.YAMLObject):
 
         if debug:
             print(f'Coolingslit.from_json: filename={filename}')
-        with open(filename, "r") as istream:
-            return json.loads(istream.read(), object_hook=deserialize.unserialize_object)
+        return deserialize.load_json(filename)
 
 
 def CoolingSlit_constructor(loader, node):
@@ -111,4 +111,5 @@ def CoolingSlit_constructor(loader, node):
     return CoolingSlit(r, angle, n, dh, sh, shape)
 
 
-yaml.add_constructor("!Slit", CoolingSlit_constructor)
+yaml_utils.add_constructor("!Slit", CoolingSlit_constructor)
+yaml_utils.register(CoolingSlit)
@@ -3,12 +3,59 @@
 Utils for generating cut
 """
 
-def lncmi_cut(object, filename: str, append: bool = False, z0: float = 0):
+import re
+
+
+def get_cut_z(modelaxi, z0: float):
     """
-    for lncmi CAM
+    returns z along the cut, starting from z0 and going down:
+    z[i+1] = z[i] - turns[i] * pitch[i]
+    """
+    import numpy as np
+
+    turns = np.asarray(modelaxi.turns, dtype=np.float64)
+    pitch = np.asarray(modelaxi.pitch, dtype=np.float64)
+    return np.cumsum(np.concatenate(([z0], -(turns * pitch))))
+
+
+def get_cut_rows(modelaxi, compact: bool = False, tol: float = 1.0e-6):
+    """
+    returns the index of the sections written to a cut file
+
+    compact: only keep the last section of each run of sections which pitches
+    are equal within tol (see ModelAxi.compact): the cut is a straight
+    line in (theta, z) along a run, so only its end point is needed
+    """
+    import numpy as np
+
+    n = len(modelaxi.pitch)
+    if not compact or n == 0:
+        return np.arange(n)
+    starts = modelaxi.get_runs(tol)
+    return np.append(starts[1:] - 1, n - 1)
+
+
+def compression_ratio(modelaxi, tol: float = 1.0e-6) -> float:
+    """
+    returns the number of sections over the number of lines written in compact mode
+    """
+    n = len(modelaxi.pitch)
+    if n == 0:
+        return 1.0
+    return n / len(get_cut_rows(modelaxi, True, tol))
+
+
+def lncmi_cut_data(
+    object, filename: str, z0: float = 0, compact: bool = False, tol: float = 1.0e-6
+) -> str:
+    """
+    returns the content of the cut file for lncmi CAM
     see: MagnetTools/MagnetField/Stack.cc write_lncmi_paramfile L136
+
+    filename is only used in the header
+    compact: merge runs of sections with equal pitch (see get_cut_rows)
     """
-    print(f'lncmi_cut: filename={filename}')
+    import numpy as np
     from math import pi
 
     sign = 1
@@ -21,54 +68,52 @@ def lncmi_cut(object, filename: str, append: bool = False, z0: float = 0):
 
     z = z0
     theta = 0
-    shape_id = 0
-    tab = "\t"
 
-    # 'x' create file, 'a' append to file, Append and Read (‘a+’)
-    flag = "x"
-    if append:
-        flag = "a"
-    with open(filename, flag) as f:
-        sens = "droite"
-        if sign > 0:
-            sens = "gauche"
-        f.write(f"%decoupe double helice {filename} {sens}\n")
-        f.write("%Origin ")
-        f.write(f"X {-z * units:12.4f}\t")
-        f.write(f"W {-sign * theta * angle_units:12.3f}\n")
-
-        f.write("O****(*****)\n")
-        f.write("G0G90X0.0Y0.0\n")
-        f.write("G0A-0.\n")
-        f.write("G92\n")
-        f.write("G40G50\n")
-        f.write("M61\nM60\n")
-        f.write("G0X-0.000\n")
-        f.write("G0A0.\n")
-
-        # TODO use compact to reduce size of cuts
-        for i, (turn, pitch) in enumerate(zip(object.modelaxi.turns, object.modelaxi.pitch)):
-            theta += turn * (2 * pi) * sign
-            z -= turn * pitch
-            f.write(f"N{i+1}")
-            if i == len(object.modelaxi.turns)-1:
-                f.write("G01")
-
-            f.write("\t");
-            f.write(f"X {-z * units:12.4f}\t")
-            f.write(f"W {-sign * theta * angle_units:12.3f}\n")
-
-        f.write("M50\nM29\nM30")
-        f.write("%")
-    
-def salome_cut(object, filename: str, append: bool = False, z0: float = 0):
+    sens = "droite"
+    if sign > 0:
+        sens = "gauche"
+    header = (
+        f"%decoupe double helice {filename} {sens}\n"
+        "%Origin "
+        f"X {-z * units:12.4f}\t"
+        f"W {-sign * theta * angle_units:12.3f}\n"
+        "O****(*****)\n"
+        "G0G90X0.0Y0.0\n"
+        "G0A-0.\n"
+        "G92\n"
+        "G40G50\n"
+        "M61\nM60\n"
+        "G0X-0.000\n"
+        "G0A0.\n"
+    )
+
+    rows = get_cut_rows(object.modelaxi, compact, tol)
+    thetas = object.modelaxi.get_theta()[1:][rows]
+    zs = get_cut_z(object.modelaxi, z)[1:][rows]
+    n = len(zs)
+    values = np.empty(3 * n, dtype="O")
+    values[0::3] = range(1, n + 1)
+    values[1::3] = ((-zs) * units).tolist()
+    values[2::3] = ((-thetas) * angle_units).tolist()
+    body = ""
+    if n:
+        line = "N%d\tX %12.4f\tW %12.3f\n"
+        last = "N%dG01\tX %12.4f\tW %12.3f\n"
+        body = (line * (n - 1) + last) % tuple(values.tolist())
+
+    return header + body + "M50\nM29\nM30" + "%"
+
+
+def salome_cut_data(
+    object, z0: float = 0, compact: bool = False, tol: float = 1.0e-6
+) -> str:
     """
-    for salome
+    returns the content of the cut file for salome
     see: MagnetTools/MagnetField/Stack.cc write_salome_paramfile L1011
 
+    compact: merge runs of sections with equal pitch (see get_cut_rows)
     """
-    print(f'salome_cut: filename={filename}')
-    from math import pi
+    import numpy as np
 
     sign = 1
     if object.odd:
@@ -79,43 +124,327 @@ def salome_cut(object, filename: str, append: bool = False, z0: float = 0):
     shape_id = 0
     tab = "\t"
 
+    header = (
+        f"#theta[rad]{tab}Shape_id[]{tab}tZ[mm]\n"
+        f"{theta*(-sign):12.8f}{tab}{shape_id:8}{tab}{z:12.8f}\n"
+    )
+
+    rows = get_cut_rows(object.modelaxi, compact, tol)
+    thetas = object.modelaxi.get_theta()[1:][rows]
+    zs = get_cut_z(object.modelaxi, z)[1:][rows]
+    n = len(zs)
+    values = np.empty(2 * n, dtype="O")
+    values[0::2] = (-thetas).tolist()
+    values[1::2] = zs.tolist()
+    line = f"%12.8f{tab}{shape_id:8}{tab}%12.8f\n"
+    return header + (line * n) % tuple(values.tolist())
+
+
+def write_data(stream, data: str) -> None:
+    """
+    write data to stream in a single call
+
+    stream may be a text or a binary stream (eg. io.BytesIO): binary
+    streams are detected from their class or their mode, other streams
+    get bytes only when they reject str
+    """
+    import io
+
+    mode = getattr(stream, "mode", None)
+    if isinstance(stream, io.TextIOBase):
+        binary = False
+    elif isinstance(stream, (io.RawIOBase, io.BufferedIOBase)):
+        binary = True
+    elif isinstance(mode, str):
+        binary = "b" in mode
+    else:
+        try:
+            stream.write(data)
+            return
+        except TypeError:
+            binary = True
+
+    if binary:
+        stream.write(data.encode("utf-8"))
+    else:
+        stream.write(data)
+
+
+def lncmi_cut(
+    object,
+    filename: str,
+    append: bool = False,
+    z0: float = 0,
+    compact: bool = False,
+    tol: float = 1.0e-6,
+) -> float:
+    """
+    for lncmi CAM
+    see: MagnetTools/MagnetField/Stack.cc write_lncmi_paramfile L136
+
+    returns the compression ratio (1 unless compact)
+    """
+    data = lncmi_cut_data(object, filename, z0, compact, tol)
+
     # 'x' create file, 'a' append to file, Append and Read (‘a+’)
     flag = "x"
     if append:
         flag = "a"
-    print(f'flag={flag}')
     with open(filename, flag) as f:
-        f.write(f"#theta[rad]{tab}Shape_id[]{tab}tZ[mm]\n")
-        f.write(f"{theta*(-sign):12.8f}{tab}{shape_id:8}{tab}{z:12.8f}\n")
-
-        # TODO use compact to reduce size of cuts
-        for i, (turn, pitch) in enumerate(zip(object.modelaxi.turns, object.modelaxi.pitch)):
-            theta += turn * (2 * pi) * sign
-            z -= turn * pitch
-            f.write(f"{theta*(-sign):12.8f}{tab}{shape_id:8}{tab}{z:12.8f}\n")
+        f.write(data)
+    return compression_ratio(object.modelaxi, tol) if compact else 1.0
 
 
-def create_cut(
-    object, format: str, name: str, append: bool = False, z0: float=0 
-):
+def salome_cut(
+    object,
+    filename: str,
+    append: bool = False,
+    z0: float = 0,
+    compact: bool = False,
+    tol: float = 1.0e-6,
+) -> float:
     """
-    create cut file
+    for salome
+    see: MagnetTools/MagnetField/Stack.cc write_salome_paramfile L1011
+
+    returns the compression ratio (1 unless compact)
     """
+    data = salome_cut_data(object, z0, compact, tol)
 
-    dformat = {
-        "lncmi": {"run": lncmi_cut, "extension": "_lncmi.iso"},
-        "salome": {"run": salome_cut, "extension": "_cut_salome.dat"},
-    }
+    # 'x' create file, 'a' append to file, Append and Read (‘a+’)
+    flag = "x"
+    if append:
+        flag = "a"
+    with open(filename, flag) as f:
+        f.write(data)
+    return compression_ratio(object.modelaxi, tol) if compact else 1.0
 
+
+formats = {
+    "lncmi": {"run": lncmi_cut, "extension": "_lncmi.iso"},
+    "salome": {"run": salome_cut, "extension": "_cut_salome.dat"},
+}
+
+
+def get_format(format: str) -> dict:
+    """
+    returns the writer and the extension of format
+    """
     try:
-        format_cut = dformat[format.lower()]
+        return formats[format.lower()]
     except:
         raise RuntimeError(
-            f"create_cut: format={format} unsupported\nallowed formats are: {dformat.keys()}"
+            f"create_cut: format={format} unsupported\nallowed formats are: {formats.keys()}"
+        )
+
+
+def write_cut(
+    object,
+    format: str,
+    stream,
+    name: str = "",
+    z0: float = 0,
+    compact: bool = False,
+    tol: float = 1.0e-6,
+) -> float:
+    """
+    write cut to stream (text or binary, eg. an in-memory buffer)
+
+    name: name of the file, only used in lncmi header
+    returns the compression ratio (1 unless compact)
+    """
+    if get_format(format) is formats["lncmi"]:
+        data = lncmi_cut_data(object, name, z0, compact, tol)
+    else:
+        data = salome_cut_data(object, z0, compact, tol)
+    write_data(stream, data)
+    return compression_ratio(object.modelaxi, tol) if compact else 1.0
+
+
+def write_cut_file(
+    object,
+    format: str,
+    directory: str = ".",
+    compact: bool = False,
+    tol: float = 1.0e-6,
+) -> dict:
+    """
+    write the cut of object to {directory}/{object.name}{extension},
+    the file is overwritten if it exists
+
+    returns a description of the file: name, format, filename, size (bytes),
+    time (s), compression ratio and status ("written" or "unsupported")
+
+    shapes are only added by add_shape (see Helix.generate_cut): no file
+    is written for an object with shapes (model3d.with_shapes), its status
+    is "unsupported"
+    """
+    import os
+    import time
+
+    start = time.perf_counter()
+    basename = f"{object.name}{get_format(format)['extension']}"
+    filename = os.path.join(directory, basename)
+    if getattr(getattr(object, "model3d", None), "with_shapes", False):
+        return {
+            "name": object.name,
+            "format": format,
+            "filename": None,
+            "size": 0,
+            "time": time.perf_counter() - start,
+            "ratio": None,
+            "status": "unsupported",
+        }
+
+    with open(filename, "w") as ostream:
+        ratio = write_cut(object, format, ostream, basename, compact=compact, tol=tol)
+    return {
+        "name": object.name,
+        "format": format,
+        "filename": filename,
+        "size": os.path.getsize(filename),
+        "time": time.perf_counter() - start,
+        "ratio": ratio,
+        "status": "written",
+    }
+
+
+def read_data(source) -> str:
+    """
+    returns the content of source: filename, text or binary stream
+    """
+    if isinstance(source, str):
+        with open(source, "r") as istream:
+            return istream.read()
+    data = source.read()
+    if isinstance(data, bytes):
+        data = data.decode("utf-8")
+    return data
+
+
+def read_salome_cut(source) -> tuple:
+    """
+    read a salome cut file (filename or stream)
+
+    returns theta, shape_id and z as arrays
+    """
+    import numpy as np
+
+    data = read_data(source)
+    if data.startswith("#"):
+        data = data[data.find("\n") + 1 :]
+    values = np.array(data.split(), dtype=np.float64).reshape(-1, 3)
+    return (values[:, 0], values[:, 1].astype(np.int64), values[:, 2])
+
+
+# origin of a lncmi cut (X and W values)
+_lncmi_origin = re.compile(r"^%Origin X\s*(\S+)\tW\s*(\S+)$", re.M)
+
+
+def read_lncmi_cut(source) -> tuple:
+    """
+    read a lncmi cut file (filename or stream)
+
+    returns X and W as arrays, starting with the origin
+    """
+    import numpy as np
+
+    data = read_data(source)
+    origin = _lncmi_origin.search(data)
+    if origin is None:
+        raise RuntimeError("read_lncmi_cut: no origin found")
+
+    # points: "N{i}[G01]\tX {X}\tW {W}" lines, between the header and M50
+    start = data.find("\nN1", origin.end())
+    end = data.find("\nM50", start)
+    items = data[start:end].split() if start >= 0 else []
+    if len(items) % 5:
+        raise RuntimeError("read_lncmi_cut: malformed points")
+    values = np.array(list(origin.groups()) + items[2::5] + items[4::5], dtype=np.float64)
+    n = len(items) // 5
+    X = np.concatenate((values[:1], values[2 : n + 2]))
+    W = np.concatenate((values[1:2], values[n + 2 :]))
+    return (X, W)
+
+
+def get_cut_format(filename: str) -> str:
+    """
+    returns the format of a cut file from its extension (.iso or .dat)
+    """
+    for format, values in formats.items():
+        if filename.endswith(values["extension"][values["extension"].rfind(".") :]):
+            return format
+    raise RuntimeError(
+        f"get_cut_format: cannot guess format of {filename} (extensions: {[v['extension'] for v in formats.values()]})"
+    )
+
+
+def compare_cut(
+    modelaxi,
+    source,
+    format: str | None = None,
+    z0: float = 0,
+    tol: float = 1.0e-6,
+) -> tuple:
+    """
+    compare a cut file to modelaxi
+
+    source: filename or stream (format is then required)
+    z0: origin of lncmi cuts (see lncmi_cut)
+    tol: tolerance used to compact pitches, for compact cut files
+
+    rows of shapes (salome) are ignored
+    returns the maximum absolute deviation of the angle and of the z columns,
+    in the units of the file (salome: rad, mm; lncmi: deg, X)
+    """
+    import numpy as np
+
+    if format is None:
+        format = get_cut_format(source)
+    format = get_format(format)
+
+    theta = modelaxi.get_theta()
+    if format is formats["salome"]:
+        (angle, shape_id, z) = read_salome_cut(source)
+        (angle, z) = (angle[shape_id == 0], z[shape_id == 0])
+        expected_angle = -theta
+        expected_z = get_cut_z(modelaxi, modelaxi.h)
+    else:
+        (z, angle) = read_lncmi_cut(source)
+        expected_angle = -theta * (180 / np.pi)
+        expected_z = -get_cut_z(modelaxi, z0) * 1.e+3
+
+    if angle.size != expected_angle.size:
+        # compact cut: only the last section of each run is written
+        rows = np.concatenate(([0], get_cut_rows(modelaxi, True, tol) + 1))
+        (expected_angle, expected_z) = (expected_angle[rows], expected_z[rows])
+    if angle.size != expected_angle.size:
+        raise RuntimeError(
+            f"compare_cut: {angle.size} points found, {expected_angle.size} expected"
         )
+    return (
+        float(np.abs(angle - expected_angle).max(initial=0)),
+        float(np.abs(z - expected_z).max(initial=0)),
+    )
 
-    write_cut = format_cut["run"]
+
+def create_cut(
+    object,
+    format: str,
+    name: str,
+    append: bool = False,
+    z0: float = 0,
+    compact: bool = False,
+    tol: float = 1.0e-6,
+) -> float:
+    """
+    create cut file
+
+    compact: merge runs of sections with equal pitch
+    returns the compression ratio (1 unless compact)
+    """
+    format_cut = get_format(format)
+    run = format_cut["run"]
     ext = format_cut["extension"]
     filename = f"{name}{ext}"
-    write_cut(object, filename, append, z0)
-
+    return run(object, filename, append, z0, compact, tol)
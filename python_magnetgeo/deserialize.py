@@ -5,80 +5,180 @@
 Provides tools to un/serialize data from json
 """
 
-from .Shape import Shape
-from .ModelAxi import ModelAxi
-from .Model3D import Model3D
-from .Helix import Helix
-from .Ring import Ring
-from .InnerCurrentLead import InnerCurrentLead
-from .OuterCurrentLead import OuterCurrentLead
-from .Insert import Insert
-from .Bitter import Bitter
-from .Supra import Supra
-from .Screen import Screen
-from .MSite import MSite
-from .Bitters import Bitters
-from .Supras import Supras
-from .Shape2D import Shape2D
-from .tierod import Tierod
-from .coolingslit import CoolingSlit
+import json
+import importlib
+from types import GeneratorType
+
+from . import yaml_utils
 
 
 # From : http://chimera.labs.oreilly.com/books/1230000000393/ch06.html#_discussion_95
 # Dictionary mapping names to known classes
+#
+# classes are imported on first lookup, so that loading an object
+# only imports the modules it actually needs
 
-classes = {
-    "Shape": Shape,
-    "ModelAxi": ModelAxi,
-    "Model3D": Model3D,
-    "Helix": Helix,
-    "Ring": Ring,
-    "InnerCurrentLead": InnerCurrentLead,
-    "OuterCurrentLead": OuterCurrentLead,
-    "Insert": Insert,
-    "Bitter": Bitter,
-    "Supra": Supra,
-    "Screen": Screen,
-    "Bitters": Bitters,
-    "Supras": Supras,
-    "MSite": MSite,
-    "Shape2D": Shape2D,
-    "Tierod": Tierod,
-    "CoolingSlit": CoolingSlit,
+modules = {
+    "Shape": "Shape",
+    "ModelAxi": "ModelAxi",
+    "Model3D": "Model3D",
+    "Helix": "Helix",
+    "Ring": "Ring",
+    "InnerCurrentLead": "InnerCurrentLead",
+    "OuterCurrentLead": "OuterCurrentLead",
+    "Insert": "Insert",
+    "Bitter": "Bitter",
+    "Supra": "Supra",
+    "Screen": "Screen",
+    "Bitters": "Bitters",
+    "Supras": "Supras",
+    "MSite": "MSite",
+    "Shape2D": "Shape2D",
+    "Tierod": "tierod",
+    "CoolingSlit": "coolingslit",
 }
 
 
+class Registry(dict):
+    """
+    dictionary mapping names to known classes, filled on demand
+    """
+
+    def __missing__(self, clsname: str):
+        if clsname not in modules:
+            raise KeyError(clsname)
+        module = importlib.import_module(f".{modules[clsname]}", __package__)
+        cls = self[clsname] = getattr(module, clsname)
+        return cls
+
+    def __contains__(self, clsname) -> bool:
+        return clsname in modules
+
+
+classes = Registry()
+
+
+def yaml_constructor(loader, tag_suffix: str, node):
+    """
+    build an object which class is not yet imported
+
+    importing the module registers the constructor for the class
+    """
+    clsname = node.tag.lstrip("!")
+    if clsname not in classes:
+        return loader.construct_undefined(node)
+    classes[clsname]
+    constructor = type(loader).yaml_constructors.get(node.tag)
+    if constructor is None:
+        return loader.construct_undefined(node)
+    data = constructor(loader, node)
+    if isinstance(data, GeneratorType):
+        generator = data
+        data = next(generator)
+        for _ in generator:
+            pass
+    return data
+
+
 def serialize_instance(obj):
     """
     serialize_instance of an obj
+
+    arrays are serialized as lists
     """
+    if hasattr(obj, "tolist"):
+        return obj.tolist()
     d = {"__classname__": type(obj).__name__}
-    d.update(vars(obj))
+    d.update(obj.__getstate__() or {})
     return d
 
 
+def compile_decoder(cls):
+    """
+    return a function building a cls object from its json dict
+
+    json keys are mapped (case insensitive) to the parameters of cls.__init__,
+    unknown keys are lowered; the mapping of each key is only computed once,
+    and the json dict is used as is when its keys already are parameter names.
+    Parameters without default value are required.
+    """
+    import inspect
+
+    params = [
+        param
+        for param in list(inspect.signature(cls.__init__).parameters.values())[1:]
+        if param.kind not in (param.VAR_POSITIONAL, param.VAR_KEYWORD)
+    ]
+    fields = {param.name.lower(): param.name for param in params}
+    required = frozenset(
+        param.name for param in params if param.default is inspect.Parameter.empty
+    )
+    names = frozenset(fields.values())
+    keymap = {}
+    new = cls.__new__
+
+    def decode(d: dict):
+        if not d.keys() <= names:
+            # keys not named after a parameter: map them
+            try:
+                d = {keymap[key]: value for key, value in d.items()}
+            except KeyError:
+                for key in d:
+                    if key not in keymap:
+                        keymap[key] = fields.get(key.lower(), key.lower())
+                d = {keymap[key]: value for key, value in d.items()}
+
+        if not required <= d.keys():
+            raise RuntimeError(
+                f"unserialize_object: {cls.__name__} missing fields {sorted(required - d.keys())}"
+            )
+        obj = new(cls)  # Make instance without calling __init__
+        obj.__dict__ = d
+        return obj
+
+    return decode
+
+
+_decoders = {}
+
+
+def get_decoder(clsname: str):
+    """
+    return the decoder for clsname
+    """
+    decoder = _decoders.get(clsname)
+    if decoder is None:
+        decoder = _decoders[clsname] = compile_decoder(classes[clsname])
+    return decoder
+
+
 def unserialize_object(d, debug: bool = False):
     """
     unserialize_instance of an obj
     """
-    if debug:
-        print(f'unserialize_object: d={d}', flush=True)
-
     # remove all __classname__ keys
     clsname = d.pop("__classname__", None)
     if debug:
-        print(f'clsname: {clsname}', flush=True)
+        print(f'unserialize_object: clsname={clsname}, d={d}', flush=True)
     if clsname:
-        cls = classes[clsname]
-        obj = cls.__new__(cls)  # Make instance without calling __init__
-        for key, value in d.items():
-            if debug:
-                print(f'key={key}, value={value} type={type(value)}', flush=True)
-            setattr(obj, key.lower(), value)
-        if debug:
-            print(f'obj={obj}', flush=True)
-        return obj
-    else:
-        if debug:
-            print(f'no classname: {d}', flush=True)
-        return d
+        return get_decoder(clsname)(d)
+    return d
+
+
+def loads(data: str | bytes):
+    """
+    build an object from json data
+    """
+    return json.loads(data, object_hook=unserialize_object)
+
+
+def load_json(filename: str):
+    """
+    build an object from a json file
+    """
+    from . import diskcache
+
+    return diskcache.load(filename, "json", loads)
+
+
+yaml_utils.add_multi_constructor("", yaml_constructor)
@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+
+"""
+Provides a persistent cache for parsed yaml/json files
+
+Entries are keyed by a hash of the file content, of the file format
+and of the library version: an unchanged file is only parsed once,
+whatever the process reading it.
+
+Files read while parsing (eg. the Shape2D of a Tierod) are recorded
+with add_dependency: an entry is only used while their content is
+unchanged.
+
+The cache is disabled by default. Enable it with enable(), or set
+PYTHON_MAGNETGEO_CACHE_DIR to the directory to use.
+"""
+
+from typing import Callable
+
+import os
+import hashlib
+import pickle
+import tempfile
+import threading
+import warnings
+
+from . import __version__
+
+FORMAT_VERSION = 2
+_directory: str | None = os.environ.get("PYTHON_MAGNETGEO_CACHE_DIR") or None
+_local = threading.local()
+
+
+def default_directory() -> str:
+    """
+    return the default cache directory
+    """
+    root = os.environ.get("XDG_CACHE_HOME") or os.path.join(
+        os.path.expanduser("~"), ".cache"
+    )
+    return os.path.join(root, "python_magnetgeo")
+
+
+def enable(directory: str | None = None) -> None:
+    """
+    enable the cache, stored in directory (default: ~/.cache/python_magnetgeo)
+    """
+    global _directory
+
+    if directory is None:
+        directory = default_directory()
+    os.makedirs(directory, exist_ok=True)
+    _directory = directory
+
+
+def disable() -> None:
+    """
+    disable the cache
+    """
+    global _directory
+
+    _directory = None
+
+
+def get_directory() -> str | None:
+    """
+    return the cache directory, None if the cache is disabled
+    """
+    return _directory
+
+
+def get_key(data: bytes, kind: str) -> str:
+    """
+    return the key of a file content
+    """
+    key = hashlib.sha256()
+    key.update(f"python_magnetgeo-{__version__}-{FORMAT_VERSION}-{kind}\n".encode("utf-8"))
+    key.update(data)
+    return key.hexdigest()
+
+
+def get_digest(filename: str) -> str | None:
+    """
+    return the hash of the content of filename, None if there is no such file
+    """
+    try:
+        with open(filename, "rb") as istream:
+            return hashlib.sha256(istream.read()).hexdigest()
+    except FileNotFoundError:
+        return None
+
+
+def add_dependency(filename: str) -> None:
+    """
+    record that filename is read by the parse in progress, if any
+
+    filename should be an absolute path: entries are validated
+    whatever the current directory
+    """
+    for dependencies in getattr(_local, "stack", []):
+        dependencies.add(filename)
+
+
+def _parse(parse: Callable[[bytes], object], data: bytes) -> tuple:
+    """
+    return the object built by parse and the files it has read
+    """
+    stack = _local.__dict__.setdefault("stack", [])
+    stack.append(set())
+    try:
+        obj = parse(data)
+    finally:
+        dependencies = stack.pop()
+    return (obj, sorted(dependencies))
+
+
+def is_valid(dependencies: list[tuple]) -> bool:
+    """
+    return True if the files an entry depends on are unchanged
+    """
+    return all(get_digest(filename) == digest for (filename, digest) in dependencies)
+
+
+def load(filename: str, kind: str, parse: Callable[[bytes], object]):
+    """
+    return the object defined in filename
+
+    kind: file format (eg. "yaml", "json")
+    parse: function building the object from the file content
+    """
+    with open(filename, "rb") as istream:
+        data = istream.read()
+    if _directory is None:
+        return parse(data)
+
+    entry = os.path.join(_directory, f"{get_key(data, kind)}.pickle")
+    try:
+        with open(entry, "rb") as istream:
+            (dependencies, obj) = pickle.load(istream)
+        if is_valid(dependencies):
+            return obj
+    except FileNotFoundError:
+        pass
+    except Exception as error:
+        # corrupted or outdated entry: parse again
+        warnings.warn(f"diskcache: ignore {entry} ({error})")
+
+    (obj, names) = _parse(parse, data)
+    dependencies = [(name, get_digest(name)) for name in names]
+    tmpname = None
+    try:
+        os.makedirs(_directory, exist_ok=True)
+        (fd, tmpname) = tempfile.mkstemp(dir=_directory, suffix=".tmp")
+        with os.fdopen(fd, "wb") as ostream:
+            pickle.dump((dependencies, obj), ostream, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmpname, entry)
+    except Exception as error:
+        if tmpname is not None and os.path.exists(tmpname):
+            os.remove(tmpname)
+        warnings.warn(f"diskcache: failed to store {filename} ({error})")
+    return obj
+
+
+def clear() -> None:
+    """
+    remove all entries from the cache directory
+    """
+    if _directory is None or not os.path.isdir(_directory):
+        return
+    for filename in os.listdir(_directory):
+        if filename.endswith(".pickle"):
+            os.remove(os.path.join(_directory, filename))
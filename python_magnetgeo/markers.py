@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+
+"""
+Provides memoization of marker names and the reverse marker index
+
+get_names and get_channels results are memoized on the object (in _memo),
+keyed on their arguments. An entry is only reused while the fingerprint
+of the object is unchanged: the fields the names depend on, and for
+objects referencing other ones (Insert, MSite) the stamps of the files
+defining them (see resolver.stamp). Callers get copies of memoized lists.
+
+The marker index maps each marker name back to the component it belongs to,
+eg. H3_Cu2 -> helix 3, section 2.
+"""
+
+from typing import Callable, NamedTuple, Optional
+from types import MappingProxyType
+
+import os
+
+from . import resolver
+
+
+class Marker(NamedTuple):
+    """
+    magnet: name given to the magnet (mname)
+    kind: "Helix", "Ring", "CurrentLead", "Bitter", "Slit" or "Insulator"
+    index: rank of the component in the magnet, as numbered in the names
+    component: name of the component object
+    section: section the marker stands for (Cu{section}, B{section}),
+    None when the marker covers all the sections
+    """
+
+    magnet: str
+    kind: str
+    index: int
+    component: str
+    section: Optional[int] = None
+
+
+def copy_names(value):
+    """
+    copy nested lists and dicts of names
+    """
+    if isinstance(value, list):
+        return [copy_names(item) for item in value]
+    if isinstance(value, dict):
+        return {key: copy_names(item) for key, item in value.items()}
+    return value
+
+
+def memoize(obj, key: tuple, fingerprint, compute: Callable):
+    """
+    return compute(), memoized on obj for key while fingerprint is unchanged
+
+    fingerprint None disables memoization
+    """
+    if fingerprint is None:
+        return compute()
+    memo = obj.__dict__.setdefault("_memo", {})
+    entry = memo.get(key)
+    if entry is None or entry[0] != fingerprint:
+        entry = (fingerprint, compute())
+        memo[key] = entry
+    return entry[1]
+
+
+def memoize_names(obj, key: tuple, fingerprint, compute: Callable) -> list[str]:
+    """
+    return a copy of the memoized list of names compute() (see memoize)
+    """
+    return list(memoize(obj, key, fingerprint, compute))
+
+
+def get_state(obj) -> dict:
+    """
+    state used to dump obj: memoized values (attributes starting with _) are dropped
+    """
+    return {key: value for key, value in obj.__dict__.items() if not key.startswith("_")}
+
+
+def memoize_channels(obj, key: tuple, fingerprint, compute: Callable):
+    """
+    return a copy of the memoized nested lists/dicts of names compute() (see memoize)
+    """
+    return copy_names(memoize(obj, key, fingerprint, compute))
+
+
+def memoize_index(obj, key: tuple, fingerprint, compute: Callable) -> MappingProxyType:
+    """
+    return a read-only view of the memoized marker index (see memoize)
+    """
+    return MappingProxyType(memoize(obj, key, fingerprint, compute))
+
+
+# (cwd, path, stamp) -> names referenced by the object defined in path
+_refs: dict = {}
+_refs_maxsize: int = 4096
+
+
+def tree_stamps(obj, workingDir: str = ".") -> tuple | None:
+    """
+    return the stamps of all the files referenced by obj, directly or not
+    (see resolver.get_refs), None if one of them is not defined by a file
+
+    the references of each file are kept as long as the file is unchanged,
+    so only files are stat-ed once the tree is known
+    """
+    stamps = [os.getcwd()]
+    visited = set()
+    pending = resolver.get_refs(obj)
+    while pending:
+        name = pending.pop()
+        if name in visited:
+            continue
+        visited.add(name)
+        directory = name._workingDir if isinstance(name, resolver.LazyRef) else workingDir
+        path = os.path.join(directory, f"{name}.yaml")
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            return None
+        stamp = (path, st.st_mtime_ns, st.st_size)
+        stamps.append(stamp)
+
+        key = (stamps[0], stamp)
+        refs = _refs.get(key)
+        if refs is None:
+            refs = resolver.get_refs(resolver.load(name, directory))
+            if len(_refs) >= _refs_maxsize:
+                _refs.clear()
+            _refs[key] = refs
+        pending += refs
+    return tuple(stamps)
@@ -0,0 +1,541 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+
+"""
+Provides a shared resolver for objects referenced by name
+
+Insert, Bitters, Supras and MSite only store the names of their
+components: the actual object is defined in {workingDir}/{name}.yaml.
+Parsed objects are kept in a bounded LRU cache. An entry is dropped
+as soon as the mtime or the size of its file changes.
+
+Objects returned by the resolver are shared: copy them before
+modifying them in place.
+
+LazyRef may be used in place of a name: it behaves as the name
+(str, yaml, json) and only loads the object on first attribute access.
+A LazyRef loaded from a file reloads it once the file has changed.
+
+load_fields only extracts some top-level fields of a file, without
+building the nested objects (eg. to get r and z of an Helix).
+"""
+
+import os
+import copy
+from collections import OrderedDict
+from threading import Lock
+
+import yaml
+
+from . import yaml_utils
+from . import diskcache
+
+# registers the yaml constructors of all classes (imported on demand)
+from . import deserialize
+
+_lock = Lock()
+_cache: OrderedDict = OrderedDict()  # path -> (stamp, object)
+_fields_cache: OrderedDict = OrderedDict()  # path -> (stamp, {field: value})
+_maxsize: int = 256
+_hits: int = 0
+_misses: int = 0
+
+
+def get_filename(name: str, workingDir: str = ".") -> str:
+    """
+    return the yaml file defining name
+    """
+    return os.path.join(workingDir, f"{name}.yaml")
+
+
+def fingerprint(filename: str) -> tuple:
+    """
+    return the stamp used to validate cache entries
+    """
+    st = os.stat(filename)
+    return (st.st_mtime_ns, st.st_size)
+
+
+def get_directory(name: str, workingDir: str | None = None) -> str:
+    """
+    return the directory where name is looked up
+
+    workingDir defaults to the directory of a LazyRef, "." otherwise
+    """
+    if workingDir is not None:
+        return workingDir
+    if isinstance(name, LazyRef):
+        return name._workingDir
+    return "."
+
+
+def is_own_ref(name: str, workingDir: str | None = None) -> bool:
+    """
+    return True if name is a LazyRef to an object of workingDir
+    """
+    if not isinstance(name, LazyRef):
+        return False
+    if workingDir is None:
+        return True
+    return os.path.abspath(name._workingDir) == os.path.abspath(workingDir)
+
+
+def stamp(name: str, workingDir: str | None = None) -> tuple | None:
+    """
+    return the path and the stamp of the file defining name,
+    None if there is no such file (eg. LazyRef to an object built in memory)
+    """
+    workingDir = get_directory(name, workingDir)
+    path = os.path.abspath(get_filename(name, workingDir))
+    try:
+        return (path, fingerprint(path))
+    except FileNotFoundError:
+        return None
+
+
+def load(name: str, workingDir: str | None = None, debug: bool = False):
+    """
+    return the object defined in {workingDir}/{name}.yaml
+
+    the file is only parsed if it is not already cached
+    or if it has changed since it was cached
+
+    a LazyRef is resolved, unless workingDir is another directory
+    than its own: the object is then loaded from workingDir
+    """
+    global _hits, _misses
+
+    if is_own_ref(name, workingDir):
+        return name.resolve()
+    workingDir = get_directory(name, workingDir)
+
+    path = os.path.abspath(get_filename(name, workingDir))
+    fstamp = fingerprint(path)
+    with _lock:
+        entry = _cache.get(path)
+        if entry is not None and entry[0] == fstamp:
+            _cache.move_to_end(path)
+            _hits += 1
+            return entry[1]
+        _misses += 1
+
+    if debug:
+        print(f"resolver/load: parse {path}", flush=True)
+    (fstamp, obj) = _parse(path)
+    _store(path, fstamp, obj)
+    return obj
+
+
+def _parse(path: str) -> tuple:
+    """
+    parse path, return its stamp and the object it defines
+    """
+    fstamp = fingerprint(path)
+    obj = diskcache.load(path, "yaml", yaml_utils.load)
+    return (fstamp, obj)
+
+
+def _store(path: str, fstamp: tuple, obj) -> None:
+    """
+    add obj to the cache
+    """
+    with _lock:
+        _cache[path] = (fstamp, obj)
+        _cache.move_to_end(path)
+        while len(_cache) > _maxsize:
+            _cache.popitem(last=False)
+
+
+def load_fields(name: str, fields: list[str], workingDir: str | None = None) -> dict:
+    """
+    return the values of some top-level fields of {workingDir}/{name}.yaml
+
+    nested objects are only built for the requested fields,
+    a missing field raises RuntimeError
+    """
+    path = os.path.abspath(get_filename(name, get_directory(name, workingDir)))
+    if is_own_ref(name, workingDir) and name.is_resolved():
+        return _get_fields(name.resolve(), fields, path)
+
+    fstamp = fingerprint(path)
+    with _lock:
+        entry = _cache.get(path)
+        if entry is not None and entry[0] == fstamp:
+            return _get_fields(entry[1], fields, path)
+        entry = _fields_cache.get(path)
+        if entry is not None and entry[0] == fstamp and all(f in entry[1] for f in fields):
+            _fields_cache.move_to_end(path)
+            return {field: entry[1][field] for field in fields}
+
+    values = read_fields(path, fields)
+    for field in fields:
+        if field not in values:
+            raise RuntimeError(f"load_fields: {path} has no field {field}")
+    with _lock:
+        entry = _fields_cache.get(path)
+        if entry is not None and entry[0] == fstamp:
+            entry[1].update(values)
+        else:
+            _fields_cache[path] = (fstamp, dict(values))
+        _fields_cache.move_to_end(path)
+        while len(_fields_cache) > _maxsize:
+            _fields_cache.popitem(last=False)
+    return values
+
+
+def _get_fields(obj, fields: list[str], path: str) -> dict:
+    """
+    return the values of some attributes of obj, defined in path
+    """
+    try:
+        return {field: getattr(obj, field) for field in fields}
+    except AttributeError as error:
+        raise RuntimeError(f"load_fields: {path} has no field {error.name}") from error
+
+
+class _UnknownAlias(Exception):
+    """
+    alias to an anchor defined in a skipped node
+    """
+
+
+def read_fields(filename: str, fields: list[str]) -> dict:
+    """
+    return the values of some top-level fields of a yaml file,
+    missing fields are left out
+
+    the file is read as a stream of events: other fields are skipped
+    without being built, and reading stops once all fields are found.
+    Files where a requested field refers to an anchor defined in a
+    skipped field are fully loaded.
+    """
+    wanted = set(fields)
+    values = {}
+    anchors = {}
+    with open(filename, "rb") as istream:
+        loader = yaml_utils.get_loader()(istream)
+        try:
+            loader.get_event()  # StreamStart
+            loader.get_event()  # DocumentStart
+            if not isinstance(loader.get_event(), yaml.MappingStartEvent):
+                raise RuntimeError(f"read_fields: {filename} does not define an object")
+            while wanted and not loader.check_event(yaml.MappingEndEvent):
+                key = _compose(loader, anchors)
+                if isinstance(key, yaml.ScalarNode) and key.value in wanted:
+                    node = _compose(loader, anchors)
+                    values[key.value] = loader.construct_object(node, deep=True)
+                    wanted.discard(key.value)
+                else:
+                    _skip(loader)
+        except _UnknownAlias:
+            values = None
+        finally:
+            loader.dispose()
+
+    if values is None:
+        with open(filename, "r") as istream:
+            obj = yaml_utils.load(istream)
+        values = {field: getattr(obj, field) for field in fields if hasattr(obj, field)}
+    return values
+
+
+def _compose(loader, anchors: dict):
+    """
+    build the node starting at the current event
+
+    anchors: nodes of the anchors met so far
+    """
+    event = loader.get_event()
+    if isinstance(event, yaml.AliasEvent):
+        if event.anchor not in anchors:
+            raise _UnknownAlias(event.anchor)
+        return anchors[event.anchor]
+    if isinstance(event, yaml.ScalarEvent):
+        tag = event.tag
+        if tag is None or tag == "!":
+            tag = loader.resolve(yaml.ScalarNode, event.value, event.implicit)
+        node = yaml.ScalarNode(tag, event.value, style=event.style)
+        if event.anchor is not None:
+            anchors[event.anchor] = node
+        return node
+    if isinstance(event, yaml.SequenceStartEvent):
+        tag = event.tag
+        if tag is None or tag == "!":
+            tag = loader.resolve(yaml.SequenceNode, None, event.implicit)
+        node = yaml.SequenceNode(tag, [], flow_style=event.flow_style)
+        if event.anchor is not None:
+            anchors[event.anchor] = node
+        while not loader.check_event(yaml.SequenceEndEvent):
+            node.value.append(_compose(loader, anchors))
+        loader.get_event()
+        return node
+    if isinstance(event, yaml.MappingStartEvent):
+        tag = event.tag
+        if tag is None or tag == "!":
+            tag = loader.resolve(yaml.MappingNode, None, event.implicit)
+        node = yaml.MappingNode(tag, [], flow_style=event.flow_style)
+        if event.anchor is not None:
+            anchors[event.anchor] = node
+        while not loader.check_event(yaml.MappingEndEvent):
+            key = _compose(loader, anchors)
+            node.value.append((key, _compose(loader, anchors)))
+        loader.get_event()
+        return node
+    raise RuntimeError(f"read_fields: unsupported yaml event {event}")
+
+
+def _skip(loader) -> None:
+    """
+    skip the node starting at the current event
+    """
+    event = loader.get_event()
+    depth = 0
+    if isinstance(event, (yaml.SequenceStartEvent, yaml.MappingStartEvent)):
+        depth = 1
+    while depth:
+        event = loader.get_event()
+        if isinstance(event, (yaml.SequenceStartEvent, yaml.MappingStartEvent)):
+            depth += 1
+        elif isinstance(event, (yaml.SequenceEndEvent, yaml.MappingEndEvent)):
+            depth -= 1
+
+
+def set_maxsize(maxsize: int) -> None:
+    """
+    set the maximum number of cached objects
+    """
+    global _maxsize
+
+    if maxsize < 0:
+        raise RuntimeError(f"resolver: maxsize must be positive (got {maxsize})")
+    with _lock:
+        _maxsize = maxsize
+        while len(_cache) > _maxsize:
+            _cache.popitem(last=False)
+        while len(_fields_cache) > _maxsize:
+            _fields_cache.popitem(last=False)
+
+
+def clear() -> None:
+    """
+    empty the cache
+    """
+    global _hits, _misses
+
+    with _lock:
+        _cache.clear()
+        _fields_cache.clear()
+        _hits = 0
+        _misses = 0
+
+
+def cache_info() -> dict:
+    """
+    return cache statistics
+    """
+    with _lock:
+        return {
+            "hits": _hits,
+            "misses": _misses,
+            "maxsize": _maxsize,
+            "currsize": len(_cache),
+        }
+
+
+class LazyRef(str):
+    """
+    name of an object stored in {workingDir}/{name}.yaml
+
+    the object is loaded on first access to one of its attributes,
+    then kept
+
+    attributes also defined by str (eg. count, index, format, split)
+    are the str ones: use resolve() to get those of the object
+    """
+
+    def __new__(cls, name: str, workingDir: str = ".", target=None, stamp=None):
+        self = super().__new__(cls, name)
+        self._workingDir = workingDir
+        self._target = target
+        self._stamp = stamp
+        return self
+
+    def __reduce__(self):
+        # a pickled target no longer depends on its file
+        return (LazyRef, (str(self), self._workingDir, self._target))
+
+    def __getattr__(self, attr: str):
+        # only called for attributes neither defined by str nor by LazyRef
+        if attr.startswith("_"):
+            raise AttributeError(attr)
+        return getattr(self.resolve(), attr)
+
+    def resolve(self):
+        """
+        return the referenced object, load it if needed
+
+        a target loaded from a file is reloaded once the file has changed,
+        a target given without stamp is kept as is
+        """
+        if self._target is not None and self._stamp is not None:
+            if stamp(str(self), self._workingDir) != self._stamp:
+                self._target = None
+        if self._target is None:
+            self._stamp = stamp(str(self), self._workingDir)
+            self._target = load(str(self), self._workingDir)
+        return self._target
+
+    def is_resolved(self) -> bool:
+        """
+        return True if the referenced object is already loaded
+        and its file, if any, is unchanged
+        """
+        if self._target is None:
+            return False
+        return self._stamp is None or stamp(str(self), self._workingDir) == self._stamp
+
+
+def lazy_list(names: list | None, workingDir: str = ".") -> list | None:
+    """
+    return names as a list of LazyRef
+    """
+    if names is None:
+        return None
+    return [
+        name if isinstance(name, LazyRef) else LazyRef(name, workingDir)
+        for name in names
+    ]
+
+
+def get_refs(obj) -> list[str]:
+    """
+    return the names of the objects directly referenced by obj
+
+    MSite, Bitters, Supras: magnets (str, list or dict)
+    Insert: Helices, Rings and CurrentLeads
+    """
+    refs = []
+    for attr in ["magnets", "Helices", "Rings", "CurrentLeads"]:
+        refs += _get_names(getattr(obj, attr, None))
+    return refs
+
+
+def _get_names(value) -> list[str]:
+    if isinstance(value, str):
+        return [str(value)]
+    if isinstance(value, list):
+        return [name for item in value for name in _get_names(item)]
+    if isinstance(value, dict):
+        return [name for item in value.values() for name in _get_names(item)]
+    return []
+
+
+def _link(value, objects: dict, stamps: dict, workingDir: str):
+    """
+    replace names by resolved LazyRef
+    """
+    if isinstance(value, str):
+        if isinstance(value, LazyRef) and value.is_resolved():
+            return value
+        name = str(value)
+        return LazyRef(name, workingDir, objects[name], stamps[name])
+    if isinstance(value, list):
+        return [_link(item, objects, stamps, workingDir) for item in value]
+    if isinstance(value, dict):
+        return {key: _link(item, objects, stamps, workingDir) for key, item in value.items()}
+    return value
+
+
+def _copy(obj):
+    """
+    return a shallow copy of obj, without its memoized values
+    """
+    obj = copy.copy(obj)
+    obj.__dict__.pop("_memo", None)
+    return obj
+
+
+def load_tree(
+    site,
+    workers: int | None = None,
+    workingDir: str = ".",
+    processes: bool = False,
+    debug: bool = False,
+):
+    """
+    load site and all the objects it references, directly or not
+
+    site: object or name of the object
+    workers: number of threads (or processes) used to parse files
+    processes: parse files in a process pool instead of a thread pool
+
+    files referenced at the same depth are parsed concurrently
+
+    return a copy of site where names are replaced by resolved LazyRef:
+    site and cached objects are left unchanged
+    """
+    from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+
+    if isinstance(site, str):
+        site = load(site, workingDir)
+
+    objects = {}
+    stamps = {}
+    pending = [site]
+    Executor = ProcessPoolExecutor if processes else ThreadPoolExecutor
+    with Executor(max_workers=workers) as executor:
+        while pending:
+            names = []
+            for obj in pending:
+                for name in get_refs(obj):
+                    if name not in objects and name not in names:
+                        names.append(name)
+            if debug:
+                print(f"resolver/load_tree: load {names}", flush=True)
+
+            if processes:
+                paths = [os.path.abspath(get_filename(name, workingDir)) for name in names]
+                results = executor.map(_parse, paths)
+                for name, path, (fstamp, obj) in zip(names, paths, results):
+                    _store(path, fstamp, obj)
+                    objects[name] = obj
+                    stamps[name] = (path, fstamp)
+            else:
+                results = executor.map(lambda name: _load_stamped(name, workingDir), names)
+                for name, (fstamp, obj) in zip(names, results):
+                    objects[name] = obj
+                    stamps[name] = fstamp
+
+            pending = [objects[name] for name in names]
+
+    # link copies of the objects referencing others
+    site = _copy(site)
+    nodes = [site]
+    for name, obj in objects.items():
+        if get_refs(obj):
+            objects[name] = _copy(obj)
+            nodes.append(objects[name])
+    for obj in nodes:
+        for attr in ["magnets", "Helices", "Rings", "CurrentLeads"]:
+            value = getattr(obj, attr, None)
+            if value is not None:
+                setattr(obj, attr, _link(value, objects, stamps, workingDir))
+    return site
+
+
+def _load_stamped(name: str, workingDir: str) -> tuple:
+    """
+    return the stamp of the file defining name and the object it defines
+    """
+    fstamp = stamp(name, workingDir)
+    return (fstamp, load(name, workingDir))
+
+
+def LazyRef_representer(dumper, data):
+    """
+    dump a LazyRef as its name
+    """
+    return dumper.represent_str(str(data))
+
+
+yaml_utils.add_representer(LazyRef, LazyRef_representer)
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+
+"""
+Provides a binary snapshot of a fully resolved object
+
+A snapshot stores an object (typically MSite or Insert) together with
+every object it references (helices, rings, leads, ModelAxi, Shape2D, ...),
+so it can be reloaded without opening nor parsing any yaml/json file.
+
+Layout:
+
+* header: magic (8 bytes), format version (uint16),
+  length of library version (uint16), library version (utf-8)
+* payload: pickle of the resolved object
+
+Snapshots are only meant to be read by the library version that wrote them.
+As any pickle, only load snapshots you trust.
+"""
+
+import pickle
+import struct
+
+from . import __version__
+
+MAGIC = b"MGEOSNAP"
+FORMAT_VERSION = 1
+_header = struct.Struct("<8sHH")
+
+
+def dump(obj, filename: str, workingDir: str = ".", workers: int | None = None):
+    """
+    resolve obj and save it to filename
+
+    obj is left unchanged: a resolved copy is saved (see resolver.load_tree)
+    """
+    from .resolver import load_tree
+
+    obj = load_tree(obj, workers=workers, workingDir=workingDir)
+    version = __version__.encode("utf-8")
+    with open(filename, "wb") as ostream:
+        ostream.write(_header.pack(MAGIC, FORMAT_VERSION, len(version)))
+        ostream.write(version)
+        pickle.dump(obj, ostream, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def load(filename: str):
+    """
+    load an object from a snapshot
+    """
+    with open(filename, "rb") as istream:
+        data = istream.read()
+
+    if len(data) < _header.size:
+        raise RuntimeError(f"snapshot: {filename} is not a snapshot")
+    (magic, format_version, length) = _header.unpack_from(data)
+    if magic != MAGIC:
+        raise RuntimeError(f"snapshot: {filename} is not a snapshot")
+    if format_version != FORMAT_VERSION:
+        raise RuntimeError(
+            f"snapshot: {filename} unsupported format version {format_version} (expected {FORMAT_VERSION})"
+        )
+    offset = _header.size + length
+    version = data[_header.size : offset].decode("utf-8")
+    if version != __version__:
+        raise RuntimeError(
+            f"snapshot: {filename} was written by python_magnetgeo {version} (current {__version__}), regenerate it"
+        )
+    return pickle.loads(memoryview(data)[offset:])
@@ -1,4 +1,8 @@
+import os
+
 import yaml
+from . import yaml_utils
+from . import diskcache
 import json
 
 from .Shape2D import Shape2D
@@ -17,8 +21,9 @@ class Tierod(yaml.YAMLObject):
         if isinstance(shape, Shape2D):
             self.shape = shape
         else:
+            diskcache.add_dependency(os.path.abspath(f"{shape}.yaml"))
             with open(f"{shape}.yaml", "r") as f:
-                self.shape = yaml.load(f, Loader=yaml.FullLoader)
+                self.shape = yaml_utils.load(f)
 
     def __repr__(self):
         return "%s(r=%r, n=%r, dh=%r, sh=%r, shape=%r)" % (
@@ -36,7 +41,7 @@ class Tierod(yaml.YAMLObject):
         """
         try:
             with open(f"{name}.yaml", "w") as ostream:
-                yaml.dump(self, stream=ostream)
+                yaml_utils.dump(self, stream=ostream)
         except:
             raise Exception("Failed to Tierod dump")
 
@@ -47,7 +52,7 @@ class Tierod(yaml.YAMLObject):
         data = None
         try:
             with open(f"{name}.yaml", "r") as istream:
-                data = yaml.load(stream=istream, Loader=yaml.FullLoader)
+                data = yaml_utils.load(istream)
         except:
             raise Exception(f"Failed to load Bitter data {name}.yaml")
 
@@ -59,7 +64,7 @@ class Tierod(yaml.YAMLObject):
             self.shape = data.shape
         else:
             with open(f"{data.shape}.yaml", "r") as f:
-                self.shape = yaml.load(f, Loader=yaml.FullLoader)
+                self.shape = yaml_utils.load(f)
 
     def to_json(self):
         """
@@ -80,8 +85,7 @@ class Tierod(yaml.YAMLObject):
 
         if debug:
             print(f'Tierod.from_json: filename={filename}')
-        with open(filename, "r") as istream:
-            return json.loads(istream.read(), object_hook=deserialize.unserialize_object)
+        return deserialize.load_json(filename)
 
 
 def Tierod_constructor(loader, node):
@@ -97,4 +101,5 @@ def Tierod_constructor(loader, node):
     return Tierod(r, n, dh, sh, shape)
 
 
-yaml.add_constructor("!<Tierod>", Tierod_constructor)
+yaml_utils.add_constructor("!<Tierod>", Tierod_constructor)
+yaml_utils.register(Tierod)
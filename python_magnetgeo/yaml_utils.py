@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+
+"""
+Provides the yaml loader and dumper used by python_magnetgeo
+
+Use libyaml bindings (CFullLoader, CDumper) when PyYAML has been built with them,
+otherwise fall back to the pure python FullLoader and Dumper.
+
+Constructors and representers are registered on every loader/dumper variant,
+so files are read and written the same way whichever is selected.
+"""
+
+import yaml
+
+try:
+    from yaml import CFullLoader as FullLoader
+    from yaml import CDumper as Dumper
+
+    with_libyaml = True
+except ImportError:
+    from yaml import FullLoader
+    from yaml import Dumper
+
+    with_libyaml = False
+
+Loaders = [yaml.Loader, yaml.FullLoader, yaml.UnsafeLoader]
+Dumpers = [yaml.Dumper]
+if with_libyaml:
+    Loaders += [yaml.CLoader, yaml.CFullLoader, yaml.CUnsafeLoader]
+    Dumpers += [yaml.CDumper]
+
+
+def get_loader() -> type:
+    """
+    return the loader class to use
+    """
+    return FullLoader
+
+
+def get_dumper() -> type:
+    """
+    return the dumper class to use
+    """
+    return Dumper
+
+
+def add_constructor(tag: str, constructor) -> None:
+    """
+    register constructor for tag on every loader
+    """
+    for loader in Loaders:
+        loader.add_constructor(tag, constructor)
+
+
+def add_multi_constructor(tag_prefix: str, constructor) -> None:
+    """
+    register constructor for all tags starting with tag_prefix on every loader
+    """
+    for loader in Loaders:
+        loader.add_multi_constructor(tag_prefix, constructor)
+
+
+def add_representer(data_type: type, representer) -> None:
+    """
+    register representer for data_type on every dumper
+    """
+    for dumper in Dumpers:
+        dumper.add_representer(data_type, representer)
+
+
+def register(cls: type) -> None:
+    """
+    register a yaml.YAMLObject class on every loader and dumper
+
+    yaml.YAMLObject only registers itself on the pure python variants
+    """
+    add_constructor(cls.yaml_tag, cls.from_yaml)
+    add_representer(cls, cls.to_yaml)
+
+
+def load(stream):
+    """
+    load a python_magnetgeo object from stream
+    """
+    return yaml.load(stream, Loader=FullLoader)
+
+
+def dump(data, stream=None):
+    """
+    dump a python_magnetgeo object to stream
+    """
+    return yaml.dump(data, stream=stream, Dumper=Dumper)
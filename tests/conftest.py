@@ -0,0 +1,33 @@
+import pytest
+
+from python_magnetgeo.Helix import Helix
+from python_magnetgeo.ModelAxi import ModelAxi
+from python_magnetgeo.Model3D import Model3D
+from python_magnetgeo.Shape import Shape
+from python_magnetgeo.Ring import Ring
+from python_magnetgeo.Insert import Insert
+
+
+@pytest.fixture
+def make_insert():
+    """
+    return a function dumping 3 helices and 2 rings in the current directory
+    and returning the Insert made of them
+    """
+
+    def make() -> Insert:
+        helices = []
+        for i in range(3):
+            r0 = 20 + 10 * i
+            axi = ModelAxi(f"axi{i}", 80.0, [1.0, 2.0, 2.0, 1.0], [20.0, 10.0, 10.0, 20.0])
+            helix = Helix(f"H{i+1}", [r0, r0 + 5], [-100.0, 100.0], 0.2, i % 2 == 0, True, axi, Model3D(cad="test"), Shape("", ""))
+            helix.dump()
+            helices.append(helix.name)
+        rings = []
+        for i in range(2):
+            ring = Ring(f"R{i+1}", [25 + 10 * i, 30 + 10 * i, 30 + 10 * i, 35 + 10 * i], [0, 20])
+            ring.dump()
+            rings.append(ring.name)
+        return Insert("Insert", helices, rings, [], [], [], 18.0, 60.0)
+
+    return make
@@ -32,3 +32,18 @@ def test_jsonhelix():
     # load from json
     jsondata = Helix.from_json('Helix.json')
     assert jsondata.name == "Helix" and jsondata.r[0] == 19.3
+
+
+def test_locate():
+    from math import pi
+
+    # cut at theta=0: z = -10, -8, -6 (pitch 2) then -2, 2, 6, 10 (pitch 4)
+    axi = ModelAxi("axi", 10, [2, 4], [2, 4])
+    helix = Helix("Helix", [10, 20], [-15, 15], 0.2, True, False, axi, Model3D(cad="test"), Shape("", ""))
+
+    (in_copper, in_cut, turn) = helix.locate(
+        [15, 15, 15, 15, 15, 25], [0, 0, 0, pi / 2, -pi / 2, 0], [-8.05, -7, 6, -9.5, -9.5, 0]
+    )
+    assert in_cut.tolist() == [True, False, True, True, False, False]
+    assert in_copper.tolist() == [False, True, False, False, True, False]
+    assert turn.tolist()[:3] == [1, 2, 5]
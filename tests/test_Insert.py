@@ -0,0 +1,27 @@
+import os
+
+from python_magnetgeo.Ring import Ring
+
+
+def test_get_params(tmp_path, monkeypatch, make_insert):
+    monkeypatch.chdir(tmp_path)
+    insert = make_insert()
+
+    (NHelices, NRings, NChannels, Nsections, R1, R2, Dh, Sh, Zc) = insert.get_params()
+    assert (NHelices, NRings, NChannels) == (3, 2, 4)
+    assert Nsections.tolist() == [4, 4, 4]
+    assert Dh.tolist() == [4, 10, 10, 30]
+    assert Zc[0].tolist() == [-100, -80, -60, -20, 0, 100, 120]
+    assert Zc[-1].tolist() == [-120, -100, -80, -60, -20, 0, 100]
+
+    # cached result is copied
+    Zc[0][0] = 0
+    params = insert.get_params()
+    assert params.Zc[0][0] == -100
+
+    # a change of the ring files is taken into account
+    ring = Ring("R1", [25, 30, 30, 35], [0, 30])
+    ring.dump()
+    stamp = os.stat("R1.yaml")
+    os.utime("R1.yaml", ns=(stamp.st_atime_ns, stamp.st_mtime_ns + 1000))
+    assert insert.get_params().Zc[0][-1] == 130
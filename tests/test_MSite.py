@@ -0,0 +1,71 @@
+import os
+
+from python_magnetgeo.Bitter import Bitter
+from python_magnetgeo.Bitters import Bitters
+from python_magnetgeo.ModelAxi import ModelAxi
+from python_magnetgeo.coolingslit import CoolingSlit
+from python_magnetgeo.tierod import Tierod
+from python_magnetgeo.Shape2D import Shape2D
+from python_magnetgeo.MSite import MSite
+from python_magnetgeo import resolver
+
+
+def test_get_params(tmp_path, monkeypatch, make_insert):
+    monkeypatch.chdir(tmp_path)
+    insert = make_insert()
+    insert.dump()
+
+    square = Shape2D("square", [[0, 0], [1, 0], [1, 1], [0, 1]])
+    slit = CoolingSlit(80, 5, 20, 0.1, 0.2, square)
+    bitter = Bitter(
+        "B1", [70, 90], [-50, 50], True, ModelAxi("axi", 40, [4], [20]),
+        [slit], Tierod(2, 20, 4, 1, square), 65, 95,
+    )
+    bitter.dump()
+    Bitters("M8", ["B1"], 65, 95).dump()
+
+    site = MSite("Site", {"insert": "Insert", "bitters": "M8"}, None, None, None, None)
+    params = site.get_params(workers=2)
+    assert params.magnet == ["insert"] * 4 + ["B1"] * 3
+    assert params.channel[-3:] == ["B1_Slit0", "B1_Slit1", "B1_Slit2"]
+    assert params.Dh.tolist() == [4, 10, 10, 30, 10, 0.1, 10]
+    assert params.filling_factor[:4].tolist() == [1] * 4
+    assert params.Zc[-1].tolist() == [-50, -40, 40, 50]
+
+    # the site and the cached objects are left unchanged
+    assert site.magnets == {"insert": "Insert", "bitters": "M8"}
+    assert type(site.magnets["insert"]) is str
+    assert type(resolver.load("Insert").Helices[0]) is str
+
+    # magnets given as a list
+    site = MSite("Site", ["Insert", "M8"], None, None, None, None)
+    assert [name for name, _ in site.get_magnets()] == ["Insert", "B1"]
+    assert site.get_params().Dh.tolist() == params.Dh.tolist()
+
+    # parts are named after the loaded objects, not their files
+    os.rename("B1.yaml", "bitter1.yaml")
+    site = MSite("Site", {"insert": "Insert", "bitters": ["bitter1"]}, None, None, None, None)
+    assert [name for name, _ in site.get_magnets()] == ["insert", "bitters_B1"]
+    params = site.get_params()
+    assert params.channel[-3:] == ["bitters_B1_Slit0", "bitters_B1_Slit1", "bitters_B1_Slit2"]
+
+    # every slit gets its own Zc array
+    params.Zc[-1][0] = 0
+    assert params.Zc[-2].tolist() == [-50, -40, 40, 50]
+
+
+def test_boundingBox(tmp_path, monkeypatch, make_insert):
+    monkeypatch.chdir(tmp_path)
+    make_insert().dump()
+    square = Shape2D("square", [[0, 0], [1, 0], [1, 1], [0, 1]])
+    bitter = Bitter(
+        "B1", [70, 90], [-50, 50], True, ModelAxi("axi", 40, [4], [20]),
+        [CoolingSlit(80, 5, 20, 0.1, 0.2, square)], Tierod(2, 20, 4, 1, square), 65, 95,
+    )
+    bitter.dump()
+
+    resolver.clear()
+    site = MSite("Site", {"insert": "Insert", "bitters": ["B1"]}, None, None, None, None)
+    assert site.boundingBox() == ([20, 90], [-120.0, 120.0])
+    # Bitter B1 is not built
+    assert resolver.cache_info()["currsize"] == 1
@@ -0,0 +1,47 @@
+import numpy as np
+
+from python_magnetgeo.ModelAxi import ModelAxi
+from python_magnetgeo import axi_utils
+
+
+def test_sweep():
+    turns = [[1, 1, 2], [1, 2, 1], [1, 1, -1]]
+    pitch = [[5, 5, 5], [5, 5, 10], [5, 5, 5]]
+    result = axi_utils.sweep(turns, pitch, 10, z=[-12, 12], nturns=4)
+
+    assert result.height.tolist() == [20, 25, 5]
+    assert result.nturns.tolist() == [4, 4, 1]
+    assert result.nsections.tolist() == [
+        len(ModelAxi("axi", 10, t, p).compact()[0]) for t, p in zip(turns, pitch)
+    ]
+    assert result.violations.tolist() == [
+        0,
+        axi_utils.BAD_HEIGHT | axi_utils.BAD_Z,
+        axi_utils.BAD_VALUES | axi_utils.BAD_HEIGHT | axi_utils.BAD_NTURNS,
+    ]
+    assert result.valid.tolist() == [True, False, False]
+
+
+def test_solve():
+    density = [[0.1] * 4 + [0.05] * 4, [1 / 12] * 8, [0.09] * 8]
+    result = axi_utils.solve(density, 40, [10, 12, 20])
+    assert result.pitch[0].tolist() == [10] * 4 + [20] * 4
+    assert result.pitch[1].tolist() == [12] * 8
+    assert np.allclose((result.turns * result.pitch).sum(axis=1), 80)
+    # the cumulative error stays below one bin at the closest pitch
+    assert np.all(np.abs(result.error) <= 10 * (1 / 10 - 1 / 12))
+
+    axi = axi_utils.to_modelaxi("axi", 40, result.turns[0], result.pitch[0])
+    assert axi.turns.tolist() == [4, 2] and axi.pitch.tolist() == [10, 20]
+
+
+def test_unique():
+    data = [3.0, 1.0, 3.0 + 5e-7, 2.0, 1.0 - 8e-7, 1.0 - 1.6e-6, 2.0]
+    result = axi_utils.unique(data)
+    assert result.values.tolist() == [3.0, 1.0, 2.0]
+    assert result.index.tolist() == [0, 1, 3]
+    assert result.inverse.tolist() == [0, 1, 0, 2, 1, 1, 2]
+
+    # sorted data
+    result = axi_utils.unique(sorted(data))
+    assert result.values.tolist() == [1.0 - 1.6e-6, 2.0, 3.0]
@@ -0,0 +1,162 @@
+import io
+import os
+
+from python_magnetgeo.Shape import Shape
+from python_magnetgeo.ModelAxi import ModelAxi
+from python_magnetgeo.Model3D import Model3D
+from python_magnetgeo.Helix import Helix
+from python_magnetgeo import cut_utils
+
+
+def get_helix(odd: bool = True) -> Helix:
+    axi = ModelAxi("axi", 10, [2, 4], [2, 4])
+    return Helix("H", [10, 20], [-15, 15], 0.2, odd, False, axi, Model3D(cad="test"), Shape("", ""))
+
+
+def test_salome(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    helix = get_helix()
+    cut_utils.create_cut(helix, "SALOME", "H")
+    with open("H_cut_salome.dat", "r") as istream:
+        lines = istream.read().splitlines()
+    assert lines[1] == "  0.00000000\t       0\t 10.00000000"
+    assert lines[-1] == "-37.69911184\t       0\t-10.00000000"
+
+    buffer = io.BytesIO()
+    cut_utils.write_cut(helix, "salome", buffer)
+    assert buffer.getvalue().decode() == "\n".join(lines) + "\n"
+
+
+class Writer:
+    """
+    text stream which is not an io.TextIOBase
+    """
+
+    def __init__(self, mode=None):
+        self.mode = mode
+        self.chunks = []
+
+    def write(self, data):
+        if not isinstance(data, str):
+            raise TypeError("str expected")
+        self.chunks.append(data)
+
+
+def test_write_data():
+    for stream in [Writer(), Writer("w")]:
+        cut_utils.write_data(stream, "cut")
+        assert stream.chunks == ["cut"]
+
+    stream = Writer("wb")
+    stream.write = stream.chunks.append
+    cut_utils.write_data(stream, "cut")
+    assert stream.chunks == [b"cut"]
+
+
+def test_lncmi():
+    text = io.StringIO()
+    cut_utils.write_cut(get_helix(False), "lncmi", text, "H_lncmi.iso")
+    lines = text.getvalue().splitlines()
+    assert lines[0] == "%decoupe double helice H_lncmi.iso droite"
+    assert lines[-5:-3] == [
+        "N1\tX    4000.0000\tW     -720.000",
+        "N2G01\tX   20000.0000\tW    -2160.000",
+    ]
+    assert lines[-3:] == ["M50", "M29", "M30%"]
+
+
+def test_compact():
+    helix = get_helix()
+    helix.modelaxi = ModelAxi("axi", 10, [1, 1, 2, 2, 2], [2, 2, 4, 4, 4])
+    full = io.StringIO()
+    cut_utils.write_cut(helix, "salome", full)
+    compact = io.StringIO()
+    ratio = cut_utils.write_cut(helix, "salome", compact, compact=True)
+
+    lines = full.getvalue().splitlines()
+    assert compact.getvalue().splitlines() == lines[:2] + [lines[3], lines[6]]
+    assert ratio == 2.5
+
+    text = io.StringIO()
+    cut_utils.write_cut(helix, "lncmi", text, compact=True)
+    assert text.getvalue().splitlines()[-5:-3] == [
+        "N1\tX    4000.0000\tW     -720.000",
+        "N2G01\tX   28000.0000\tW    -2880.000",
+    ]
+
+
+def test_generate_cuts(tmp_path, monkeypatch):
+    from python_magnetgeo.Insert import Insert
+
+    monkeypatch.chdir(tmp_path)
+    for name, odd in [("H1", True), ("H2", False)]:
+        helix = get_helix(odd)
+        helix.name = name
+        helix.dump()
+    insert = Insert("Insert", ["H1", "H2"], [], [], [], [], 5, 25)
+
+    manifest = insert.generate_cuts(["SALOME", "LNCMI"], workers=2)
+    assert [(m["name"], m["format"]) for m in manifest] == [
+        ("H1", "SALOME"), ("H1", "LNCMI"), ("H2", "SALOME"), ("H2", "LNCMI"),
+    ]
+    for m in manifest:
+        assert m["status"] == "written"
+        with open(m["filename"], "rb") as istream:
+            assert len(istream.read()) == m["size"]
+
+    # files are overwritten
+    assert insert.generate_cuts("SALOME", workers=1)[0]["size"] == manifest[0]["size"]
+
+    # cuts of helices with shapes are not written without their shapes
+    helix = get_helix()
+    helix.name = "H2"
+    helix.model3d.with_shapes = True
+    helix.shape = Shape("shape", "profile", length=[18], angle=[90])
+    helix.dump()
+    os.remove("H2_cut_salome.dat")
+    manifest = insert.generate_cuts("SALOME", workers=1)
+    assert [m["status"] for m in manifest] == ["written", "unsupported"]
+    assert manifest[1]["filename"] is None and not os.path.exists("H2_cut_salome.dat")
+
+
+def test_add_shape(tmp_path, monkeypatch):
+    import subprocess
+
+    # by default shapes are added by add_shape, from the lncmi cut
+    commands = []
+    monkeypatch.setattr(subprocess, "run", lambda cmd, **kwargs: commands.append(cmd))
+    monkeypatch.chdir(tmp_path)
+    helix = get_helix()
+    helix.model3d.with_shapes = True
+    helix.shape = Shape("shape", "profile", length=[18], angle=[90], onturns=0, position="ALTERNATE")
+    helix.generate_cut("SALOME")
+    with open("H_lncmi.iso", "r") as istream:
+        assert "N2G01" in istream.read()
+    assert len(commands) == 1
+    assert commands[0].startswith("add_shape ") and "--format=SALOME" in commands[0]
+
+
+def test_read(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    helix = get_helix()
+    helix.modelaxi = ModelAxi("axi", 10, [1, 1, 2, 2, 2], [2, 2, 4, 4, 4])
+    cut_utils.create_cut(helix, "SALOME", "H")
+    (theta, shape_id, z) = cut_utils.read_salome_cut("H_cut_salome.dat")
+    assert (shape_id == 0).all()
+    assert z.tolist() == [10, 8, 6, -2, -10, -18]
+    (dtheta, dz) = cut_utils.compare_cut(helix.modelaxi, "H_cut_salome.dat")
+    assert dtheta < 1.0e-8 and dz == 0
+
+    text = io.StringIO()
+    cut_utils.write_cut(helix, "lncmi", text, "H_lncmi.iso", compact=True)
+    text.seek(0)
+    (X, W) = cut_utils.read_lncmi_cut(text)
+    assert X.tolist() == [0, 4000, 28000]
+    assert W.tolist() == [0, -720, -2880]
+    text.seek(0)
+    assert cut_utils.compare_cut(helix.modelaxi, text, "lncmi") == (0, 0)
+
+    helix.modelaxi.turns = [1, 1, 2, 2, 2.5]
+    text.seek(0)
+    (dW, dX) = cut_utils.compare_cut(helix.modelaxi, text, "lncmi")
+    assert (round(dW, 6), dX) == (180, 2000)
@@ -0,0 +1,56 @@
+import pytest
+from python_magnetgeo.Ring import Ring
+from python_magnetgeo.Insert import Insert
+from python_magnetgeo import deserialize
+
+
+def test_fields():
+    ring = deserialize.loads(Ring("Ring", [19.3, 24.2, 25.1, 30.7], [0, 20], BPside=False).to_json())
+    assert isinstance(ring, Ring) and ring.BPside is False and ring.r[0] == 19.3
+
+    insert = Insert("Insert", ["H1", "H2"], ["R1"], None, [], [], 18.54, 186.25)
+    insert = deserialize.loads(insert.to_json())
+    assert insert.Helices == ["H1", "H2"] and insert.get_nhelices() == 2
+
+
+def test_required():
+    with pytest.raises(RuntimeError):
+        deserialize.loads('{"__classname__": "Ring", "name": "Ring", "r": [1, 2]}')
+
+
+def run(code: str) -> str:
+    import sys
+    import subprocess
+
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+    return result.stdout
+
+
+def test_lazy_import():
+    import json
+
+    # only the modules of the classes actually loaded are imported
+    code = """
+import sys
+import json
+from python_magnetgeo import deserialize
+before = sorted(m for m in sys.modules if m.startswith("python_magnetgeo."))
+ring = deserialize.loads('{"__classname__": "Ring", "name": "R", "r": [1, 2, 3, 4], "z": [0, 1]}')
+after = sorted(m for m in sys.modules if m.startswith("python_magnetgeo."))
+print(json.dumps([type(ring).__name__, "pandas" in sys.modules, before, after]))
+"""
+    (clsname, pandas, before, after) = json.loads(run(code))
+    assert clsname == "Ring" and pandas is False
+    assert "python_magnetgeo.Helix" not in before and "python_magnetgeo.Insert" not in after
+    assert "python_magnetgeo.Ring" not in before and "python_magnetgeo.Ring" in after
+
+
+def test_lazy_yaml(tmp_path):
+    (tmp_path / "R.yaml").write_text("!<Ring>\nname: R\nr: [1, 2, 3, 4]\nz: [0, 1]\n")
+    code = f"""
+from python_magnetgeo import resolver
+print(type(resolver.load("R", {str(tmp_path)!r})).__name__)
+"""
+    assert run(code).strip() == "Ring"
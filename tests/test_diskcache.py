@@ -0,0 +1,80 @@
+import os
+
+import yaml
+import pytest
+from python_magnetgeo.Ring import Ring
+from python_magnetgeo import resolver
+from python_magnetgeo import diskcache
+from python_magnetgeo import yaml_utils
+
+
+@pytest.fixture
+def cachedir(tmp_path):
+    diskcache.enable(str(tmp_path / "cache"))
+    yield tmp_path / "cache"
+    diskcache.disable()
+
+
+def test_yaml(tmp_path, cachedir, monkeypatch):
+    resolver.clear()
+    ring = Ring("Ring", [19.3, 24.2, 25.1, 30.7], [0, 20])
+    with open(tmp_path / "Ring.yaml", "w") as ostream:
+        yaml.dump(ring, stream=ostream)
+    resolver.load("Ring", str(tmp_path))
+    assert len(os.listdir(cachedir)) == 1
+
+    # a new process would find the parsed object in the cache
+    resolver.clear()
+
+    def parse(data):
+        raise RuntimeError("unexpected parse")
+
+    monkeypatch.setattr(yaml_utils, "load", parse)
+    ring = resolver.load("Ring", str(tmp_path))
+    assert ring.r == [19.3, 24.2, 25.1, 30.7]
+
+
+def test_json(tmp_path, cachedir, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    ring = Ring("Ring", [19.3, 24.2, 25.1, 30.7], [0, 20])
+    ring.write_to_json()
+    first = Ring.from_json("Ring.json")
+    second = Ring.from_json("Ring.json")
+    assert first.r == second.r and len(os.listdir(cachedir)) == 1
+
+    # any change of the content gives a new entry
+    ring.r[0] = 19.5
+    ring.write_to_json()
+    assert Ring.from_json("Ring.json").r[0] == 19.5
+    assert len(os.listdir(cachedir)) == 2
+
+
+def test_dependencies(tmp_path, cachedir, monkeypatch):
+    from python_magnetgeo.Shape2D import Shape2D
+    from python_magnetgeo.tierod import Tierod
+
+    parsed = []
+
+    def parse(data):
+        # Tierod reads the yaml file defining its shape
+        parsed.append(data)
+        return Tierod(2, 20, 1, 1, data.decode("utf-8"))
+
+    monkeypatch.chdir(tmp_path)
+    with open("tierod.txt", "w") as ostream:
+        ostream.write("Square")
+    Shape2D("Square", [[0, 0], [1, 0], [1, 1], [0, 1]]).dump("Square")
+    assert len(diskcache.load("tierod.txt", "tierod", parse).shape.pts) == 4
+    assert len(diskcache.load("tierod.txt", "tierod", parse).shape.pts) == 4
+    assert len(parsed) == 1
+
+    # the entry is dropped once the shape has changed
+    Shape2D("Square", [[0, 0], [1, 0], [1, 1]]).dump("Square")
+    assert len(diskcache.load("tierod.txt", "tierod", parse).shape.pts) == 3
+    assert len(os.listdir(cachedir)) == 1 and len(parsed) == 2
+
+    # the shape is checked where it was read, not in the current directory
+    (tmp_path / "other").mkdir()
+    monkeypatch.chdir(tmp_path / "other")
+    assert len(diskcache.load("../tierod.txt", "tierod", parse).shape.pts) == 3
+    assert len(parsed) == 2
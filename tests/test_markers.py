@@ -0,0 +1,91 @@
+from types import MappingProxyType
+
+from python_magnetgeo.Ring import Ring
+from python_magnetgeo.MSite import MSite
+from python_magnetgeo.Bitter import Bitter
+from python_magnetgeo.Bitters import Bitters
+from python_magnetgeo.ModelAxi import ModelAxi
+from python_magnetgeo.coolingslit import CoolingSlit
+from python_magnetgeo.tierod import Tierod
+from python_magnetgeo.Shape2D import Shape2D
+
+
+def test_memo(tmp_path, monkeypatch, make_insert):
+    monkeypatch.chdir(tmp_path)
+    insert = make_insert()
+    insert.dump()
+
+    names = insert.get_names("M", True)
+    assert names == insert._get_names("M", True)
+    names.append("other")
+    assert insert.get_names("M", True) == insert._get_names("M", True)
+    assert "_memo" in insert.__dict__ and "_memo" not in insert.to_json()
+
+    channels = insert.get_channels("M")
+    channels[0].append("other")
+    assert insert.get_channels("M") == insert._get_channels("M")
+
+    # a change of the files is taken into account
+    Ring("R3", [45, 50, 50, 55], [0, 20]).dump()
+    insert.Rings.append("R3")
+    assert insert.get_names("M", True)[-1] == "M_R3"
+
+
+def test_marker_index(tmp_path, monkeypatch, make_insert):
+    monkeypatch.chdir(tmp_path)
+    insert = make_insert()
+    insert.dump()
+    site = MSite("Site", {"insert": "Insert"}, None, None, None, None)
+
+    for is2D in [False, True]:
+        index = site.get_marker_index("", is2D)
+        assert list(index) == site.get_names("", is2D)
+
+    marker = site.get_marker_index("", True)["insert_H3_Cu2"]
+    assert (marker.magnet, marker.kind, marker.index, marker.component, marker.section) == (
+        "insert", "Helix", 3, "H3", 2,
+    )
+    assert site.get_marker_index("", False)["insert_R2"].kind == "Ring"
+
+
+def test_bitters(tmp_path, monkeypatch, capsys):
+    monkeypatch.chdir(tmp_path)
+    square = Shape2D("square", [[0, 0], [1, 0], [1, 1], [0, 1]])
+    bitter = Bitter(
+        "B1", [70, 90], [-50, 50], True, ModelAxi("axi", 40, [4], [20]),
+        [CoolingSlit(80, 5, 20, 0.1, 0.2, square)], Tierod(2, 20, 4, 1, square), 65, 95,
+    )
+    bitter.dump()
+    bitters = Bitters("M8", ["B1"], 65, 95)
+
+    index = bitters.get_marker_index("M8", True)
+    assert isinstance(index, MappingProxyType)
+    assert dict(index) == dict(bitter.get_marker_index("B1", True))
+    # memoized: the Bitter magnets are not loaded again
+    monkeypatch.setattr("python_magnetgeo.resolver.load", None)
+    assert bitters.get_marker_index("M8", True) == index
+    monkeypatch.undo()
+    monkeypatch.chdir(tmp_path)
+    assert "_memo" in bitters.__dict__ and "_memo" not in bitters.to_json()
+
+    # channels only print in debug mode
+    capsys.readouterr()
+    assert bitter.get_channels("B1") == ["B1_Slit0", "B1_Slit1", "B1_Slit2"]
+    assert capsys.readouterr().out == ""
+    assert bitter.get_channels("B1", debug=True) == bitter.get_channels("B1")
+    assert "CoolingSlits=1" in capsys.readouterr().out
+
+
+def test_insulators():
+    from python_magnetgeo.Helix import Helix
+    from python_magnetgeo.ModelAxi import ModelAxi
+    from python_magnetgeo.Model3D import Model3D
+    from python_magnetgeo.Shape import Shape
+
+    axi = ModelAxi("axi", 10, [2, 4], [2, 4])
+    model3d = Model3D(cad="test", with_shapes=True, with_channels=True)
+    shape = Shape("shape", "profile", length=[18], angle=[90])
+    helix = Helix("H", [10, 20], [-15, 15], 0.2, True, False, axi, model3d, shape)
+    index = helix.get_marker_index("", False)
+    assert list(index) == helix.get_names("", False)
+    assert index["Kapton23"].kind == "Insulator" and index["Kapton23"].index == 23
@@ -0,0 +1,48 @@
+import pickle
+
+import numpy as np
+
+from python_magnetgeo.ModelAxi import ModelAxi
+from python_magnetgeo import deserialize
+from python_magnetgeo import yaml_utils
+
+
+def test_compact():
+    axi = ModelAxi("axi", 10, [1, 2, 3, 4, 5], [10, 10, 20, 20 * (1 + 1.0e-8), 10])
+    (turns, pitch) = axi.compact()
+    assert turns == [3, 7, 5] and pitch == [10, 20, 10]
+    assert axi.turns == [1, 2, 3, 4, 5]
+
+    axi = ModelAxi.from_arrays("axi", 10, [1, 2, 3, 4, 5], [10, 10, 20, 20, 10])
+    (turns, pitch) = axi.compact()
+    assert isinstance(turns, np.ndarray) and turns.tolist() == [3, 7, 5]
+    assert pitch.tolist() == [10, 20, 10] and axi.get_Nturns() == 15
+
+
+def test_dump():
+    axi = ModelAxi.from_arrays("axi", 10, [1, 2], [10, 20])
+    assert deserialize.loads(axi.to_json()).turns == [1.0, 2.0]
+    assert yaml_utils.load(yaml_utils.dump(axi)).pitch == [10.0, 20.0]
+
+    # pickles keep the arrays
+    data = pickle.loads(pickle.dumps(axi))
+    assert isinstance(data.turns, np.ndarray) and data.turns.tolist() == [1.0, 2.0]
+
+
+def test_profile():
+    from math import pi
+
+    axi = ModelAxi("axi", 10.3, [1.2, 3.7, 2.1], [1.11, 2.3, 1.9])
+    z = [-axi.h]
+    for n, p in zip(axi.turns, axi.pitch):
+        z.append(z[-1] + n * p)
+    assert axi.get_z().tolist() == z
+    assert axi.get_theta()[-1] == (1.2 * 2 * pi + 3.7 * 2 * pi) + 2.1 * 2 * pi
+
+    points = np.array([-11, -10.3, 0, z[-1], 100])
+    assert axi.section_index(points).tolist() == [-1, 0, 2, 2, -1]
+    assert axi.section_index(z[1]) == 1
+    assert np.allclose(axi.z_at(axi.theta_at(z)), z)
+
+    axi.turns = [1, 1, 1]
+    assert axi.get_z()[1] == -10.3 + 1.11
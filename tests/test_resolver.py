@@ -0,0 +1,179 @@
+import os
+
+import yaml
+import pytest
+from python_magnetgeo.Ring import Ring
+from python_magnetgeo import resolver
+
+
+def test_cache(tmp_path):
+    resolver.clear()
+    ring = Ring("Ring", [19.3, 24.2, 25.1, 30.7], [0, 20])
+    with open(tmp_path / "Ring.yaml", "w") as ostream:
+        yaml.dump(ring, stream=ostream)
+
+    first = resolver.load("Ring", str(tmp_path))
+    second = resolver.load("Ring", str(tmp_path))
+    assert first is second and first.r[0] == 19.3
+    assert resolver.cache_info()["misses"] == 1
+    assert resolver.cache_info()["hits"] == 1
+
+
+def test_invalidate(tmp_path):
+    resolver.clear()
+    ring = Ring("Ring", [19.3, 24.2, 25.1, 30.7], [0, 20])
+    with open(tmp_path / "Ring.yaml", "w") as ostream:
+        yaml.dump(ring, stream=ostream)
+    first = resolver.load("Ring", str(tmp_path))
+
+    ring.r[0] = 19.5
+    with open(tmp_path / "Ring.yaml", "w") as ostream:
+        yaml.dump(ring, stream=ostream)
+    stamp = os.stat(tmp_path / "Ring.yaml")
+    os.utime(tmp_path / "Ring.yaml", ns=(stamp.st_atime_ns, stamp.st_mtime_ns + 1000))
+
+    second = resolver.load("Ring", str(tmp_path))
+    assert first is not second and second.r[0] == 19.5
+
+
+def test_maxsize(tmp_path):
+    resolver.clear()
+    resolver.set_maxsize(2)
+    for i in range(3):
+        ring = Ring(f"Ring{i}", [19.3, 24.2, 25.1, 30.7], [0, 20])
+        with open(tmp_path / f"Ring{i}.yaml", "w") as ostream:
+            yaml.dump(ring, stream=ostream)
+        resolver.load(f"Ring{i}", str(tmp_path))
+    assert resolver.cache_info()["currsize"] == 2
+    resolver.set_maxsize(256)
+
+
+def test_lazyref(tmp_path):
+    from python_magnetgeo.Insert import Insert
+    from python_magnetgeo import yaml_utils
+
+    resolver.clear()
+    for i in range(2):
+        ring = Ring(f"Ring{i}", [19.3, 24.2, 25.1, 30.7], [0, 20 + i])
+        with open(tmp_path / f"Ring{i}.yaml", "w") as ostream:
+            yaml.dump(ring, stream=ostream)
+
+    insert = Insert("Insert", [], ["Ring0", "Ring1"], None, [], [], 18.54, 186.25)
+    insert.use_lazy_refs(str(tmp_path))
+    assert len(insert.Rings) == 2 and insert.innerbore == 18.54
+    assert not any(ring.is_resolved() for ring in insert.Rings)
+    assert resolver.cache_info()["misses"] == 0
+
+    assert insert.Rings[1].z[1] == 21
+    assert insert.Rings[1].is_resolved() and not insert.Rings[0].is_resolved()
+    assert resolver.load(insert.Rings[1]) is insert.Rings[1].resolve()
+
+    # an explicit workingDir is honoured
+    other = tmp_path / "other"
+    other.mkdir()
+    ring = Ring("Ring1", [19.3, 24.2, 25.1, 30.7], [0, 30])
+    with open(other / "Ring1.yaml", "w") as ostream:
+        yaml.dump(ring, stream=ostream)
+    assert resolver.load(insert.Rings[1], str(other)).z[1] == 30
+    assert resolver.load(insert.Rings[1], str(tmp_path)) is insert.Rings[1].resolve()
+    assert resolver.load_fields(insert.Rings[1], ["z"], str(other)) == {"z": [0, 30]}
+
+    # references are still dumped as names
+    data = yaml_utils.load(yaml_utils.dump(insert))
+    assert data.Rings == ["Ring0", "Ring1"] and type(data.Rings[0]) is str
+
+
+def test_load_tree(tmp_path):
+    from python_magnetgeo.Insert import Insert
+    from python_magnetgeo.MSite import MSite
+
+    resolver.clear()
+    for i in range(3):
+        ring = Ring(f"Ring{i}", [19.3, 24.2, 25.1, 30.7], [0, 20 + i])
+        with open(tmp_path / f"Ring{i}.yaml", "w") as ostream:
+            yaml.dump(ring, stream=ostream)
+    insert = Insert("Insert", [], ["Ring0", "Ring1", "Ring2"], None, [], [], 18.54, 186.25)
+    with open(tmp_path / "Insert.yaml", "w") as ostream:
+        yaml.dump(insert, stream=ostream)
+    site = MSite("Site", {"insert": ["Insert"]}, None, None, None, None)
+
+    site = resolver.load_tree(site, workers=4, workingDir=str(tmp_path))
+    insert = site.magnets["insert"][0]
+    assert insert.is_resolved() and insert.outerbore == 186.25
+    assert all(ring.is_resolved() for ring in insert.Rings)
+    assert [ring.z[1] for ring in insert.Rings] == [20, 21, 22]
+    assert resolver.cache_info()["misses"] == 4
+
+    # cached objects are left unchanged
+    cached = resolver.load("Insert", str(tmp_path))
+    assert cached is not insert.resolve() and type(cached.Rings[0]) is str
+
+    # links follow changes of the files
+    ring = Ring("Ring1", [19.3, 24.2, 25.1, 30.7], [0, 210])
+    with open(tmp_path / "Ring1.yaml", "w") as ostream:
+        yaml.dump(ring, stream=ostream)
+    assert resolver.load_fields(insert.Rings[1], ["z"]) == {"z": [0, 210]}
+    assert resolver.load("Ring1", str(tmp_path)).z[1] == 210
+    assert insert.Rings[1].z[1] == 210
+    assert insert.Rings[1].resolve() is resolver.load("Ring1", str(tmp_path))
+
+
+def test_snapshot(tmp_path, monkeypatch):
+    from python_magnetgeo.Insert import Insert
+    from python_magnetgeo.MSite import MSite
+
+    monkeypatch.chdir(tmp_path)
+    resolver.clear()
+    for i in range(2):
+        ring = Ring(f"Ring{i}", [19.3, 24.2, 25.1, 30.7], [0, 20 + i])
+        with open(f"Ring{i}.yaml", "w") as ostream:
+            yaml.dump(ring, stream=ostream)
+    insert = Insert("Insert", [], ["Ring0", "Ring1"], None, [], [], 18.54, 186.25)
+    with open("Insert.yaml", "w") as ostream:
+        yaml.dump(insert, stream=ostream)
+    site = MSite("Site", {"insert": "Insert"}, None, None, None, None)
+    site.write_to_snapshot()
+    assert type(site.magnets["insert"]) is str
+    assert type(resolver.load("Insert").Rings[0]) is str
+
+    for filename in ["Ring0.yaml", "Ring1.yaml", "Insert.yaml"]:
+        os.remove(filename)
+    resolver.clear()
+
+    site = MSite.from_snapshot("Site.snapshot")
+    insert = site.magnets["insert"]
+    assert [ring.z[1] for ring in insert.Rings] == [20, 21]
+    assert resolver.cache_info()["misses"] == 0
+
+
+def test_load_fields(tmp_path):
+    from python_magnetgeo.Shape import Shape
+    from python_magnetgeo.ModelAxi import ModelAxi
+    from python_magnetgeo.Model3D import Model3D
+    from python_magnetgeo.Helix import Helix
+
+    resolver.clear()
+    axi = ModelAxi("axi", 80.0, [1.0, 2.0, 1.0], [20.0, 10.0, 20.0])
+    helix = Helix(
+        "Helix", [19.3, 24.2], [-100, 100], 0.2, True, True, axi, Model3D(cad="test"), Shape("", "")
+    )
+    with open(tmp_path / "Helix.yaml", "w") as ostream:
+        yaml.dump(helix, stream=ostream)
+
+    data = resolver.load_fields("Helix", ["r", "z", "odd"], str(tmp_path))
+    assert data == {"r": [19.3, 24.2], "z": [-100, 100], "odd": True}
+    assert resolver.cache_info()["currsize"] == 0
+
+    data = resolver.load_fields("Helix", ["modelaxi"], str(tmp_path))
+    assert isinstance(data["modelaxi"], ModelAxi) and data["modelaxi"].h == 80.0
+
+    with pytest.raises(RuntimeError, match="has no field rmin"):
+        resolver.load_fields("Helix", ["r", "rmin"], str(tmp_path))
+
+    # anchors and aliases
+    with open(tmp_path / "Ring.yaml", "w") as ostream:
+        ostream.write("!<Ring>\nname: Ring\nr: &r [19.3, 24.2]\nz: *r\nn: 0\n")
+    assert resolver.load_fields("Ring", ["z"], str(tmp_path)) == {"z": [19.3, 24.2]}
+    with open(tmp_path / "Ring.yaml", "a") as ostream:
+        ostream.write("angle: *r\n")
+    assert resolver.load_fields("Ring", ["r", "angle"], str(tmp_path))["angle"] == [19.3, 24.2]
@@ -0,0 +1,48 @@
+from python_magnetgeo.SupraStructure import (
+    tape,
+    pancake,
+    isolation,
+    dblpancake,
+    HTSinsert,
+    flatten,
+)
+
+
+def test_flatten():
+    assert flatten([["a", ["b", ("c",)]], "d", []]) == ["a", "b", "c", "d"]
+
+
+def test_names():
+    _pancake = pancake(r0=10, tape=tape(w=0.15, h=4, e=0.01), n=2, mandrin=8)
+    _isolation = isolation(r0=10, w=[30], h=[0.2])
+    hts = HTSinsert(
+        n=2,
+        dblpancakes=[dblpancake(0, _pancake, _isolation) for _ in range(2)],
+        isolations=[_isolation],
+    )
+
+    assert hts.get_names("HTS", "dblpancake") == ["HTS_dp0", "HTS_dp1", "HTS_i0"]
+    assert hts.get_names("", "pancake") == [
+        "dp0_p0", "dp0_p1", "dp0_i", "dp1_p0", "dp1_p1", "dp1_i", "i0",
+    ]
+    names = hts.get_names("HTS", "tape")
+    assert names[:4] == ["HTS_dp0_p0_Mandrin", "HTS_dp0_p0_t0_SC", "HTS_dp0_p0_t0_Duromag", "HTS_dp0_p0_t1_SC"]
+    assert len(names) == 2 * (2 * (1 + 2 * 2) + 1) + 1
+    assert list(hts.iter_names("HTS", "tape")) == names
+    assert _pancake.get_names("p", "pancake") == "p"
+
+
+def test_count_and_slice():
+    _pancake = pancake(r0=10, tape=tape(w=0.15, h=4, e=0.01), n=5, mandrin=8)
+    _isolation = isolation(r0=10, w=[30], h=[0.2])
+    hts = HTSinsert(
+        n=3,
+        dblpancakes=[dblpancake(0, _pancake, _isolation) for _ in range(3)],
+        isolations=[_isolation] * 2,
+    )
+
+    for detail in ["dblpancake", "pancake", "tape"]:
+        names = hts.get_names("HTS", detail)
+        assert hts.count_names(detail) == len(names)
+        for start, stop in [(0, 3), (4, 17), (11, None), (-5, -1), (None, 100), (30, 10)]:
+            assert list(hts.iter_names("HTS", detail, False, start, stop)) == names[start:stop]
@@ -0,0 +1,25 @@
+import yaml
+from python_magnetgeo.Shape import Shape
+from python_magnetgeo.ModelAxi import ModelAxi
+from python_magnetgeo.Model3D import Model3D
+from python_magnetgeo.Helix import Helix
+from python_magnetgeo import yaml_utils
+
+
+def test_roundtrip():
+    axi = ModelAxi("axi", 80.0, [1.0, 2.0, 1.0], [20.0, 10.0, 20.0])
+    helix = Helix(
+        "Helix", [19.3, 24.2], [-100, 100], 0.2, True, True, axi, Model3D(cad="test"), Shape("", "")
+    )
+    data = yaml_utils.dump(helix)
+    assert data == yaml.dump(helix)
+
+    helix = yaml_utils.load(data)
+    assert isinstance(helix, Helix) and isinstance(helix.modelaxi, ModelAxi)
+    assert helix.modelaxi.turns == [1.0, 2.0, 1.0]
+
+
+def test_constructor():
+    data = "!Shape\nname: shape\nprofile: profile\nlength: [15]\nangle: [60]\nonturns: [1]\nposition: ABOVE\n"
+    shape = yaml_utils.load(data)
+    assert isinstance(shape, Shape) and shape.angle == [60]